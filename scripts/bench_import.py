@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Per-stage timing and peak-memory benchmarks for ``import_docx.py``.
+
+Generates synthetic Armenian/English DOCX pairs (see ``synth_docx.py``) at
+several scales and runs each importer stage on them in isolation, recording
+wall time (best of ``--repeat``) and ``tracemalloc`` peak (separate run, so
+tracing overhead never skews the timings).  The JSON report can be diffed
+against an earlier one with ``--compare``.
+
+Usage:
+    python3 scripts/bench_import.py [--scales 1,10,100] [--repeat N]
+        [--no-memory] [--output report.json] [--compare baseline.json]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TypeVar
+
+from import_docx import (
+    BookEntry,
+    _extract_footnotes,
+    has_real_content,
+    iter_books,
+    iter_paragraphs,
+    load_notes,
+    merge_chapters,
+    paragraphs_to_events,
+    parse_multibook,
+    render_book,
+)
+from synth_docx import SynthSpec, generate_pair
+
+REPORT_VERSION = 1
+
+T = TypeVar("T")
+
+
+def _measure(
+    fn: Callable[[], T], repeat: int, trace: bool = True
+) -> tuple[T, dict[str, float]]:
+    """Run ``fn`` ``repeat`` times for the best wall time, then once traced."""
+    best = float("inf")
+    result: T
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    stats: dict[str, float] = {"wallSeconds": round(best, 6)}
+    if trace:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            stats["peakBytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, stats
+
+
+def _pairs(arm_books: list[BookEntry], eng_books: list[BookEntry]) -> list[tuple[BookEntry, BookEntry]]:
+    arm = [b for b in arm_books if has_real_content(b[1])]
+    eng = [b for b in eng_books if has_real_content(b[1])]
+    return list(zip(arm, eng))
+
+
+def bench_scale(
+    spec: SynthSpec, scale: int, repeat: int, work_dir: Path, trace: bool = True
+) -> dict[str, object]:
+    arm_docx, eng_docx = generate_pair(spec, work_dir / f"x{scale}")
+    stages: dict[str, dict[str, float]] = {}
+
+    def stage(name: str, fn: Callable[[], T]) -> T:
+        result, stats = _measure(fn, repeat, trace)
+        stages[name] = stats
+        peak = f"  peak {stats['peakBytes'] / 1e6:9.2f} MB" if trace else ""
+        print(f"    {name:20s} {stats['wallSeconds']:9.4f}s{peak}", file=sys.stderr)
+        return result
+
+    arm_paras = stage("extract_paragraphs", lambda: list(iter_paragraphs(arm_docx, "arm")))
+    eng_paras = list(iter_paragraphs(eng_docx, "eng"))
+    fn_map = stage(
+        "load_footnotes",
+        lambda: load_notes(arm_docx, "arm") | load_notes(eng_docx, "eng"),
+    )
+    arm_events = stage("events", lambda: paragraphs_to_events(arm_paras))
+    eng_events = paragraphs_to_events(eng_paras)
+    arm_books = stage("segment_books", lambda: list(iter_books(arm_events)))
+    eng_books = list(iter_books(eng_events))
+    pairs = _pairs(arm_books, eng_books)
+
+    verse_texts = [
+        verse.text
+        for _, chapters in arm_books + eng_books
+        for ch_data in chapters.values()
+        for verse in ch_data.verses.values()
+    ]
+    stage(
+        "extract_footnotes",
+        lambda: [_extract_footnotes(text, fn_map) for text in verse_texts],
+    )
+    merged = stage(
+        "merge_chapters",
+        lambda: [merge_chapters(arm[1], eng[1], fn_map) for arm, eng in pairs],
+    )
+    stage(
+        "serialize",
+        lambda: [json.dumps(chapters, ensure_ascii=False, indent=2) for chapters in merged],
+    )
+
+    def end_to_end() -> int:
+        arm, arm_fn = parse_multibook(arm_docx, "arm")
+        eng, eng_fn = parse_multibook(eng_docx, "eng")
+        both = arm_fn | eng_fn
+        return sum(
+            len(text)
+            for a, e in _pairs(arm, eng)
+            for _, text in render_book(a, e, both).files
+        )
+
+    output_chars = stage("end_to_end", end_to_end)
+
+    return {
+        "scale": scale,
+        "spec": asdict(spec),
+        "docxBytes": {
+            "armenian": arm_docx.stat().st_size,
+            "english": eng_docx.stat().st_size,
+        },
+        "counts": {
+            "paragraphs": len(arm_paras) + len(eng_paras),
+            "books": len(pairs),
+            "verses": len(verse_texts),
+            "footnotes": len(fn_map),
+            "outputChars": output_chars,
+        },
+        "stages": stages,
+    }
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Print per-stage time/memory ratios (current / baseline) for shared scales."""
+    base_runs = {run["scale"]: run for run in baseline.get("runs", [])}
+    for run in report["runs"]:
+        base = base_runs.get(run["scale"])
+        if base is None:
+            continue
+        print(f"  x{run['scale']}:", file=sys.stderr)
+        for name, stats in run["stages"].items():
+            old = base["stages"].get(name)
+            if not old:
+                continue
+            line = f"    {name:20s} time x{_ratio(stats, old, 'wallSeconds'):6.2f}"
+            if "peakBytes" in stats and "peakBytes" in old:
+                line += f"   peak x{_ratio(stats, old, 'peakBytes'):6.2f}"
+            print(line, file=sys.stderr)
+
+
+def _ratio(new: dict[str, float], old: dict[str, float], key: str) -> float:
+    return new[key] / old[key] if old[key] else float("nan")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        default="1,10,100",
+        help="comma-separated multiples of the base corpus (default: 1,10,100)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions per stage")
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="skip the tracemalloc pass (much faster at large scales)",
+    )
+    parser.add_argument("--books", type=int, default=SynthSpec.books, help="books at scale 1")
+    parser.add_argument("--chapters", type=int, default=SynthSpec.chapters)
+    parser.add_argument("--verses", type=int, default=SynthSpec.verses)
+    parser.add_argument(
+        "--footnotes-per-chapter", type=int, default=SynthSpec.footnotes_per_chapter
+    )
+    parser.add_argument("--seed", type=int, default=SynthSpec.seed)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    base = SynthSpec(
+        books=args.books,
+        chapters=args.chapters,
+        verses=args.verses,
+        footnotes_per_chapter=args.footnotes_per_chapter,
+        seed=args.seed,
+    )
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="bench-import-") as tmp:
+        for scale in scales:
+            spec = base.scaled(scale)
+            print(f"  x{scale}: {spec.books} books", file=sys.stderr)
+            runs.append(bench_scale(spec, scale, args.repeat, Path(tmp), not args.no_memory))
+
+    report = {
+        "version": REPORT_VERSION,
+        "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"\n  ✓ report → {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        print("\nComparison (current / baseline):", file=sys.stderr)
+        compare(report, json.loads(args.compare.read_text(encoding="utf-8")))
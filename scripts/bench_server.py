@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Load-test the book data API by replaying an editor session from many clients.
+
+A session is the JSONL file ``data_server.py --record`` writes while the
+editor runs against it: one request per line (``t`` seconds since the start,
+``method``, ``path`` and, for writes, ``body``).  Without one, a session is
+made up from the books: list them, open each book, read every chapter, save
+the first chapter back unchanged and reopen the book.
+
+Every client replays the whole session on its own keep-alive connection and,
+like a browser, sends back the ``ETag`` it last got for a path as
+``If-None-Match``.  All clients start together and go as fast as the server
+answers (``--realtime`` keeps the recorded pauses instead).
+
+By default the session runs against ``data_server.py`` in this process, on a
+scratch copy of the data directory, so saves never touch ``data/``; the
+report then includes the server's cache counters (``reads`` against
+``hits`` shows how many lookups the disk was spared).  ``--url`` replays
+against a running server instead, e.g. ``bun run serve`` on
+``http://localhost:3000``, to compare the two.
+
+Usage:
+    python3 scripts/bench_server.py [SESSION.jsonl] [--clients N] [--repeat N]
+        [--realtime] [--url URL] [--output report.json] [--data DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from book_shards import dump_json, load_book
+from data_server import BookData, DataServer, FileCache
+from data_files import book_paths, sharded_book_dirs
+
+JsonObject = dict[str, Any]
+
+REPORT_VERSION = 1
+
+# State kept out of the scratch copy: it is not served and can be large.
+_SKIPPED_DIRS = (".revisions", ".search", ".publish", ".trash")
+_ID_SEGMENT = re.compile(r"(?<=/api/books/)[a-z0-9_-]+")
+_NUMBER_SEGMENT = re.compile(r"(?<=/chapters/)\d+")
+
+
+def load_session(path: Path) -> list[JsonObject]:
+    """Requests of a recorded session, in order."""
+    with path.open(encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def synthetic_session(data_dir: Path) -> list[JsonObject]:
+    """A plausible session over every book (see module docstring)."""
+    book_ids = sorted(
+        [p.stem for p in book_paths(data_dir)] + [p.name for p in sharded_book_dirs(data_dir)]
+    )
+    session: list[JsonObject] = [{"t": 0.0, "method": "GET", "path": "/api/books"}]
+    for book_id in book_ids:
+        book = load_book(data_dir, book_id)
+        book_path = f"/api/books/{book_id}"
+        session.append({"method": "GET", "path": book_path})
+        for chapter in book["chapters"]:
+            session.append({"method": "GET", "path": f"{book_path}/chapters/{chapter['number']}"})
+        if book["chapters"]:
+            first = book["chapters"][0]
+            session.append(
+                {
+                    "method": "PUT",
+                    "path": f"{book_path}/chapters/{first['number']}",
+                    "body": dump_json(first),
+                }
+            )
+            session.append({"method": "GET", "path": book_path})
+    for i, request in enumerate(session):
+        request["t"] = i * 0.5
+    return session
+
+
+def route(method: str, path: str) -> str:
+    """``method`` and ``path`` with the book id and chapter number generalized."""
+    path = _NUMBER_SEGMENT.sub(":n", _ID_SEGMENT.sub(":id", urlsplit(path).path))
+    return f"{method} {path}"
+
+
+def replay(
+    host: str,
+    port: int,
+    session: list[JsonObject],
+    repeat: int,
+    realtime: bool,
+    start: threading.Barrier,
+) -> list[tuple[str, int, float]]:
+    """One client's (route, status, seconds) per request; status 0 is a failed request."""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    etags: dict[str, str] = {}
+    results: list[tuple[str, int, float]] = []
+    start.wait()
+    for _ in range(repeat):
+        began = time.perf_counter()
+        for request in session:
+            if realtime:
+                time.sleep(max(0.0, began + request.get("t", 0.0) - time.perf_counter()))
+            method, path = request["method"], request["path"]
+            headers = {"Content-Type": "application/json"}
+            if method == "GET" and path in etags:
+                headers["If-None-Match"] = etags[path]
+            body = request["body"].encode("utf-8") if request.get("body") else None
+            sent = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+                etag = response.getheader("ETag")
+                if method == "GET" and etag:
+                    etags[path] = etag
+            except (OSError, http.client.HTTPException):
+                status = 0
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=60)
+            results.append((route(method, path), status, time.perf_counter() - sent))
+    conn.close()
+    return results
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run(
+    host: str, port: int, session: list[JsonObject], clients: int, repeat: int, realtime: bool
+) -> JsonObject:
+    start = threading.Barrier(clients + 1)
+    per_client: list[list[tuple[str, int, float]]] = [[] for _ in range(clients)]
+
+    def client(i: int) -> None:
+        per_client[i] = replay(host, port, session, repeat, realtime, start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    by_route: dict[str, list[tuple[int, float]]] = {}
+    for results in per_client:
+        for name, status, seconds in results:
+            by_route.setdefault(name, []).append((status, seconds))
+    routes: JsonObject = {}
+    for name, samples in sorted(by_route.items()):
+        times = sorted(seconds for _, seconds in samples)
+        statuses: dict[str, int] = {}
+        for status, _ in samples:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        routes[name] = {
+            "count": len(samples),
+            "statuses": statuses,
+            "p50Ms": round(_percentile(times, 50) * 1000, 3),
+            "p95Ms": round(_percentile(times, 95) * 1000, 3),
+            "p99Ms": round(_percentile(times, 99) * 1000, 3),
+            "maxMs": round(times[-1] * 1000, 3),
+        }
+    total = sum(len(results) for results in per_client)
+    return {
+        "requests": total,
+        "errors": sum(1 for r in per_client for _, status, _ in r if status == 0 or status >= 500),
+        "seconds": round(elapsed, 3),
+        "requestsPerSecond": round(total / elapsed, 1) if elapsed else None,
+        "routes": routes,
+    }
+
+
+def print_table(report: JsonObject) -> None:
+    print(
+        f"  {report['requests']} requests from {report['clients']} clients in "
+        f"{report['seconds']:.2f}s ({report['requestsPerSecond']} req/s, "
+        f"{report['errors']} errors)",
+        file=sys.stderr,
+    )
+    for name, stats in report["routes"].items():
+        statuses = " ".join(f"{code}×{n}" for code, n in sorted(stats["statuses"].items()))
+        print(
+            f"  {name:<40} p50 {stats['p50Ms']:8.2f} ms  p95 {stats['p95Ms']:8.2f} ms  "
+            f"p99 {stats['p99Ms']:8.2f} ms  {statuses}",
+            file=sys.stderr,
+        )
+    if "cache" in report:
+        cache = report["cache"]
+        print(
+            f"  cache: {cache['hits']} hits, {cache['reads']} file reads, "
+            f"{cache['parses']} parses, {cache['entries']} files held",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("session", nargs="?", type=Path, metavar="SESSION.jsonl")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients (default: 8)")
+    parser.add_argument("--repeat", type=int, default=5, help="replays per client (default: 5)")
+    parser.add_argument(
+        "--realtime", action="store_true", help="keep the recorded pauses between requests"
+    )
+    parser.add_argument("--url", help="replay against this running server instead")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    args = parser.parse_args()
+
+    if args.clients < 1 or args.repeat < 1:
+        parser.error("--clients and --repeat must be at least 1")
+    if not args.url and not args.data.is_dir():
+        print(f"ERROR: {args.data} is not a directory")
+        raise SystemExit(1)
+
+    with tempfile.TemporaryDirectory(prefix="bench-server-") as tmp:
+        server: DataServer | None = None
+        data: BookData | None = None
+        if args.url:
+            target = urlsplit(args.url)
+            host, port = target.hostname or "localhost", target.port or 80
+            session = load_session(args.session) if args.session else synthetic_session(args.data)
+        else:
+            scratch = Path(tmp) / "data"
+            shutil.copytree(args.data, scratch, ignore=shutil.ignore_patterns(*_SKIPPED_DIRS))
+            session = load_session(args.session) if args.session else synthetic_session(scratch)
+            data = BookData(scratch, FileCache())
+            server = DataServer(("127.0.0.1", 0), data, Path(tmp) / "dist")
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host, port = "127.0.0.1", server.server_address[1]
+        print(
+            f"  replaying {len(session)} requests × {args.repeat} from {args.clients} clients "
+            f"→ {args.url or 'data_server.py'}",
+            file=sys.stderr,
+        )
+
+        try:
+            results = run(host, port, session, args.clients, args.repeat, args.realtime)
+        finally:
+            if server is not None and data is not None:
+                server.shutdown()
+                server.server_close()
+                data.close()
+
+    report: JsonObject = {
+        "version": REPORT_VERSION,
+        "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "target": args.url or "data_server.py",
+        "session": str(args.session) if args.session else "synthetic",
+        "clients": args.clients,
+        "repeat": args.repeat,
+        **results,
+    }
+    if data is not None:
+        report["cache"] = data.cache.stats()
+    print_table(report)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"\n  ✓ report → {args.output}", file=sys.stderr)
+    else:
+        print(text)
@@ -0,0 +1,207 @@
+"""The compact book file format (``"format": "compact-1"``).
+
+A compact ``data/<book-id>.json`` holds the same book as the importer's
+indented layout, in far fewer bytes and far fewer JSON values:
+
+- It is written without indentation or spaces, and the ``"format"`` key
+  comes first, so a reader can tell a compact file from its first bytes.
+- ``"footnoteTexts"`` is a per-book table of every distinct footnote text,
+  in order of first use.  A footnote ``{"id", "text", "anchorWord"}``
+  becomes ``[id, textIndex, anchorWord]``.
+- Items carry no defaults.  A verse drops ``"kind"``, since it is the only
+  item with a ``"number"``, and a heading drops it too.  Empty
+  ``armenian``/``english``/``classical`` texts are left out, and so are
+  empty footnote lists.  A verse whose footnotes are all empty has no
+  ``"footnotes"`` key at all.
+
+Any item whose keys are not in the importer's order keeps ``"kind"`` and is
+stored verbatim, so ``expand_book(compact_book(book)) == book`` always
+holds, key order included.  ``src/lib/bookFormat.ts`` is the TypeScript
+twin used by the dev servers; keep the two in step.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+JsonObject = dict[str, Any]
+
+COMPACT_FORMAT = "compact-1"
+# How every compact file starts (dump_compact puts "format" first).
+COMPACT_PREFIX = '{"format":"compact-'.encode("utf-8")
+
+TEXT_FIELDS = ("armenian", "english", "classical")
+_VERSE_HEAD = ["kind", "number", *TEXT_FIELDS]
+_HEADING_HEAD = ["kind", *TEXT_FIELDS]
+_FOOTNOTE_KEYS = ["id", "text", "anchorWord"]
+
+
+def is_compact(book: JsonObject) -> bool:
+    return book.get("format") == COMPACT_FORMAT
+
+
+def is_compact_file(path: Path) -> bool:
+    """True if ``path`` starts like a compact book (reads a few bytes only)."""
+    try:
+        with path.open("rb") as fh:
+            return fh.read(len(COMPACT_PREFIX)) == COMPACT_PREFIX
+    except OSError:
+        return False
+
+
+def dump_compact(book: JsonObject) -> str:
+    """Serialize an already-compacted book."""
+    return json.dumps(book, ensure_ascii=False, separators=(",", ":"))
+
+
+# ── Compacting ────────────────────────────────────────────────────
+
+
+class _TextTable:
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def add(self, text: str) -> int:
+        index = self._index.get(text)
+        if index is None:
+            index = self._index[text] = len(self.texts)
+            self.texts.append(text)
+        return index
+
+
+def _compact_footnote(footnote: Any, table: _TextTable) -> Any:
+    if (
+        isinstance(footnote, dict)
+        and list(footnote) == _FOOTNOTE_KEYS
+        and isinstance(footnote["text"], str)
+    ):
+        return [footnote["id"], table.add(footnote["text"]), footnote["anchorWord"]]
+    return footnote
+
+
+def _compact_verse(item: JsonObject, table: _TextTable) -> JsonObject | None:
+    """Compact form of a verse, or None if it must be stored verbatim."""
+    keys = list(item)
+    if keys[:5] != _VERSE_HEAD or "footnotes" not in item:
+        return None
+    # Extra-language texts (--manifest imports) sit between classical and
+    # footnotes, and the footnotes object lists the same languages.
+    extra = keys[5 : keys.index("footnotes")]
+    footnotes = item["footnotes"]
+    if (
+        not isinstance(footnotes, dict)
+        or list(footnotes) != [*TEXT_FIELDS, *extra]
+        or not all(
+            isinstance(fns, list) and all(isinstance(fn, dict) for fn in fns)
+            for fns in footnotes.values()
+        )
+    ):
+        return None
+
+    compact: JsonObject = {}
+    for key, value in item.items():
+        if key == "kind" or (key in TEXT_FIELDS and value == ""):
+            continue
+        if key == "footnotes":
+            value = {
+                lang: [_compact_footnote(fn, table) for fn in fns]
+                for lang, fns in footnotes.items()
+                if fns or lang not in TEXT_FIELDS
+            }
+            if not value:
+                continue
+        compact[key] = value
+    return compact
+
+
+def _compact_heading(item: JsonObject) -> JsonObject | None:
+    if list(item)[:4] != _HEADING_HEAD or "number" in item:
+        return None
+    return {
+        key: value
+        for key, value in item.items()
+        if key != "kind" and not (key in TEXT_FIELDS and value == "")
+    }
+
+
+def compact_book(book: JsonObject) -> JsonObject:
+    """The compact form of an expanded book (which is left untouched)."""
+    table = _TextTable()
+    chapters = []
+    for chapter in book["chapters"]:
+        content = []
+        for item in chapter.get("content", []):
+            compact = None
+            if isinstance(item, dict):
+                if item.get("kind") == "verse":
+                    compact = _compact_verse(item, table)
+                elif item.get("kind") == "heading":
+                    compact = _compact_heading(item)
+            content.append(item if compact is None else compact)
+        chapters.append({**chapter, "content": content} if "content" in chapter else chapter)
+
+    compact: JsonObject = {"format": COMPACT_FORMAT}
+    for key, value in book.items():
+        if key == "chapters":
+            compact["footnoteTexts"] = table.texts
+        compact[key] = chapters if key == "chapters" else value
+    return compact
+
+
+# ── Expanding ─────────────────────────────────────────────────────
+
+
+def _expand_footnote(footnote: Any, texts: list[str]) -> Any:
+    if isinstance(footnote, list):
+        fn_id, text_index, anchor_word = footnote
+        return {"id": fn_id, "text": texts[text_index], "anchorWord": anchor_word}
+    return footnote
+
+
+def _expand_footnotes(footnotes: JsonObject, texts: list[str]) -> JsonObject:
+    expanded = {lang: footnotes.get(lang, []) for lang in TEXT_FIELDS}
+    expanded.update(footnotes)
+    return {lang: [_expand_footnote(fn, texts) for fn in fns] for lang, fns in expanded.items()}
+
+
+def expand_item(item: JsonObject, texts: list[str]) -> JsonObject:
+    """One content item in the expanded shape (verbatim items pass through)."""
+    if "kind" in item:
+        return item
+    is_verse = "number" in item
+    expanded: JsonObject = {"kind": "verse" if is_verse else "heading"}
+    if is_verse:
+        expanded["number"] = item["number"]
+    for field in TEXT_FIELDS:
+        expanded[field] = item.get(field, "")
+    if is_verse and "footnotes" not in item:
+        expanded["footnotes"] = {lang: [] for lang in TEXT_FIELDS}
+    for key, value in item.items():
+        if key == "footnotes":
+            expanded[key] = _expand_footnotes(value, texts)
+        elif key not in expanded:
+            expanded[key] = value
+    return expanded
+
+
+def expand_book(book: JsonObject) -> JsonObject:
+    """The expanded form of a book; books that are not compact are returned as is."""
+    if not is_compact(book):
+        return book
+    texts = book["footnoteTexts"]
+    expanded: JsonObject = {}
+    for key, value in book.items():
+        if key in ("format", "footnoteTexts"):
+            continue
+        if key == "chapters":
+            value = [expand_chapter(chapter, texts) for chapter in value]
+        expanded[key] = value
+    return expanded
+
+
+def expand_chapter(chapter: JsonObject, texts: list[str]) -> JsonObject:
+    if "content" not in chapter:
+        return chapter
+    return {**chapter, "content": [expand_item(item, texts) for item in chapter["content"]]}
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""SQLite storage for books: schema, data access and JSON ↔ SQLite sync.
+
+Books are normalized into ``books``, ``chapters``, ``items`` (verses and
+headings) and ``footnotes``, with an index on (book, chapter, number), so a
+single verse is one B-tree lookup plus a footnote range scan instead of a
+whole-book parse.  The mapping is lossless: any field without a column of
+its own is kept in an ``extra`` JSON column, and reading a book back yields
+the same JSON structure (and, serialized like the importer, the same bytes).
+
+Usage:
+    python3 scripts/book_db.py to-sqlite PATH [--data DIR]
+    python3 scripts/book_db.py to-json PATH [--data DIR]
+    python3 scripts/book_db.py verse PATH BOOK_ID CHAPTER VERSE
+
+``to-sqlite`` rewrites only books whose file hash changed since the last
+sync and drops books no longer in data/; ``to-json`` writes back only books
+whose JSON differs, keeping each book's current layout.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from book_index import reindex
+from book_shards import book_layout, dump_json, load_book, write_book_files
+
+JsonObject = dict[str, Any]
+
+FIELDS = ("armenian", "english", "classical")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id              TEXT PRIMARY KEY,
+    name_english    TEXT NOT NULL,
+    name_armenian   TEXT NOT NULL,
+    name_classical  TEXT NOT NULL,
+    extra           TEXT,       -- JSON object: top-level keys besides id/name/chapters
+    sha256          TEXT        -- of the JSON source at the last to-sqlite sync
+);
+
+CREATE TABLE IF NOT EXISTS chapters (
+    id              INTEGER PRIMARY KEY,
+    book_id         TEXT NOT NULL REFERENCES books(id) ON DELETE CASCADE,
+    position        INTEGER NOT NULL,
+    number          INTEGER NOT NULL,
+    UNIQUE (book_id, position)
+);
+CREATE INDEX IF NOT EXISTS chapters_book_number ON chapters (book_id, number);
+
+CREATE TABLE IF NOT EXISTS items (
+    id                  INTEGER PRIMARY KEY,
+    chapter_id          INTEGER NOT NULL REFERENCES chapters(id) ON DELETE CASCADE,
+    book_id             TEXT NOT NULL,
+    chapter_number      INTEGER NOT NULL,
+    position            INTEGER NOT NULL,
+    kind                TEXT NOT NULL CHECK (kind IN ('verse', 'heading')),
+    number              INTEGER,    -- NULL for headings
+    armenian            TEXT NOT NULL,
+    english             TEXT NOT NULL,
+    classical           TEXT NOT NULL,
+    poetry              INTEGER,
+    indent_level        INTEGER,
+    first_line_indent,              -- untyped, so 1 and 1.0 round-trip as written
+    extra               TEXT,
+    UNIQUE (chapter_id, position)
+);
+CREATE INDEX IF NOT EXISTS items_book_chapter_number
+    ON items (book_id, chapter_number, number);
+
+CREATE TABLE IF NOT EXISTS footnotes (
+    item_id         INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+    field           TEXT NOT NULL,
+    position        INTEGER NOT NULL,
+    note_id         TEXT NOT NULL,
+    text            TEXT NOT NULL,
+    anchor_word     INTEGER NOT NULL,
+    extra           TEXT,
+    PRIMARY KEY (item_id, field, position)
+) WITHOUT ROWID;
+"""
+
+_ITEM_COLUMNS = (
+    "id, kind, number, armenian, english, classical, "
+    "poetry, indent_level, first_line_indent, extra"
+)
+# Optional verse keys with their own columns, in the order they are written back.
+_OPTIONAL_VERSE_KEYS = ("indentLevel", "firstLineIndent", "poetry")
+_ITEM_KEYS = {"kind", "number", *FIELDS, "footnotes", *_OPTIONAL_VERSE_KEYS}
+_FOOTNOTE_KEYS = {"id", "text", "anchorWord"}
+
+
+def connect(path: Path | str) -> sqlite3.Connection:
+    """Open (creating if needed) a book database."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _extra(obj: JsonObject, known: set[str]) -> str | None:
+    rest = {k: v for k, v in obj.items() if k not in known}
+    return json.dumps(rest, ensure_ascii=False) if rest else None
+
+
+def _book_extra(book: JsonObject) -> str | None:
+    """Top-level extras, plus names in languages beyond ``FIELDS`` under ``"name"``."""
+    rest = {k: v for k, v in book.items() if k not in {"id", "name", "chapters"}}
+    names = {k: v for k, v in book.get("name", {}).items() if k not in FIELDS}
+    if names:
+        rest["name"] = names
+    return json.dumps(rest, ensure_ascii=False) if rest else None
+
+
+# ── Writing ───────────────────────────────────────────────────────
+
+
+def write_book(conn: sqlite3.Connection, book: JsonObject, sha256: str | None = None) -> None:
+    """Insert ``book``, replacing any stored book with the same id, in one transaction."""
+    book_id = book["id"]
+    name = book.get("name", {})
+    with conn:
+        conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
+        conn.execute(
+            "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                book_id,
+                name.get("english", ""),
+                name.get("armenian", ""),
+                name.get("classical", ""),
+                _book_extra(book),
+                sha256,
+            ),
+        )
+        for ch_pos, chapter in enumerate(book.get("chapters", [])):
+            chapter_id = conn.execute(
+                "INSERT INTO chapters (book_id, position, number) VALUES (?, ?, ?)",
+                (book_id, ch_pos, chapter["number"]),
+            ).lastrowid
+            for pos, item in enumerate(chapter.get("content", [])):
+                poetry = item.get("poetry")
+                item_id = conn.execute(
+                    "INSERT INTO items (chapter_id, book_id, chapter_number, position, kind, "
+                    "number, armenian, english, classical, poetry, indent_level, "
+                    "first_line_indent, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        chapter_id,
+                        book_id,
+                        chapter["number"],
+                        pos,
+                        item["kind"],
+                        item.get("number"),
+                        item.get("armenian", ""),
+                        item.get("english", ""),
+                        item.get("classical", ""),
+                        None if poetry is None else int(poetry),
+                        item.get("indentLevel"),
+                        item.get("firstLineIndent"),
+                        _extra(item, _ITEM_KEYS),
+                    ),
+                ).lastrowid
+                footnotes = item.get("footnotes") or {}
+                conn.executemany(
+                    "INSERT INTO footnotes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            item_id,
+                            field,
+                            fn_pos,
+                            fn["id"],
+                            fn["text"],
+                            fn["anchorWord"],
+                            _extra(fn, _FOOTNOTE_KEYS),
+                        )
+                        for field, notes in footnotes.items()
+                        for fn_pos, fn in enumerate(notes)
+                    ),
+                )
+
+
+def delete_book(conn: sqlite3.Connection, book_id: str) -> None:
+    with conn:
+        conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
+
+
+# ── Reading ───────────────────────────────────────────────────────
+
+
+def _footnotes(conn: sqlite3.Connection, item_ids: list[int]) -> dict[int, dict[str, list]]:
+    by_item: dict[int, dict[str, list]] = {i: {} for i in item_ids}
+    for start in range(0, len(item_ids), 500):
+        chunk = item_ids[start : start + 500]
+        rows = conn.execute(
+            "SELECT item_id, field, note_id, text, anchor_word, extra FROM footnotes "
+            f"WHERE item_id IN ({','.join('?' * len(chunk))}) "
+            "ORDER BY item_id, field, position",
+            chunk,
+        )
+        for item_id, field, note_id, text, anchor_word, extra in rows:
+            fn = {"id": note_id, "text": text, "anchorWord": anchor_word}
+            if extra:
+                fn.update(json.loads(extra))
+            by_item[item_id].setdefault(field, []).append(fn)
+    return by_item
+
+
+def _items(conn: sqlite3.Connection, rows: list[tuple]) -> list[JsonObject]:
+    """Rebuild content items from ``_ITEM_COLUMNS`` rows.
+
+    String-valued extras are further text fields (languages imported with
+    ``import_docx.py --manifest``); they go right after ``classical`` and get
+    a footnote list each, as the importer lays them out.
+    """
+    footnotes = _footnotes(conn, [row[0] for row in rows if row[1] == "verse"])
+    items = []
+    for (
+        item_id,
+        kind,
+        number,
+        armenian,
+        english,
+        classical,
+        poetry,
+        indent_level,
+        first_line_indent,
+        extra,
+    ) in rows:
+        extras = json.loads(extra) if extra else {}
+        texts = {key: value for key, value in extras.items() if isinstance(value, str)}
+        item: JsonObject = {"kind": kind}
+        if kind == "verse":
+            item["number"] = number
+        item.update(armenian=armenian, english=english, classical=classical)
+        item.update(texts)
+        if kind == "verse":
+            notes = footnotes[item_id]
+            item["footnotes"] = {f: notes.pop(f, []) for f in (*FIELDS, *texts)} | notes
+        if indent_level is not None:
+            item["indentLevel"] = indent_level
+        if first_line_indent is not None:
+            item["firstLineIndent"] = first_line_indent
+        if poetry is not None:
+            item["poetry"] = bool(poetry)
+        item.update((key, value) for key, value in extras.items() if key not in texts)
+        items.append(item)
+    return items
+
+
+def get_verse(
+    conn: sqlite3.Connection, book_id: str, chapter: int, verse: int
+) -> JsonObject | None:
+    """One verse item, via the (book, chapter, number) index."""
+    rows = conn.execute(
+        f"SELECT {_ITEM_COLUMNS} FROM items "
+        "WHERE book_id = ? AND chapter_number = ? AND number = ? AND kind = 'verse' "
+        "ORDER BY chapter_id, position LIMIT 1",
+        (book_id, chapter, verse),
+    ).fetchall()
+    return _items(conn, rows)[0] if rows else None
+
+
+def get_chapters(
+    conn: sqlite3.Connection, book_id: str, first: int, last: int | None = None
+) -> list[JsonObject]:
+    """Chapters numbered ``first``..``last`` (inclusive, default just ``first``), in book order."""
+    last = first if last is None else last
+    chapters = conn.execute(
+        "SELECT id, number FROM chapters WHERE book_id = ? AND number BETWEEN ? AND ? "
+        "ORDER BY position",
+        (book_id, first, last),
+    ).fetchall()
+    return [_chapter(conn, chapter_id, number) for chapter_id, number in chapters]
+
+
+def _chapter(conn: sqlite3.Connection, chapter_id: int, number: int) -> JsonObject:
+    rows = conn.execute(
+        f"SELECT {_ITEM_COLUMNS} FROM items WHERE chapter_id = ? ORDER BY position",
+        (chapter_id,),
+    ).fetchall()
+    return {"number": number, "content": _items(conn, rows)}
+
+
+def iter_book(conn: sqlite3.Connection, book_id: str) -> Iterator[JsonObject]:
+    """Yield a book's chapters one at a time, in order."""
+    chapters = conn.execute(
+        "SELECT id, number FROM chapters WHERE book_id = ? ORDER BY position", (book_id,)
+    ).fetchall()
+    for chapter_id, number in chapters:
+        yield _chapter(conn, chapter_id, number)
+
+
+def read_book(conn: sqlite3.Connection, book_id: str) -> JsonObject | None:
+    """A whole book in the ``data/<book-id>.json`` shape."""
+    row = conn.execute(
+        "SELECT name_english, name_armenian, name_classical, extra FROM books WHERE id = ?",
+        (book_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    english, armenian, classical, extra = row
+    book: JsonObject = {
+        "id": book_id,
+        "name": {"english": english, "armenian": armenian, "classical": classical},
+        "chapters": list(iter_book(conn, book_id)),
+    }
+    if extra:
+        extras = json.loads(extra)
+        book["name"].update(extras.pop("name", {}))
+        book.update(extras)
+    return book
+
+
+def book_ids(conn: sqlite3.Connection) -> list[str]:
+    return [row[0] for row in conn.execute("SELECT id FROM books ORDER BY id")]
+
+
+# ── JSON ↔ SQLite sync ────────────────────────────────────────────
+
+
+def sync_to_sqlite(data_dir: Path, conn: sqlite3.Connection) -> list[str]:
+    """Load new/changed books from ``data_dir``, drop vanished ones; returns touched ids."""
+    manifest, _ = reindex(data_dir)
+    stored = dict(conn.execute("SELECT id, sha256 FROM books"))
+    touched: list[str] = []
+    live = set()
+    for entry in manifest["books"]:
+        book_id = entry["id"]
+        live.add(book_id)
+        if stored.get(book_id) != entry["sha256"]:
+            write_book(conn, load_book(data_dir, book_id), entry["sha256"])
+            touched.append(book_id)
+    for book_id in sorted(set(stored) - live):
+        delete_book(conn, book_id)
+        touched.append(book_id)
+    return touched
+
+
+def sync_to_json(conn: sqlite3.Connection, data_dir: Path) -> list[str]:
+    """Write books whose stored content differs from ``data_dir``; returns written ids."""
+    written: list[str] = []
+    for book_id in book_ids(conn):
+        book = read_book(conn, book_id)
+        assert book is not None
+        layout = book_layout(data_dir, book_id)
+        try:
+            current = load_book(data_dir, book_id)
+        except (OSError, ValueError):
+            current = None
+        if current is not None and dump_json(current) == dump_json(book):
+            continue
+        write_book_files(data_dir, book, layout)
+        written.append(book_id)
+    if written:
+        reindex(data_dir)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book JSON files (default: data/)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("to-sqlite", "load data/ books into the database (incremental)"),
+        ("to-json", "write database books back to data/"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("db", type=Path, metavar="PATH")
+    verse_cmd = sub.add_parser("verse", help="print one verse as JSON")
+    verse_cmd.add_argument("db", type=Path, metavar="PATH")
+    verse_cmd.add_argument("book_id", metavar="BOOK_ID")
+    verse_cmd.add_argument("chapter", type=int)
+    verse_cmd.add_argument("verse", type=int)
+    args = parser.parse_args()
+
+    if args.command != "to-sqlite" and not args.db.exists():
+        print(f"ERROR: {args.db} not found")
+        raise SystemExit(1)
+    conn = connect(args.db)
+    if args.command == "verse":
+        item = get_verse(conn, args.book_id, args.chapter, args.verse)
+        if item is None:
+            print(f"{args.book_id} {args.chapter}:{args.verse} not found")
+            raise SystemExit(1)
+        print(dump_json(item))
+    elif args.command == "to-sqlite":
+        touched = sync_to_sqlite(args.data, conn)
+        for book_id in touched:
+            print(f"  ✓ {book_id}")
+        print(f"{len(book_ids(conn))} books in {args.db}, {len(touched)} updated")
+    else:
+        written = sync_to_json(conn, args.data)
+        for book_id in written:
+            print(f"  ✓ {book_id}")
+        print(f"{len(written)} books written to {args.data}")
+    conn.close()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Build and refresh ``data/index.json``, the books manifest.
+
+The manifest lets ``GET /api/books`` list every book with one small file
+read instead of parsing every ``data/*.json``.  Each entry records the book
+id, names, chapter count, per-chapter verse counts, footnote count, and the
+byte size, SHA-256 and mtime (nanoseconds, as a string so JavaScript can
+compare it exactly) of the file it was built from.  A sharded book
+(``data/<book-id>/``, see ``book_shards.py``) is indexed as ``<book-id>/``
+with the total size, newest mtime and hash of ``meta.json`` followed by its
+chapter files in order.
+
+``import_docx.py`` refreshes the manifest after every import, passing in the
+entries for the books it just wrote.  After editing books in the browser,
+run this script to bring it up to date:
+
+Usage:
+    python3 scripts/book_index.py [--data DIR]
+
+Reindexing is incremental: a file whose size and mtime match its entry is
+not read at all, and one whose bytes still hash the same only gets its
+mtime refreshed.  Only genuinely changed files are re-parsed, and the
+manifest is rewritten only if something changed.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from book_compact import expand_book
+from book_shards import ShardedBook
+from data_files import (
+    MANIFEST_NAME,
+    SHARD_META_NAME,
+    atomic_write_text,
+    book_paths,
+    sharded_book_dirs,
+)
+
+JsonObject = dict[str, Any]
+
+MANIFEST_VERSION = 1
+
+
+def make_entry(
+    book_id: str,
+    name: JsonObject,
+    verse_counts: list[int],
+    footnote_count: int,
+    data: bytes,
+    file_name: str | None = None,
+) -> JsonObject:
+    """Manifest entry for one book file whose exact bytes are ``data``."""
+    return {
+        "id": book_id,
+        "file": file_name or f"{book_id}.json",
+        "name": name,
+        "chapterCount": len(verse_counts),
+        "verseCounts": verse_counts,
+        "footnoteCount": footnote_count,
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def _count_footnotes(footnotes: Any) -> int:
+    if isinstance(footnotes, dict):
+        return sum(len(fns) for fns in footnotes.values() if isinstance(fns, list))
+    if isinstance(footnotes, list):
+        return len(footnotes)
+    return 0
+
+
+def entry_from_book(book: JsonObject, data: bytes, file_name: str) -> JsonObject:
+    """Summarize a parsed book (used for files the importer didn't just write)."""
+    verse_counts: list[int] = []
+    footnote_count = 0
+    for chapter in book.get("chapters", []):
+        verses = [item for item in chapter.get("content", []) if item.get("kind") == "verse"]
+        verse_counts.append(len(verses))
+        footnote_count += sum(_count_footnotes(v.get("footnotes")) for v in verses)
+    return make_entry(
+        book.get("id") or file_name.removesuffix("/").removesuffix(".json"),
+        book.get("name", {}),
+        verse_counts,
+        footnote_count,
+        data,
+        file_name,
+    )
+
+
+def _sharded_files(book_dir: Path) -> list[Path]:
+    meta = json.loads((book_dir / SHARD_META_NAME).read_text(encoding="utf-8"))
+    return [book_dir / SHARD_META_NAME] + [book_dir / f"{n}.json" for n in meta["chapters"]]
+
+
+def _book_sources(data_dir: Path) -> list[tuple[str, list[Path]]]:
+    """(manifest file key, files making up the book) for every book in ``data_dir``."""
+    sources = [(p.name, [p]) for p in book_paths(data_dir)]
+    for book_dir in sharded_book_dirs(data_dir):
+        try:
+            sources.append((f"{book_dir.name}/", _sharded_files(book_dir)))
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            print(f"  ⚠ {book_dir.name}/: unreadable {SHARD_META_NAME} ({exc}); skipped")
+    return sources
+
+
+def load_manifest(data_dir: Path) -> dict[str, JsonObject]:
+    """Existing manifest entries keyed by file name (empty if absent/corrupt)."""
+    try:
+        raw = json.loads((data_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != MANIFEST_VERSION:
+        return {}
+    return {
+        entry["file"]: entry
+        for entry in raw.get("books", [])
+        if isinstance(entry, dict) and isinstance(entry.get("file"), str)
+    }
+
+
+def reindex(
+    data_dir: Path, written: dict[str, JsonObject] | None = None
+) -> tuple[JsonObject, list[str]]:
+    """Bring ``<data_dir>/index.json`` up to date with the book files.
+
+    ``written`` maps file names to entries built by the caller for files it
+    has just written (see ``make_entry``); those are trusted as long as the
+    file size still matches, saving a read + parse per book.
+
+    Returns:
+        (manifest, names of files whose entries were added/changed/dropped)
+    """
+    written = written or {}
+    previous = load_manifest(data_dir)
+    entries: list[JsonObject] = []
+    changed: list[str] = []
+
+    for file_name, paths in _book_sources(data_dir):
+        try:
+            stats = [p.stat() for p in paths]
+        except OSError as exc:
+            print(f"  ⚠ {file_name}: {exc}; skipped")
+            continue
+        size = sum(st.st_size for st in stats)
+        mtime_ns = str(max(st.st_mtime_ns for st in stats))
+        old = previous.get(file_name)
+        entry = written.get(file_name)
+        if entry is not None and entry["bytes"] == size:
+            entry = {**entry, "mtimeNs": mtime_ns}
+        elif old is not None and old.get("mtimeNs") == mtime_ns and old.get("bytes") == size:
+            entry = old
+        else:
+            data = b"".join(p.read_bytes() for p in paths)
+            digest = hashlib.sha256(data).hexdigest()
+            if old is not None and old.get("sha256") == digest:
+                entry = {**old, "mtimeNs": mtime_ns}
+            else:
+                try:
+                    book = (
+                        ShardedBook(paths[0].parent).to_book()
+                        if file_name.endswith("/")
+                        else expand_book(json.loads(data))
+                    )
+                    entry = {**entry_from_book(book, data, file_name), "mtimeNs": mtime_ns}
+                except (ValueError, AttributeError, TypeError) as exc:
+                    print(f"  ⚠ {file_name}: not a readable book ({exc}); skipped")
+                    continue
+        if entry != old:
+            changed.append(file_name)
+        entries.append(entry)
+
+    live = {entry["file"] for entry in entries}
+    changed.extend(sorted(name for name in previous if name not in live))
+
+    entries.sort(key=lambda e: e["id"])
+    manifest = {"version": MANIFEST_VERSION, "books": entries}
+    if changed or not (data_dir / MANIFEST_NAME).exists():
+        atomic_write_text(
+            data_dir / MANIFEST_NAME,
+            json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
+        )
+    return manifest, changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book JSON files (default: data/)",
+    )
+    args = parser.parse_args()
+
+    if not args.data.is_dir():
+        print(f"ERROR: {args.data} is not a directory")
+        raise SystemExit(1)
+
+    manifest, changed = reindex(args.data)
+    for name in changed:
+        print(f"  ✓ {name}")
+    print(
+        f"{len(manifest['books'])} books indexed, {len(changed)} updated "
+        f"→ {args.data / MANIFEST_NAME}"
+    )
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""Revision history for the books in data/, stored as verse-level deltas.
+
+Each recorded revision of a book is either a *delta* against the previous
+revision or a full *snapshot*:
+
+- A delta lists, per changed chapter, the runs of items (verses and
+  headings) replaced, inserted or deleted — ``[start, end, new items]``
+  against the previous revision's content — plus the chapter order and the
+  book's other keys when those changed.  Saving one edited verse stores one
+  verse.
+- A snapshot stores the book's other keys and one object per chapter.
+  Chapters are content-addressed, so a snapshot only adds the chapters that
+  changed since the last one.
+
+Every delta, snapshot and chapter is a gzipped JSON object named by the
+SHA-256 of its contents in ``data/.revisions/objects/``, shared by all
+books.  ``data/.revisions/<book-id>.jsonl`` lists a book's revisions in
+order, one JSON line each: revision number, UTC time, SHA-256 of the book
+(as ``book_shards.dump_json`` writes it) and the delta or snapshot object.
+
+Checking out a revision starts from the nearest snapshot at or before it
+and applies the deltas after that.  ``record`` writes a snapshot whenever
+that chain would reach ``SNAPSHOT_EVERY`` deltas, or hold more compressed
+bytes than a snapshot, so every checkout reads a bounded amount.
+``compact --keep N`` drops all but each book's last N revisions (the
+oldest kept one becomes a snapshot) and deletes objects nothing references
+any more.
+
+The API servers run ``record BOOK_ID`` after every save; ``record`` with
+no BOOK_IDs records every book that changed since its last revision, e.g.
+after an import.
+
+Usage:
+    python3 scripts/book_revisions.py [--data DIR] record [BOOK_ID ...]
+    python3 scripts/book_revisions.py [--data DIR] log BOOK_ID
+    python3 scripts/book_revisions.py [--data DIR] checkout BOOK_ID REV [--restore]
+    python3 scripts/book_revisions.py [--data DIR] diff BOOK_ID REV [REV]
+    python3 scripts/book_revisions.py [--data DIR] compact [BOOK_ID ...] [--keep N]
+
+``checkout`` prints the book as of REV; ``--restore`` writes it back to
+data/ (in the book's current layout) as a new revision.  ``diff`` lists the
+verses and headings that differ between two revisions (the second defaults
+to the latest).
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import difflib
+import gzip
+import hashlib
+import json
+import sys
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, NamedTuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: records are not serialized across processes
+    fcntl = None
+
+from book_index import reindex
+from book_shards import book_layout, dump_json, load_book, write_book_files
+from book_sync import keyed_items
+from data_files import atomic_write_bytes, atomic_write_text, book_paths, sharded_book_dirs
+
+JsonObject = dict[str, Any]
+
+REVISIONS_DIR_NAME = ".revisions"
+OBJECTS_DIR_NAME = "objects"
+# Held shared by every log writer and exclusively by ``collect_garbage``.
+STORE_LOCK_NAME = ".lock"
+
+# Longest run of deltas between two snapshots; usually the size rule in
+# ``record`` starts a new snapshot well before this.
+SNAPSHOT_EVERY = 256
+DEFAULT_KEEP = 1000
+
+
+class Revision(NamedTuple):
+    rev: int
+    time: str
+    sha256: str
+    kind: str  # "snapshot" or "delta"
+    object: str
+    bytes: int  # compressed size of the delta or snapshot object
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "rev": self.rev,
+                "time": self.time,
+                "sha256": self.sha256,
+                self.kind: self.object,
+                "bytes": self.bytes,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> Revision:
+        raw = json.loads(line)
+        kind = "snapshot" if "snapshot" in raw else "delta"
+        return cls(raw["rev"], raw["time"], raw["sha256"], kind, raw[kind], raw["bytes"])
+
+
+def _book_sha256(book: JsonObject) -> str:
+    return hashlib.sha256(dump_json(book).encode("utf-8")).hexdigest()
+
+
+def _canonical(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _pack(obj: Any) -> tuple[str, bytes]:
+    """An object's name (SHA-256 of its JSON) and gzipped bytes."""
+    data = _canonical(obj).encode("utf-8")
+    return hashlib.sha256(data).hexdigest(), gzip.compress(data, compresslevel=6, mtime=0)
+
+
+# ── Object store ──────────────────────────────────────────────────
+
+
+class RevisionStore:
+    """``data/.revisions/``: the object store plus one revision log per book."""
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = data_dir
+        self.root = data_dir / REVISIONS_DIR_NAME
+        self.objects = self.root / OBJECTS_DIR_NAME
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def write(self, digest: str, packed: bytes) -> int:
+        """Store a ``_pack``ed object (if new); returns its compressed size."""
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(path, packed)
+        return len(packed)
+
+    def put(self, obj: Any) -> tuple[str, int]:
+        """Store ``obj`` (if new); returns its name and compressed size."""
+        digest, packed = _pack(obj)
+        return digest, self.write(digest, packed)
+
+    def get(self, digest: str) -> Any:
+        return json.loads(gzip.decompress(self._object_path(digest).read_bytes()))
+
+    # ── logs ───────────────────────────────────────────────────────
+
+    def log_path(self, book_id: str) -> Path:
+        return self.root / f"{book_id}.jsonl"
+
+    def book_ids(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.stem for p in self.root.glob("*.jsonl"))
+
+    def revisions(self, book_id: str) -> list[Revision]:
+        try:
+            text = self.log_path(book_id).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return []
+        return [Revision.from_json(line) for line in text.splitlines() if line]
+
+    @contextlib.contextmanager
+    def _flock(self, name: str, shared: bool = False) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / name, "w") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+
+    @contextlib.contextmanager
+    def locked(self, book_id: str) -> Iterator[None]:
+        """Serialize writers of one book's log (autosaves can overlap).
+
+        Writers of different books run side by side, but never alongside
+        ``collect_garbage``: an object a writer stores, or finds already
+        stored, stays until the revision referencing it is logged.
+        """
+        with self._flock(STORE_LOCK_NAME, shared=True), self._flock(f".{book_id}.lock"):
+            yield
+
+    # ── snapshots and deltas ───────────────────────────────────────
+
+    def put_snapshot(self, book: JsonObject) -> tuple[str, int]:
+        chapters = [self.put(chapter)[0] for chapter in book["chapters"]]
+        return self.put({"meta": _book_meta(book), "chapters": chapters})
+
+    def snapshot_bytes(self, digest: str) -> int:
+        """Compressed bytes read to load a snapshot."""
+        paths = [self._object_path(c) for c in self.get(digest)["chapters"]]
+        return self._object_path(digest).stat().st_size + sum(p.stat().st_size for p in paths)
+
+    def load_snapshot(self, digest: str) -> JsonObject:
+        snapshot = self.get(digest)
+        return _with_chapters(snapshot["meta"], [self.get(c) for c in snapshot["chapters"]])
+
+    def checkout(self, book_id: str, rev: int | None = None) -> JsonObject:
+        """The book as of ``rev`` (default: the latest revision).
+
+        Raises:
+            KeyError: if the book has no such revision.
+            ValueError: if the rebuilt book does not match the recorded hash.
+        """
+        revisions = self.revisions(book_id)
+        return _rebuild(self, revisions, _find(revisions, book_id, rev))
+
+    def _referenced(self) -> set[str]:
+        names: set[str] = set()
+        for book_id in self.book_ids():
+            for revision in self.revisions(book_id):
+                names.add(revision.object)
+                if revision.kind == "snapshot":
+                    names.update(self.get(revision.object)["chapters"])
+        return names
+
+    def collect_garbage(self) -> int:
+        """Delete objects no revision references; returns how many.
+
+        Waits for, and holds off, every ``locked`` writer.
+        """
+        removed = 0
+        with self._flock(STORE_LOCK_NAME):
+            live = self._referenced()
+            for path in self.objects.glob("*/*"):
+                if not path.name.startswith(".") and path.parent.name + path.name not in live:
+                    path.unlink()
+                    removed += 1
+        return removed
+
+
+def _book_meta(book: JsonObject) -> JsonObject:
+    """The book without its chapters (``"chapters"`` kept as a placeholder for key order)."""
+    return {key: None if key == "chapters" else value for key, value in book.items()}
+
+
+def _with_chapters(meta: JsonObject, chapters: list[JsonObject]) -> JsonObject:
+    return {key: chapters if key == "chapters" else value for key, value in meta.items()}
+
+
+def _find(revisions: list[Revision], book_id: str, rev: int | None) -> int:
+    """Index of ``rev`` (or of the latest revision) in ``revisions``."""
+    if not revisions:
+        raise KeyError(f"{book_id}: no revisions recorded")
+    if rev is None:
+        return len(revisions) - 1
+    for i, revision in enumerate(revisions):
+        if revision.rev == rev:
+            return i
+    raise KeyError(f"{book_id}: no revision {rev}")
+
+
+def _chain_start(revisions: list[Revision], index: int) -> int:
+    """Index of the snapshot ``revisions[index]`` is rebuilt from."""
+    start = index
+    while revisions[start].kind != "snapshot":
+        start -= 1
+    return start
+
+
+def _rebuild(store: RevisionStore, revisions: list[Revision], index: int) -> JsonObject:
+    start = _chain_start(revisions, index)
+    book = store.load_snapshot(revisions[start].object)
+    for revision in revisions[start + 1 : index + 1]:
+        book = apply_delta(book, store.get(revision.object))
+    if _book_sha256(book) != revisions[index].sha256:
+        raise ValueError(f"revision {revisions[index].rev} does not rebuild to its recorded hash")
+    return book
+
+
+# ── Deltas ────────────────────────────────────────────────────────
+
+
+def _content_ops(old: list[JsonObject], new: list[JsonObject]) -> list[list[Any]]:
+    """``[start, end, items]`` runs turning ``old`` into ``new`` (indices into ``old``)."""
+    matcher = difflib.SequenceMatcher(
+        None, [_canonical(i) for i in old], [_canonical(i) for i in new], autojunk=False
+    )
+    return [
+        [i1, i2, new[j1:j2]]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def make_delta(old: JsonObject, new: JsonObject) -> JsonObject | None:
+    """Verse-level delta from ``old`` to ``new``; None if chapter numbers repeat
+    (they key the delta), in which case a snapshot is stored instead."""
+    old_numbers = [chapter["number"] for chapter in old["chapters"]]
+    new_numbers = [chapter["number"] for chapter in new["chapters"]]
+    if len(set(old_numbers)) != len(old_numbers) or len(set(new_numbers)) != len(new_numbers):
+        return None
+
+    # Compared as JSON text: 1 == 1.0 in Python, but not in the file.
+    delta: JsonObject = {}
+    if _canonical(_book_meta(old)) != _canonical(_book_meta(new)):
+        delta["meta"] = _book_meta(new)
+    if old_numbers != new_numbers:
+        delta["order"] = new_numbers
+    old_chapters = {chapter["number"]: chapter for chapter in old["chapters"]}
+    edits: JsonObject = {}
+    for chapter in new["chapters"]:
+        previous = old_chapters.get(chapter["number"])
+        if previous is not None and _canonical(previous) == _canonical(chapter):
+            continue
+        if (
+            previous is None
+            or _canonical({**previous, "content": None}) != _canonical({**chapter, "content": None})
+            or not isinstance(previous.get("content"), list)
+            or not isinstance(chapter.get("content"), list)
+        ):
+            edits[str(chapter["number"])] = {"chapter": chapter}
+            continue
+        ops = _content_ops(previous["content"], chapter["content"])
+        if ops:
+            edits[str(chapter["number"])] = {"ops": ops}
+    if edits:
+        delta["chapters"] = edits
+    return delta
+
+
+def apply_delta(book: JsonObject, delta: JsonObject) -> JsonObject:
+    """The book ``delta`` turns ``book`` into (``book`` is left untouched)."""
+    old_chapters = {chapter["number"]: chapter for chapter in book["chapters"]}
+    order = delta.get("order", list(old_chapters))
+    edits = delta.get("chapters", {})
+    chapters = []
+    for number in order:
+        edit = edits.get(str(number))
+        if edit is None:
+            chapters.append(old_chapters[number])
+        elif "chapter" in edit:
+            chapters.append(edit["chapter"])
+        else:
+            content = list(old_chapters[number]["content"])
+            for start, end, items in reversed(edit["ops"]):
+                content[start:end] = items
+            chapters.append({**old_chapters[number], "content": content})
+    return _with_chapters(delta.get("meta", _book_meta(book)), chapters)
+
+
+# ── Recording ─────────────────────────────────────────────────────
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def record(store: RevisionStore, book: JsonObject) -> Revision | None:
+    """Record ``book`` as a new revision; None if it equals the latest one."""
+    book_id = book["id"]
+    sha256 = _book_sha256(book)
+    with store.locked(book_id):
+        revisions = store.revisions(book_id)
+        if revisions and revisions[-1].sha256 == sha256:
+            return None
+
+        kind, digest, size = "snapshot", "", 0
+        if revisions:
+            start = _chain_start(revisions, len(revisions) - 1)
+            chain = revisions[start + 1 :]
+            delta = None
+            if len(chain) + 1 < SNAPSHOT_EVERY:
+                delta = make_delta(_rebuild(store, revisions, len(revisions) - 1), book)
+            if delta is not None:
+                digest, packed = _pack(delta)
+                # Past the size of a full snapshot, a chain is not worth replaying.
+                if sum(r.bytes for r in chain) + len(packed) <= store.snapshot_bytes(
+                    revisions[start].object
+                ):
+                    kind, size = "delta", store.write(digest, packed)
+        if kind == "snapshot":
+            digest, size = store.put_snapshot(book)
+
+        revision = Revision(
+            revisions[-1].rev + 1 if revisions else 1, _now(), sha256, kind, digest, size
+        )
+        with store.log_path(book_id).open("a", encoding="utf-8") as fh:
+            fh.write(revision.to_json() + "\n")
+        return revision
+
+
+def compact(store: RevisionStore, book_id: str, keep: int) -> int:
+    """Keep only the last ``keep`` revisions of ``book_id``; returns how many were dropped."""
+    with store.locked(book_id):
+        revisions = store.revisions(book_id)
+        if len(revisions) <= keep:
+            return 0
+        first = len(revisions) - keep
+        kept = revisions[first:]
+        if kept[0].kind != "snapshot":
+            digest, size = store.put_snapshot(_rebuild(store, revisions, first))
+            kept[0] = kept[0]._replace(kind="snapshot", object=digest, bytes=size)
+        atomic_write_text(
+            store.log_path(book_id), "".join(r.to_json() + "\n" for r in kept)
+        )
+        return first
+
+
+# ── Diff ──────────────────────────────────────────────────────────
+
+
+def _short(text: str, width: int = 60) -> str:
+    return json.dumps(text if len(text) <= width else text[: width - 1] + "…", ensure_ascii=False)
+
+
+def _changed_span(old: Any, new: Any, context: int = 20) -> tuple[str, str]:
+    """The differing middle of two values (as text), with a little context."""
+    a = old if isinstance(old, str) else _canonical(old)
+    b = new if isinstance(new, str) else _canonical(new)
+    start = 0
+    while start < min(len(a), len(b)) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < min(len(a), len(b)) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    start = max(start - context, 0)
+    end = max(end - context, 0)
+    prefix = "…" if start else ""
+    return prefix + a[start : len(a) - end], prefix + b[start : len(b) - end]
+
+
+def diff_books(old: JsonObject, new: JsonObject) -> list[str]:
+    """One line per verse or heading added, removed or changed (with the fields)."""
+    old_items = {k: v for chapter in old["chapters"] for k, v in keyed_items(chapter).items()}
+    new_items = {k: v for chapter in new["chapters"] for k, v in keyed_items(chapter).items()}
+    lines: list[str] = []
+    for key, item in new_items.items():
+        before = old_items.get(key)
+        if before is None:
+            lines.append(f"+ {key} {_short(item.get('english') or item.get('armenian') or '')}")
+        elif before != item:
+            for field in dict.fromkeys([*before, *item]):
+                if before.get(field) != item.get(field):
+                    was, now = _changed_span(before.get(field), item.get(field))
+                    lines.append(f"~ {key} {field}: {_short(was)} → {_short(now)}")
+    lines.extend(f"- {key}" for key in old_items if key not in new_items)
+    if _book_meta(old) != _book_meta(new):
+        lines.append("~ book name/metadata")
+    return lines
+
+
+def all_book_ids(data_dir: Path) -> list[str]:
+    return sorted([p.stem for p in book_paths(data_dir)] + [p.name for p in sharded_book_dirs(data_dir)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    p_record = commands.add_parser(
+        "record", help="record books that changed since their last revision"
+    )
+    p_record.add_argument("book_ids", nargs="*", metavar="BOOK_ID")
+    p_log = commands.add_parser("log", help="list a book's revisions")
+    p_log.add_argument("book_id", metavar="BOOK_ID")
+    p_checkout = commands.add_parser("checkout", help="print (or restore) a book as of a revision")
+    p_checkout.add_argument("book_id", metavar="BOOK_ID")
+    p_checkout.add_argument("rev", type=int, metavar="REV")
+    p_checkout.add_argument(
+        "--restore", action="store_true", help="write it back to data/ as a new revision"
+    )
+    p_diff = commands.add_parser("diff", help="verses and headings that differ between revisions")
+    p_diff.add_argument("book_id", metavar="BOOK_ID")
+    p_diff.add_argument("revs", nargs="+", type=int, metavar="REV")
+    p_compact = commands.add_parser("compact", help="drop old revisions and unreferenced objects")
+    p_compact.add_argument("book_ids", nargs="*", metavar="BOOK_ID")
+    p_compact.add_argument(
+        "--keep",
+        type=int,
+        default=DEFAULT_KEEP,
+        metavar="N",
+        help=f"revisions to keep per book (default: {DEFAULT_KEEP})",
+    )
+    args = parser.parse_args()
+
+    store = RevisionStore(args.data)
+    try:
+        if args.command == "record":
+            recorded = 0
+            for book_id in args.book_ids or all_book_ids(args.data):
+                try:
+                    book = load_book(args.data, book_id)
+                except (OSError, ValueError, KeyError) as exc:
+                    print(f"  ⚠ {book_id}: {exc}")
+                    continue
+                revision = record(store, book)
+                if revision is not None:
+                    recorded += 1
+                    print(
+                        f"  ✓ {book_id:30s} r{revision.rev} {revision.kind} "
+                        f"({revision.bytes:,} bytes)"
+                    )
+            print(f"✓ {recorded} revisions recorded")
+
+        elif args.command == "log":
+            revisions = store.revisions(args.book_id)
+            if not revisions:
+                raise KeyError(f"{args.book_id}: no revisions recorded")
+            for revision in revisions:
+                print(
+                    f"  r{revision.rev:<6d} {revision.time}  {revision.kind:8s} "
+                    f"{revision.bytes:>9,} bytes  {revision.sha256[:12]}"
+                )
+
+        elif args.command == "checkout":
+            book = store.checkout(args.book_id, args.rev)
+            if not args.restore:
+                # Exactly the bytes the revision hash covers (no trailing newline).
+                sys.stdout.write(dump_json(book))
+            else:
+                layout = book_layout(args.data, args.book_id)
+                write_book_files(args.data, book, layout)
+                reindex(args.data)
+                revision = record(store, book)
+                suffix = f" as r{revision.rev}" if revision else " (already current)"
+                print(f"✓ {args.book_id} restored to r{args.rev}{suffix}")
+
+        elif args.command == "diff":
+            if len(args.revs) > 2:
+                parser.error("diff takes one or two revisions")
+            old = store.checkout(args.book_id, args.revs[0])
+            new = store.checkout(args.book_id, args.revs[1] if len(args.revs) == 2 else None)
+            lines = diff_books(old, new)
+            for line in lines:
+                print(f"  {line}")
+            print(f"✓ {len(lines)} differences")
+
+        elif args.command == "compact":
+            if args.keep < 1:
+                parser.error("--keep must be at least 1")
+            for book_id in args.book_ids or store.book_ids():
+                dropped = compact(store, book_id, args.keep)
+                if dropped:
+                    print(f"  ✓ {book_id}: {dropped} old revisions dropped")
+            print(f"✓ {store.collect_garbage()} unreferenced objects deleted")
+    except (KeyError, ValueError) as exc:
+        print(f"ERROR: {exc.args[0] if isinstance(exc, KeyError) else exc}")
+        raise SystemExit(1)
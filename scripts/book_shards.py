@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Convert books between the monolithic, sharded and compact layouts.
+
+Monolithic:  ``data/<book-id>.json`` holds the whole book.
+Sharded:     ``data/<book-id>/meta.json`` holds everything except the
+             chapters, with ``"chapters"`` replaced by the list of chapter
+             numbers in order, and ``data/<book-id>/<chapter>.json`` holds
+             each chapter object.
+Compact:     ``data/<book-id>.json`` holds the whole book in the compact
+             format (footnote text table, no defaults, no indentation; see
+             ``book_compact.py``).
+
+Sharding lets the editor load and save one chapter's worth of bytes instead
+of a whole book; compacting makes every file smaller and faster to parse.
+Converting back and forth is lossless: unsharding or expanding an imported
+book reproduces its original file byte for byte.
+
+Usage:
+    python3 scripts/book_shards.py shard [BOOK_ID ...] [--data DIR]
+    python3 scripts/book_shards.py unshard [BOOK_ID ...] [--data DIR]
+    python3 scripts/book_shards.py compact [BOOK_ID ...] [--data DIR]
+    python3 scripts/book_shards.py expand [BOOK_ID ...] [--data DIR]
+
+With no BOOK_IDs every book in the source layout is converted (``compact``
+converts every book not already compact, sharded ones included).  Run
+``scripts/book_index.py`` afterwards (or let the next import do it).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Any
+
+from book_compact import compact_book, dump_compact, expand_book, expand_chapter, is_compact_file
+from data_files import SHARD_META_NAME, atomic_write_text, book_paths, sharded_book_dirs
+
+JsonObject = dict[str, Any]
+
+_CHAPTER_FILE_RE = re.compile(r"\d+\.json")
+
+LAYOUTS = ("monolithic", "sharded", "compact")
+
+
+def dump_json(obj: Any) -> str:
+    """Serialize the way the importer writes book files."""
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def book_layout(data_dir: Path, book_id: str) -> str:
+    """The layout ``book_id`` is stored in (``"monolithic"`` if it doesn't exist)."""
+    mono = data_dir / f"{book_id}.json"
+    if mono.exists():
+        return "compact" if is_compact_file(mono) else "monolithic"
+    if (data_dir / book_id / SHARD_META_NAME).is_file():
+        return "sharded"
+    return "monolithic"
+
+
+def book_files(book: JsonObject, layout: str) -> list[tuple[str, str]]:
+    """(path relative to ``data/``, text) for every file of ``book`` in a layout.
+
+    Raises:
+        ValueError: if a sharded book has two chapters with the same number.
+    """
+    book_id = book["id"]
+    if layout == "monolithic":
+        return [(f"{book_id}.json", dump_json(book))]
+    if layout == "compact":
+        return [(f"{book_id}.json", dump_compact(compact_book(book)))]
+
+    numbers = [chapter["number"] for chapter in book["chapters"]]
+    if len(set(numbers)) != len(numbers):
+        raise ValueError(f"{book_id}: duplicate chapter numbers cannot be sharded")
+    meta = {**book, "chapters": numbers}
+    files = [(f"{book_id}/{SHARD_META_NAME}", dump_json(meta))]
+    files.extend(
+        (f"{book_id}/{chapter['number']}.json", dump_json(chapter))
+        for chapter in book["chapters"]
+    )
+    return files
+
+
+def clear_superseded(data_dir: Path, book_id: str, keep: set[str]) -> None:
+    """Remove files of ``book_id`` that a write of ``keep`` (relative paths) replaced.
+
+    After a sharded write that is the monolithic file plus chapter shards no
+    longer listed; after a monolithic write, the whole shard directory.
+    """
+    mono = data_dir / f"{book_id}.json"
+    shard_dir = data_dir / book_id
+    if f"{book_id}.json" in keep:
+        if (shard_dir / SHARD_META_NAME).is_file():
+            shutil.rmtree(shard_dir)
+        return
+    mono.unlink(missing_ok=True)
+    for path in shard_dir.iterdir():
+        if _CHAPTER_FILE_RE.fullmatch(path.name) and f"{book_id}/{path.name}" not in keep:
+            path.unlink()
+
+
+def write_book_files(data_dir: Path, book: JsonObject, layout: str) -> list[str]:
+    """Write ``book`` in the given layout and drop its other-layout files."""
+    files = book_files(book, layout)
+    if layout == "sharded":
+        (data_dir / book["id"]).mkdir(exist_ok=True)
+    # Chapters before meta.json, so a reader never sees meta listing a missing shard.
+    for rel_path, text in reversed(files):
+        atomic_write_text(data_dir / rel_path, text)
+    keep = {rel_path for rel_path, _ in files}
+    clear_superseded(data_dir, book["id"], keep)
+    return [rel_path for rel_path, _ in files]
+
+
+# ── Lazy loading ──────────────────────────────────────────────────
+
+
+class ShardedBook:
+    """Lazy view of a ``data/<book-id>/`` directory.
+
+    Only ``meta.json`` is read up front; each chapter file is read the first
+    time it is asked for and then kept.
+    """
+
+    def __init__(self, book_dir: Path) -> None:
+        self.book_dir = book_dir
+        self.meta: JsonObject = json.loads(
+            (book_dir / SHARD_META_NAME).read_text(encoding="utf-8")
+        )
+        self._chapters: dict[int, JsonObject] = {}
+
+    @property
+    def id(self) -> str:
+        return self.meta["id"]
+
+    @property
+    def chapter_numbers(self) -> list[int]:
+        return self.meta["chapters"]
+
+    def chapter(self, number: int) -> JsonObject:
+        """Raises ``KeyError`` for a chapter the book does not list."""
+        if number not in self._chapters:
+            if number not in self.meta["chapters"]:
+                raise KeyError(number)
+            path = self.book_dir / f"{number}.json"
+            self._chapters[number] = json.loads(path.read_text(encoding="utf-8"))
+        return self._chapters[number]
+
+    def to_book(self) -> JsonObject:
+        """The whole book, in the monolithic shape."""
+        return {**self.meta, "chapters": [self.chapter(n) for n in self.chapter_numbers]}
+
+
+def load_book(data_dir: Path, book_id: str) -> JsonObject:
+    """Read a whole book in whichever layout it is stored, expanded."""
+    mono = data_dir / f"{book_id}.json"
+    if mono.exists():
+        return expand_book(json.loads(mono.read_text(encoding="utf-8")))
+    return ShardedBook(data_dir / book_id).to_book()
+
+
+def load_chapter(data_dir: Path, book_id: str, number: int) -> JsonObject:
+    """Read one chapter; for sharded books only that chapter's file is read.
+
+    Raises:
+        KeyError: if the book has no such chapter.
+    """
+    mono = data_dir / f"{book_id}.json"
+    if not mono.exists():
+        return ShardedBook(data_dir / book_id).chapter(number)
+    book = json.loads(mono.read_text(encoding="utf-8"))
+    for chapter in book["chapters"]:
+        if chapter["number"] == number:
+            return expand_chapter(chapter, book.get("footnoteTexts", []))
+    raise KeyError(number)
+
+
+# ── Conversion ────────────────────────────────────────────────────
+
+
+def shard(data_dir: Path, book_id: str) -> list[str]:
+    """``<book-id>.json`` → ``<book-id>/``; returns the files written."""
+    book = expand_book(json.loads((data_dir / f"{book_id}.json").read_text(encoding="utf-8")))
+    return write_book_files(data_dir, book, "sharded")
+
+
+def unshard(data_dir: Path, book_id: str) -> list[str]:
+    """``<book-id>/`` → ``<book-id>.json``; returns the files written."""
+    book = ShardedBook(data_dir / book_id).to_book()
+    return write_book_files(data_dir, book, "monolithic")
+
+
+def compact(data_dir: Path, book_id: str) -> list[str]:
+    """Either layout → compact ``<book-id>.json``; returns the files written."""
+    return write_book_files(data_dir, load_book(data_dir, book_id), "compact")
+
+
+def expand(data_dir: Path, book_id: str) -> list[str]:
+    """Compact ``<book-id>.json`` → indented ``<book-id>.json``; returns the files written."""
+    return write_book_files(data_dir, load_book(data_dir, book_id), "monolithic")
+
+
+def _stored_bytes(data_dir: Path, book_id: str) -> int:
+    mono = data_dir / f"{book_id}.json"
+    if mono.exists():
+        return mono.stat().st_size
+    return sum(p.stat().st_size for p in (data_dir / book_id).glob("*.json"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("direction", choices=("shard", "unshard", "compact", "expand"))
+    parser.add_argument("book_ids", nargs="*", metavar="BOOK_ID")
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    args = parser.parse_args()
+
+    if args.book_ids:
+        book_ids = args.book_ids
+    elif args.direction == "shard":
+        book_ids = [p.stem for p in book_paths(args.data)]
+    elif args.direction == "unshard":
+        book_ids = [p.name for p in sharded_book_dirs(args.data)]
+    else:
+        every = [p.stem for p in book_paths(args.data)]
+        every += [p.name for p in sharded_book_dirs(args.data)]
+        from_compact = args.direction == "expand"
+        book_ids = sorted(
+            book_id
+            for book_id in every
+            if (book_layout(args.data, book_id) == "compact") == from_compact
+        )
+
+    convert = {"shard": shard, "unshard": unshard, "compact": compact, "expand": expand}[
+        args.direction
+    ]
+    failed = False
+    for book_id in book_ids:
+        before = _stored_bytes(args.data, book_id)
+        try:
+            files = convert(args.data, book_id)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"  ⚠ {book_id}: {exc}")
+            failed = True
+            continue
+        target = f"{book_id}/ ({len(files) - 1} ch)" if args.direction == "shard" else files[0]
+        after = _stored_bytes(args.data, book_id)
+        print(f"  ✓ {book_id:30s} → {target} ({before:,} → {after:,} bytes)")
+    raise SystemExit(1 if failed else 0)
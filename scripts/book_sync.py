@@ -0,0 +1,258 @@
+"""Three-way merge of a fresh DOCX parse into browser-edited books.
+
+Every import records, per verse and heading, a short hash of each
+DOCX-derived *cell* as it was imported, in ``data/.sync-base.json``:
+
+- ``armenian`` / ``english``: the text plus that language's footnotes
+  (footnotes are anchored to word positions, so they travel with the text);
+- ``indent`` (verses only): ``indentLevel`` and ``firstLineIndent``.
+
+Classical text and classical footnotes never come from the DOCX, so a sync
+leaves them alone.  With the base hashes, ``sync_book`` needs one pass over
+the local book and one over the new parse, both indexed by (chapter, verse)
+in dicts, to decide per cell:
+
+- source unchanged since the base → keep local (edited or not);
+- local unchanged since the base → take the source's new value;
+- both changed to different values → conflict: keep local, report it, and
+  leave the base alone so the conflict is reported again until resolved.
+
+A book imported before base hashes existed has none; its first sync reports
+every cell where local and DOCX differ and records the DOCX as the base.
+
+Verses added upstream are inserted, verses removed upstream are dropped
+unless edited locally, and verses deleted locally stay deleted unless the
+source changed them.  Headings have no numbers, so they are matched by
+their order within the chapter and only ever updated in place.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from data_files import atomic_write_text
+
+JsonObject = dict[str, Any]
+
+SYNC_BASE_NAME = ".sync-base.json"
+SYNC_BASE_VERSION = 1
+
+# book id → item key ("<chapter>:<verse>" or "<chapter>:h<n>") → cell → hash
+BookBase = dict[str, dict[str, str]]
+
+TEXT_CELLS = ("armenian", "english")
+_INDENT_KEYS = ("indentLevel", "firstLineIndent")
+
+
+def _hash(value: Any) -> str:
+    data = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def item_cells(item: JsonObject) -> dict[str, Any]:
+    """The DOCX-derived cells of a verse or heading."""
+    if item["kind"] == "heading":
+        return {cell: item.get(cell, "") for cell in TEXT_CELLS}
+    footnotes = item.get("footnotes") or {}
+    cells: dict[str, Any] = {
+        cell: [item.get(cell, ""), footnotes.get(cell, [])] for cell in TEXT_CELLS
+    }
+    # Browser saves write 1 where the importer wrote 1.0; hash them the same.
+    first_line = item.get("firstLineIndent")
+    cells["indent"] = [
+        item.get("indentLevel"),
+        None if first_line is None else float(first_line),
+    ]
+    return cells
+
+
+def _apply_cell(item: JsonObject, source: JsonObject, cell: str) -> None:
+    """Copy one cell from ``source`` into ``item``."""
+    if cell == "indent":
+        for key in _INDENT_KEYS:
+            if key in source:
+                item[key] = source[key]
+            else:
+                item.pop(key, None)
+        return
+    item[cell] = source.get(cell, "")
+    if item["kind"] == "verse":
+        footnotes = item.setdefault("footnotes", {"armenian": [], "english": [], "classical": []})
+        footnotes[cell] = copy.deepcopy((source.get("footnotes") or {}).get(cell, []))
+
+
+def keyed_items(chapter: JsonObject) -> dict[str, JsonObject]:
+    """Index a chapter's items by ``"<chapter>:<verse>"`` / ``"<chapter>:h<n>"``."""
+    number = chapter["number"]
+    keyed: dict[str, JsonObject] = {}
+    headings = 0
+    for item in chapter.get("content", []):
+        if item.get("kind") == "heading":
+            keyed[f"{number}:h{headings}"] = item
+            headings += 1
+        elif item.get("kind") == "verse":
+            keyed.setdefault(f"{number}:{item['number']}", item)
+    return keyed
+
+
+def book_base(book: JsonObject) -> BookBase:
+    """Base hashes for a book exactly as the importer produced it."""
+    return {
+        key: {cell: _hash(value) for cell, value in item_cells(item).items()}
+        for chapter in book["chapters"]
+        for key, item in keyed_items(chapter).items()
+    }
+
+
+def _insert_verse(content: list[JsonObject], verse: JsonObject) -> None:
+    """Insert ``verse`` after the last local verse numbered below it."""
+    at = 0
+    for i, item in enumerate(content):
+        if item.get("kind") == "verse" and item["number"] < verse["number"]:
+            at = i + 1
+    content.insert(at, copy.deepcopy(verse))
+
+
+class SyncReport(NamedTuple):
+    updated: int  # cells taken from the source
+    added: int  # verses/chapters inserted
+    removed: int  # verses dropped because the source dropped them
+    conflicts: list[str]  # human-readable, one per conflicting cell/verse
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.updated or self.added or self.removed)
+
+
+def sync_book(
+    book: JsonObject, source: JsonObject, base: BookBase
+) -> tuple[BookBase, SyncReport]:
+    """Three-way merge ``source`` (fresh parse) into the local ``book``, in place.
+
+    Returns the base to store for next time and what happened.
+    """
+    book_id = book["id"]
+    new_base: BookBase = {}
+    updated = added = removed = 0
+    conflicts: list[str] = []
+
+    local_chapters = {ch["number"]: ch for ch in book["chapters"]}
+    local_items: dict[str, JsonObject] = {}
+    for chapter in book["chapters"]:
+        local_items.update(keyed_items(chapter))
+    base_chapters = {key.split(":", 1)[0] for key in base}
+
+    for src_chapter in source["chapters"]:
+        ch_num = src_chapter["number"]
+        src_items = keyed_items(src_chapter)
+        if ch_num not in local_chapters:
+            if str(ch_num) in base_chapters:
+                conflicts.append(f"{book_id} {ch_num}: chapter deleted locally; not restored")
+                new_base.update({k: v for k, v in base.items() if k.startswith(f"{ch_num}:")})
+                continue
+            # New upstream chapter: insert it whole, in chapter order.
+            chapter = copy.deepcopy(src_chapter)
+            at = sum(1 for ch in book["chapters"] if ch["number"] < ch_num)
+            book["chapters"].insert(at, chapter)
+            local_chapters[ch_num] = chapter
+            new_base.update(book_base({"chapters": [src_chapter]}))
+            added += 1
+            continue
+
+        for key, src_item in src_items.items():
+            src_hashes = {cell: _hash(v) for cell, v in item_cells(src_item).items()}
+            old = base.get(key, {})
+            item = local_items.get(key)
+            if item is None:
+                if src_item["kind"] == "heading":
+                    continue
+                if not old:
+                    _insert_verse(local_chapters[ch_num]["content"], src_item)
+                    new_base[key] = src_hashes
+                    added += 1
+                elif old != src_hashes:
+                    conflicts.append(
+                        f"{book_id} {key}: deleted locally, changed in DOCX; kept deleted"
+                    )
+                    new_base[key] = old
+                else:
+                    new_base[key] = old
+                continue
+
+            if src_hashes == old:
+                # Nothing changed upstream: local edits (if any) win outright.
+                new_base[key] = old
+                continue
+            local_hashes = {cell: _hash(v) for cell, v in item_cells(item).items()}
+            entry: dict[str, str] = {}
+            for cell, src_hash in src_hashes.items():
+                base_hash = old.get(cell)
+                local_hash = local_hashes.get(cell)
+                if src_hash == base_hash or src_hash == local_hash:
+                    entry[cell] = src_hash
+                elif local_hash == base_hash:
+                    _apply_cell(item, src_item, cell)
+                    entry[cell] = src_hash
+                    updated += 1
+                elif base_hash is None:
+                    # No base yet (book imported before sync existed): report the
+                    # difference once, then treat the current DOCX as the base.
+                    conflicts.append(f"{book_id} {key} {cell}: differs from DOCX; kept local")
+                    entry[cell] = src_hash
+                else:
+                    conflicts.append(
+                        f"{book_id} {key} {cell}: changed in DOCX and locally; kept local"
+                    )
+                    entry[cell] = base_hash
+            new_base[key] = entry
+
+    # Verses the source no longer has: drop them unless edited locally.
+    source_keys = {
+        key for chapter in source["chapters"] for key in keyed_items(chapter)
+    }
+    for key, old in base.items():
+        if key in source_keys or key in new_base:
+            continue
+        item = local_items.get(key)
+        if item is None or item["kind"] == "heading":
+            continue
+        local_hashes = {cell: _hash(v) for cell, v in item_cells(item).items()}
+        if local_hashes == old:
+            chapter = local_chapters[int(key.split(":", 1)[0])]
+            chapter["content"] = [i for i in chapter["content"] if i is not item]
+            removed += 1
+        else:
+            conflicts.append(f"{book_id} {key}: removed from DOCX, edited locally; kept")
+            new_base[key] = old
+
+    return new_base, SyncReport(updated, added, removed, conflicts)
+
+
+# ── Base file ─────────────────────────────────────────────────────
+
+
+def load_sync_base(data_dir: Path) -> dict[str, BookBase]:
+    """Per-book base hashes from ``<data_dir>/.sync-base.json`` (empty if absent/corrupt)."""
+    try:
+        raw = json.loads((data_dir / SYNC_BASE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != SYNC_BASE_VERSION:
+        return {}
+    books = raw.get("books")
+    return books if isinstance(books, dict) else {}
+
+
+def save_sync_base(data_dir: Path, books: dict[str, BookBase]) -> None:
+    atomic_write_text(
+        data_dir / SYNC_BASE_NAME,
+        json.dumps(
+            {"version": SYNC_BASE_VERSION, "books": books},
+            ensure_ascii=False,
+            separators=(",", ":"),
+            sort_keys=True,
+        ),
+    )
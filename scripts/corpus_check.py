@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""Check every book for misalignments between the Armenian and English texts.
+
+Each book is reduced, in parallel, to columns with one entry per verse
+(chapter, number, character and word count of each text, footnote count)
+and one entry per footnote (its verse, language and ``anchorWord``).  The
+columns of all books are then checked in one batched pass, with NumPy when it
+is installed and plain Python otherwise (same results, slower):
+
+- ``gap``: verse numbers skip ahead (``split_verses`` rejected a verse
+  number, or the DOCX lacks the verse).  ``mergedInto`` names the previous
+  verse when its text contains a missing number, i.e. the verse was probably
+  merged into it as a false positive;
+- ``chapterStart``: a chapter's first verse is not verse 1 (an excerpt, or
+  the opening verses are missing);
+- ``numbering``: a verse or chapter number repeats or goes backwards;
+- ``chapterGap``: chapter numbers skip ahead;
+- ``oneSided``: a verse has Armenian text but no English, or the reverse
+  (``merge_chapters`` keeps the union of both sides' verses);
+- ``lengthRatio``: the English/Armenian length ratio of a verse is an outlier
+  for the corpus (robust z-score of its logarithm above ``--ratio-z``),
+  which usually means text shifted between neighbouring verses;
+- ``bookRatio``: a whole book's median ratio is far from the corpus median,
+  which is what pairing the wrong books in ``merge_and_write`` looks like;
+- ``anchor``: a footnote's ``anchorWord`` is not a word of its verse.
+
+Usage:
+    python3 scripts/corpus_check.py [BOOK_ID ...] [--output report.json]
+        [--ratio-z Z] [--jobs N] [--strict] [--data DIR]
+
+``--output`` writes the findings and per-book statistics as JSON; otherwise
+they are printed.  ``--strict`` exits with status 1 when anything is found.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+import statistics
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # optional: the checks fall back to plain Python
+    np = None
+
+from book_shards import load_book
+from data_files import book_paths, sharded_book_dirs
+
+JsonObject = dict[str, Any]
+
+REPORT_VERSION = 1
+
+FIELDS = ("armenian", "english", "classical")
+# The two texts every verse should have, compared for length.
+PAIR = ("armenian", "english")
+
+DEFAULT_RATIO_Z = 3.5
+# Verses shorter than this on either side are too short for a stable ratio.
+MIN_RATIO_CHARS = 20
+# A book whose median ratio is off the corpus median by more than this
+# factor (either way) is reported as a whole.
+BOOK_RATIO_FACTOR = 1.5
+# Scales the median absolute deviation to a standard deviation.
+_MAD_SCALE = 0.6745
+
+_NUMBER_RE = re.compile(r"\d{1,3}")
+
+
+# ── Columns ───────────────────────────────────────────────────────
+
+
+@dataclass
+class Columns:
+    """Per-verse and per-footnote columns of one or more books.
+
+    Verse ``i`` is ``numbers[i]`` of chapter ``chapters[i]`` of book
+    ``book_ids[books[i]]``; ``chars[f][i]`` and ``words[f][i]`` measure its
+    ``f`` text and ``embedded[i]`` lists the numbers written in its Armenian
+    and English text (for spotting merged verses).  Footnote ``j`` belongs to
+    verse ``anchor_rows[j]``, language ``FIELDS[anchor_fields[j]]``.
+    ``chapter_list`` holds ``(book, chapter number)`` in order.
+    """
+
+    book_ids: list[str] = field(default_factory=list)
+    books: array[int] = field(default_factory=lambda: array("q"))
+    chapters: array[int] = field(default_factory=lambda: array("q"))
+    numbers: array[int] = field(default_factory=lambda: array("q"))
+    chars: dict[str, array[int]] = field(default_factory=lambda: {f: array("q") for f in FIELDS})
+    words: dict[str, array[int]] = field(default_factory=lambda: {f: array("q") for f in FIELDS})
+    footnotes: array[int] = field(default_factory=lambda: array("q"))
+    embedded: list[frozenset[int]] = field(default_factory=list)
+    anchor_rows: array[int] = field(default_factory=lambda: array("q"))
+    anchor_fields: array[int] = field(default_factory=lambda: array("q"))
+    anchor_words: array[int] = field(default_factory=lambda: array("q"))
+    anchor_ids: list[str] = field(default_factory=list)
+    chapter_list: list[tuple[int, int]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def extend(self, other: Columns) -> None:
+        """Append ``other``'s books (row and book numbers are shifted)."""
+        row_base, book_base = len(self), len(self.book_ids)
+        self.book_ids.extend(other.book_ids)
+        self.books.extend(array("q", (b + book_base for b in other.books)))
+        self.chapters.extend(other.chapters)
+        self.numbers.extend(other.numbers)
+        for f in FIELDS:
+            self.chars[f].extend(other.chars[f])
+            self.words[f].extend(other.words[f])
+        self.footnotes.extend(other.footnotes)
+        self.embedded.extend(other.embedded)
+        self.anchor_rows.extend(array("q", (r + row_base for r in other.anchor_rows)))
+        self.anchor_fields.extend(other.anchor_fields)
+        self.anchor_words.extend(other.anchor_words)
+        self.anchor_ids.extend(other.anchor_ids)
+        self.chapter_list.extend((b + book_base, n) for b, n in other.chapter_list)
+
+
+def _id_and_anchor(footnote: Any) -> tuple[str, int]:
+    """A footnote's id and ``anchorWord`` (0, i.e. out of range, if it has none)."""
+    if not isinstance(footnote, dict):
+        return "", 0
+    anchor = footnote.get("anchorWord")
+    valid = isinstance(anchor, int) and not isinstance(anchor, bool)
+    return str(footnote.get("id", "")), anchor if valid else 0
+
+
+def book_columns(data_dir: Path, book_id: str) -> Columns:
+    """Columns of one book (run in the worker processes)."""
+    book = load_book(data_dir, book_id)
+    cols = Columns(book_ids=[book_id])
+    for chapter in book.get("chapters", []):
+        ch_num = chapter.get("number", 0)
+        cols.chapter_list.append((0, ch_num))
+        for item in chapter.get("content", []):
+            if item.get("kind", "verse") != "verse":
+                continue
+            row = len(cols.numbers)
+            cols.books.append(0)
+            cols.chapters.append(ch_num)
+            cols.numbers.append(item.get("number", 0))
+            texts = {f: (item.get(f) or "").strip() for f in FIELDS}
+            for f in FIELDS:
+                cols.chars[f].append(len(texts[f]))
+                cols.words[f].append(len(texts[f].split()))
+            cols.embedded.append(
+                frozenset(int(n) for f in PAIR for n in _NUMBER_RE.findall(texts[f]))
+            )
+            count = 0
+            for f, footnotes in (item.get("footnotes") or {}).items():
+                if f not in FIELDS or not isinstance(footnotes, list):
+                    continue
+                for footnote in footnotes:
+                    count += 1
+                    cols.anchor_rows.append(row)
+                    cols.anchor_fields.append(FIELDS.index(f))
+                    note_id, anchor = _id_and_anchor(footnote)
+                    cols.anchor_words.append(anchor)
+                    cols.anchor_ids.append(note_id)
+            cols.footnotes.append(count)
+    return cols
+
+
+def load_columns(data_dir: Path, book_ids: list[str], jobs: int) -> Columns:
+    """Columns of ``book_ids``, in that order, read by ``jobs`` processes."""
+    corpus = Columns()
+    if jobs > 1 and len(book_ids) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(book_ids))) as pool:
+            chunksize = max(1, len(book_ids) // (jobs * 4))
+            for cols in pool.map(
+                book_columns, [data_dir] * len(book_ids), book_ids, chunksize=chunksize
+            ):
+                corpus.extend(cols)
+    else:
+        for book_id in book_ids:
+            corpus.extend(book_columns(data_dir, book_id))
+    return corpus
+
+
+# ── Batched checks ────────────────────────────────────────────────
+# Each returns the indices of the rows it flags; the NumPy and plain Python
+# branches agree exactly.
+
+
+def _starts_chapter(cols: Columns, i: int) -> bool:
+    return i == 0 or (cols.books[i], cols.chapters[i]) != (cols.books[i - 1], cols.chapters[i - 1])
+
+
+def _steps(cols: Columns) -> list[int]:
+    """Rows whose verse number is not one more than the previous verse's.
+
+    The first verse of a chapter is compared with 0, so a chapter that
+    starts after verse 1 is flagged too.
+    """
+    if np is not None:
+        books = np.frombuffer(cols.books, dtype=np.int64)
+        chapters = np.frombuffer(cols.chapters, dtype=np.int64)
+        numbers = np.frombuffer(cols.numbers, dtype=np.int64)
+        starts = np.ones(len(numbers), dtype=bool)
+        starts[1:] = (books[1:] != books[:-1]) | (chapters[1:] != chapters[:-1])
+        previous = np.where(starts, 0, np.roll(numbers, 1))
+        return np.flatnonzero(numbers != previous + 1).tolist()
+    flagged = []
+    for i, number in enumerate(cols.numbers):
+        if number != (0 if _starts_chapter(cols, i) else cols.numbers[i - 1]) + 1:
+            flagged.append(i)
+    return flagged
+
+
+def _log_ratios(cols: Columns) -> tuple[list[int], list[float]]:
+    """Rows long enough on both sides, and log(English / Armenian length) of each."""
+    arm, eng = cols.chars[PAIR[0]], cols.chars[PAIR[1]]
+    if np is not None:
+        a = np.frombuffer(arm, dtype=np.int64)
+        e = np.frombuffer(eng, dtype=np.int64)
+        rows = np.flatnonzero((a >= MIN_RATIO_CHARS) & (e >= MIN_RATIO_CHARS))
+        return rows.tolist(), np.log(e[rows] / a[rows]).tolist()
+    rows = [i for i in range(len(arm)) if arm[i] >= MIN_RATIO_CHARS and eng[i] >= MIN_RATIO_CHARS]
+    return rows, [math.log(eng[i] / arm[i]) for i in rows]
+
+
+def _robust_z(values: list[float]) -> tuple[list[float], float, float]:
+    """Robust z-scores of ``values``, with their median and median absolute deviation."""
+    if not values:
+        return [], 0.0, 0.0
+    if np is not None:
+        v = np.asarray(values)
+        median = float(np.median(v))
+        mad = float(np.median(np.abs(v - median)))
+        z = _MAD_SCALE * (v - median) / mad if mad else np.zeros_like(v)
+        return z.tolist(), median, mad
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    return [_MAD_SCALE * (v - median) / mad if mad else 0.0 for v in values], median, mad
+
+
+def _one_sided(cols: Columns) -> list[int]:
+    """Rows with text on exactly one side of ``PAIR``."""
+    arm, eng = cols.chars[PAIR[0]], cols.chars[PAIR[1]]
+    if np is not None:
+        a = np.frombuffer(arm, dtype=np.int64) > 0
+        e = np.frombuffer(eng, dtype=np.int64) > 0
+        return np.flatnonzero(a != e).tolist()
+    return [i for i in range(len(arm)) if (arm[i] > 0) != (eng[i] > 0)]
+
+
+def _anchor_limits(cols: Columns) -> array[int]:
+    """Word count of the text each footnote is anchored in."""
+    by_field = [cols.words[f] for f in FIELDS]
+    return array("q", (by_field[f][r] for r, f in zip(cols.anchor_rows, cols.anchor_fields)))
+
+
+def _bad_anchors(cols: Columns) -> list[int]:
+    """Footnotes whose ``anchorWord`` is not between 1 and their text's word count."""
+    limits = _anchor_limits(cols)
+    if np is not None:
+        anchors = np.frombuffer(cols.anchor_words, dtype=np.int64)
+        top = np.frombuffer(limits, dtype=np.int64)
+        return np.flatnonzero((anchors < 1) | (anchors > top)).tolist()
+    return [j for j, (a, top) in enumerate(zip(cols.anchor_words, limits)) if not 1 <= a <= top]
+
+
+# ── Report ────────────────────────────────────────────────────────
+
+
+def _finding(cols: Columns, row: int, kind: str, **detail: Any) -> JsonObject:
+    return {
+        "book": cols.book_ids[cols.books[row]],
+        "chapter": cols.chapters[row],
+        "verse": cols.numbers[row],
+        "kind": kind,
+        **detail,
+    }
+
+
+def _numbering_findings(cols: Columns) -> list[JsonObject]:
+    findings = []
+    for i in _steps(cols):
+        first = _starts_chapter(cols, i)
+        previous = 0 if first else cols.numbers[i - 1]
+        number = cols.numbers[i]
+        if number <= previous:
+            findings.append(_finding(cols, i, "numbering", previous=previous))
+            continue
+        if first:
+            findings.append(_finding(cols, i, "chapterStart"))
+            continue
+        missing = list(range(previous + 1, number))
+        detail: JsonObject = {"missing": missing}
+        if cols.embedded[i - 1] & set(missing):
+            detail["mergedInto"] = previous
+        findings.append(_finding(cols, i, "gap", **detail))
+    return findings
+
+
+def _chapter_findings(cols: Columns) -> list[JsonObject]:
+    findings = []
+    previous: tuple[int, int] | None = None
+    for book, number in cols.chapter_list:
+        expected = previous[1] + 1 if previous is not None and previous[0] == book else 1
+        if number != expected:
+            findings.append(
+                {
+                    "book": cols.book_ids[book],
+                    "chapter": number,
+                    "kind": "chapterGap" if number > expected else "numbering",
+                    "expected": expected,
+                }
+            )
+        previous = (book, number)
+    return findings
+
+
+def check(cols: Columns, ratio_z: float = DEFAULT_RATIO_Z) -> JsonObject:
+    """Run every check over ``cols``; returns the report (see module docstring)."""
+    findings = _numbering_findings(cols) + _chapter_findings(cols)
+
+    for i in _one_sided(cols):
+        missing = PAIR[1] if cols.chars[PAIR[0]][i] else PAIR[0]
+        findings.append(_finding(cols, i, "oneSided", missing=missing))
+
+    rows, logs = _log_ratios(cols)
+    scores, median, mad = _robust_z(logs)
+    for i, value, z in zip(rows, logs, scores):
+        if abs(z) > ratio_z:
+            findings.append(
+                _finding(cols, i, "lengthRatio", ratio=round(math.exp(value), 3), z=round(z, 2))
+            )
+
+    by_book: dict[int, list[float]] = {}
+    for i, value in zip(rows, logs):
+        by_book.setdefault(cols.books[i], []).append(value)
+    verse_counts = [0] * len(cols.book_ids)
+    for b in cols.books:
+        verse_counts[b] += 1
+    books = []
+    for b, book_id in enumerate(cols.book_ids):
+        values = by_book.get(b, [])
+        book_median = statistics.median(values) if values else None
+        books.append(
+            {
+                "book": book_id,
+                "verses": verse_counts[b],
+                "ratioMedian": round(math.exp(book_median), 3) if book_median is not None else None,
+            }
+        )
+        if book_median is not None and abs(book_median - median) > math.log(BOOK_RATIO_FACTOR):
+            findings.append(
+                {
+                    "book": book_id,
+                    "kind": "bookRatio",
+                    "ratio": round(math.exp(book_median), 3),
+                    "corpusRatio": round(math.exp(median), 3),
+                }
+            )
+
+    limits = _anchor_limits(cols)
+    for j in _bad_anchors(cols):
+        findings.append(
+            _finding(
+                cols,
+                cols.anchor_rows[j],
+                "anchor",
+                field=FIELDS[cols.anchor_fields[j]],
+                id=cols.anchor_ids[j],
+                anchorWord=cols.anchor_words[j],
+                words=limits[j],
+            )
+        )
+
+    order = {book_id: n for n, book_id in enumerate(cols.book_ids)}
+    findings.sort(key=lambda f: (order[f["book"]], f.get("chapter", 0), f.get("verse", 0)))
+    counts: dict[str, int] = {}
+    for finding in findings:
+        counts[finding["kind"]] = counts.get(finding["kind"], 0) + 1
+    return {
+        "version": REPORT_VERSION,
+        "backend": "numpy" if np is not None else "python",
+        "verses": len(cols),
+        "footnotes": len(cols.anchor_rows),
+        "ratio": {
+            "median": round(math.exp(median), 3),
+            "mad": round(mad, 4),
+            "z": ratio_z,
+            "minChars": MIN_RATIO_CHARS,
+        },
+        "counts": counts,
+        "books": books,
+        "findings": findings,
+    }
+
+
+def describe(finding: JsonObject) -> str:
+    """One line for the console."""
+    where = finding["book"]
+    if "chapter" in finding:
+        where += f" {finding['chapter']}"
+    if "verse" in finding:
+        where += f":{finding['verse']}"
+    kind = finding["kind"]
+    if kind == "gap":
+        text = f"missing verse(s) {', '.join(map(str, finding['missing']))}"
+        if "mergedInto" in finding:
+            text += f" (merged into {finding['mergedInto']}?)"
+    elif kind == "chapterStart":
+        text = "chapter starts here"
+    elif kind == "numbering":
+        text = f"numbered after {finding.get('previous', finding.get('expected'))}"
+    elif kind == "chapterGap":
+        text = f"chapter expected {finding['expected']}"
+    elif kind == "oneSided":
+        text = f"no {finding['missing']} text"
+    elif kind == "lengthRatio":
+        text = f"length ratio {finding['ratio']} (z {finding['z']})"
+    elif kind == "bookRatio":
+        text = f"book length ratio {finding['ratio']} vs corpus {finding['corpusRatio']}"
+    else:
+        text = (
+            f"{finding['field']} footnote {finding['id']} anchored at word "
+            f"{finding['anchorWord']} of {finding['words']}"
+        )
+    return f"{where}: {text}"
+
+
+def all_book_ids(data_dir: Path) -> list[str]:
+    return sorted(
+        [p.stem for p in book_paths(data_dir)] + [p.name for p in sharded_book_dirs(data_dir)]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("book_ids", nargs="*", metavar="BOOK_ID")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument(
+        "--ratio-z",
+        type=float,
+        default=DEFAULT_RATIO_Z,
+        help=f"robust z-score above which a length ratio is flagged (default: {DEFAULT_RATIO_Z})",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="processes reading books (default: one per CPU)",
+    )
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 on any finding")
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    args = parser.parse_args()
+
+    if not args.data.is_dir():
+        print(f"ERROR: {args.data} is not a directory")
+        raise SystemExit(1)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    book_ids = args.book_ids or all_book_ids(args.data)
+    started = time.perf_counter()
+    try:
+        cols = load_columns(args.data, book_ids, args.jobs)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"ERROR: {exc}")
+        raise SystemExit(1)
+    report = check(cols, args.ratio_z)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"  ✓ report → {args.output}")
+    else:
+        for finding in report["findings"]:
+            print(f"  ⚠ {describe(finding)}")
+    summary = ", ".join(f"{n} {kind}" for kind, n in sorted(report["counts"].items()))
+    print(
+        f"{'⚠' if report['findings'] else '✓'} {len(book_ids)} books, "
+        f"{report['verses']} verses, {report['footnotes']} footnotes checked in "
+        f"{report['seconds']:.2f}s ({report['backend']}): {summary or 'nothing found'}"
+    )
+    if args.strict and report["findings"]:
+        raise SystemExit(1)
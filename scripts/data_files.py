@@ -0,0 +1,77 @@
+"""Shared helpers for the ``data/`` directory of book JSON files.
+
+A book is either one ``data/<book-id>.json`` file (monolithic layout, plain
+or compact, see ``book_compact.py``) or a ``data/<book-id>/`` directory
+holding ``meta.json`` plus one ``<chapter>.json`` per chapter (sharded
+layout, see ``book_shards.py``);
+when both exist the monolithic file wins.  Everything else that lives next
+to them — dot-files such as the import cache and ``.trash/``, and the
+``index.json`` manifest — is tooling state and must never be treated as a
+book.
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+
+MANIFEST_NAME = "index.json"
+SHARD_META_NAME = "meta.json"
+
+# Read once, at import: os.umask can only be read by setting it, which is
+# not safe once the data server's threads are running.
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def is_book_file(name: str) -> bool:
+    """True for ``<book-id>.json`` names (not dot-files, not the manifest)."""
+    return name.endswith(".json") and not name.startswith(".") and name != MANIFEST_NAME
+
+
+def book_paths(data_dir: Path) -> list[Path]:
+    """Book files in ``data_dir``, sorted by name."""
+    if not data_dir.is_dir():
+        return []
+    return sorted(p for p in data_dir.iterdir() if p.is_file() and is_book_file(p.name))
+
+
+def sharded_book_dirs(data_dir: Path) -> list[Path]:
+    """Sharded book directories in ``data_dir`` not shadowed by a monolithic file."""
+    if not data_dir.is_dir():
+        return []
+    return sorted(
+        p
+        for p in data_dir.iterdir()
+        if p.is_dir()
+        and not p.name.startswith(".")
+        and (p / SHARD_META_NAME).is_file()
+        and not (data_dir / f"{p.name}.json").exists()
+    )
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a sibling temp file + ``os.replace`` so readers never see a partial file.
+
+    The file keeps the mode of the one it replaces; a new file gets the
+    usual ``0o666`` less the umask (``mkstemp`` would leave it at ``0o600``).
+    """
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"))
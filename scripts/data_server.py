@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+"""Book data API served from an in-memory cache of the files in data/.
+
+Serves the same ``/api/books`` routes as ``server.ts`` (and the built site
+from ``dist/``, when there is one), but keeps parsed book files in memory
+instead of reading and parsing them on every request:
+
+- Every book, shard and manifest file read is cached, least recently used
+  first out, keyed by the file's mtime and size.  A request only ``stat``s
+  the file; when that changed, the file is read and hashed, and it is
+  parsed again only if its SHA-256 changed too.  Concurrent misses on one
+  file wait for a single read.
+- Every ``GET`` answer carries a strong ``ETag`` (see
+  ``publish_data.strong_etag``) and is computed once per file version; a
+  matching ``If-None-Match`` gets ``304 Not Modified``.
+- ``GET /api/books/:id/chapters/:n`` answers from the cached book, or reads
+  only that chapter's file for a sharded book.
+- ``PUT``s are written through with ``atomic_write_*`` in the book's layout
+  (compact books stay compact), one writer per book at a time, and drop the
+  files they replaced from the cache.  A revision is then recorded in the
+  background, as the Bun server does (see ``book_revisions.py``).
+
+``--record SESSION.jsonl`` appends every API request (time offset, method,
+path and body) to a file that ``bench_server.py`` can replay.
+
+Usage:
+    python3 scripts/data_server.py [--port N] [--cache-size N]
+        [--record SESSION.jsonl] [--no-revisions] [--data DIR] [--dist DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import IO, Any
+from urllib.parse import urlsplit
+
+from book_compact import COMPACT_PREFIX, compact_book, dump_compact, expand_book, is_compact
+from book_revisions import RevisionStore, record
+from book_shards import book_layout, dump_json, load_book, write_book_files
+from data_files import (
+    MANIFEST_NAME,
+    SHARD_META_NAME,
+    atomic_write_bytes,
+    book_paths,
+    sharded_book_dirs,
+)
+from publish_data import minify, strong_etag
+
+JsonObject = dict[str, Any]
+
+DEFAULT_PORT = 3001
+DEFAULT_CACHE_SIZE = 512
+
+MANIFEST_ID = "index"
+TRASH_DIR_NAME = ".trash"
+_BOOK_ID_RE = re.compile(r"[a-z0-9_-]+")
+_BOOK_ROUTE = re.compile(r"/api/books/([a-z0-9_-]+)")
+_CHAPTER_ROUTE = re.compile(r"/api/books/([a-z0-9_-]+)/chapters/(\d+)")
+
+
+class ApiError(Exception):
+    """An error answered as ``{"error": message}`` with ``status``."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+NOT_FOUND = ApiError(HTTPStatus.NOT_FOUND, "Not found")
+INVALID_BODY = ApiError(HTTPStatus.BAD_REQUEST, "Invalid JSON body")
+
+
+# ── File cache ────────────────────────────────────────────────────
+
+
+class CachedFile:
+    """One file as last read: its bytes, parsed value and derived responses."""
+
+    __slots__ = ("stat", "sha256", "data", "value", "bodies")
+
+    def __init__(self, stat: tuple[int, int], sha256: str, data: bytes, value: Any) -> None:
+        self.stat = stat  # (mtime_ns, size)
+        self.sha256 = sha256
+        self.data = data
+        self.value = value
+        # Responses built from this version of the file: (body, ETag) by key.
+        self.bodies: dict[Any, Any] = {}
+
+    def body(self, key: Any, build: Callable[[], bytes]) -> tuple[bytes, str]:
+        """The response ``build`` makes from this file, built once per version."""
+        found = self.bodies.get(key)
+        if found is None:
+            data = build()
+            found = self.bodies[key] = (data, strong_etag(data))
+        return found
+
+
+class FileCache:
+    """LRU of parsed files, revalidated against mtime and size on every lookup.
+
+    ``hits`` counts lookups answered without reading the file, ``reads`` the
+    files read, and ``parses`` the reads whose content actually changed.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Path, CachedFile] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: dict[Path, threading.Lock] = {}
+        self.hits = self.reads = self.parses = 0
+
+    def _lookup(self, path: Path, stat: tuple[int, int]) -> CachedFile | None:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stat == stat:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+        return None
+
+    def get(self, path: Path, parse: Callable[[bytes], Any]) -> CachedFile:
+        """The current version of ``path``.
+
+        Raises:
+            FileNotFoundError: if ``path`` does not exist.
+            ValueError: if it does not parse.
+        """
+        st = path.stat()
+        entry = self._lookup(path, (st.st_mtime_ns, st.st_size))
+        if entry is not None:
+            return entry
+        with self._lock:
+            loading = self._loading.setdefault(path, threading.Lock())
+        with loading:
+            try:
+                return self._load(path, parse)
+            finally:
+                with self._lock:
+                    self._loading.pop(path, None)
+
+    def _load(self, path: Path, parse: Callable[[bytes], Any]) -> CachedFile:
+        # Another thread may have read the file while this one waited.
+        st = path.stat()
+        entry = self._lookup(path, (st.st_mtime_ns, st.st_size))
+        if entry is not None:
+            return entry
+        with path.open("rb") as fh:
+            st = os.fstat(fh.fileno())
+            data = fh.read()
+        stat = (st.st_mtime_ns, st.st_size)
+        sha256 = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self.reads += 1
+            previous = self._entries.get(path)
+        if previous is not None and previous.sha256 == sha256:
+            entry = previous  # touched, not changed
+            entry.stat = stat
+        else:
+            entry = CachedFile(stat, sha256, data, parse(data))
+            with self._lock:
+                self.parses += 1
+        self._store(path, entry)
+        return entry
+
+    def _store(self, path: Path, entry: CachedFile) -> None:
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, path: Path, data: bytes, value: Any) -> None:
+        """Cache what was just written to ``path`` (write-through)."""
+        st = path.stat()
+        sha256 = hashlib.sha256(data).hexdigest()
+        self._store(path, CachedFile((st.st_mtime_ns, st.st_size), sha256, data, value))
+
+    def invalidate(self, path: Path) -> None:
+        """Forget ``path``, and everything under it if it is a directory."""
+        with self._lock:
+            for cached in [p for p in self._entries if p == path or path in p.parents]:
+                del self._entries[cached]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "reads": self.reads,
+                "parses": self.parses,
+            }
+
+
+def _parse_json(data: bytes) -> Any:
+    return json.loads(data)
+
+
+def _parse_book(data: bytes) -> JsonObject:
+    book = json.loads(data)
+    return expand_book(book) if is_compact(book) else book
+
+
+# ── Books ─────────────────────────────────────────────────────────
+
+
+class BookData:
+    """The API's reads and writes over ``data_dir``, through a ``FileCache``."""
+
+    def __init__(
+        self, data_dir: Path, cache: FileCache | None = None, revisions: bool = True
+    ) -> None:
+        self.data_dir = data_dir
+        self.cache = cache or FileCache()
+        self._write_locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        # Revisions are recorded one at a time, off the request threads.
+        self._revision_pool = ThreadPoolExecutor(max_workers=1) if revisions else None
+
+    @contextmanager
+    def writing(self, book_id: str) -> Iterator[None]:
+        """Serialize writes to one book (chapter PUTs rewrite whole files)."""
+        with self._locks_lock:
+            lock = self._write_locks.setdefault(book_id, threading.Lock())
+        with lock:
+            yield
+
+    def _mono(self, book_id: str) -> Path:
+        return self.data_dir / f"{book_id}.json"
+
+    def _is_sharded(self, book_id: str) -> bool:
+        return (
+            not self._mono(book_id).exists()
+            and (self.data_dir / book_id / SHARD_META_NAME).is_file()
+        )
+
+    def _meta(self, book_id: str) -> CachedFile:
+        return self.cache.get(self.data_dir / book_id / SHARD_META_NAME, _parse_json)
+
+    def _shard(self, book_id: str, number: int) -> CachedFile:
+        return self.cache.get(self.data_dir / book_id / f"{number}.json", _parse_json)
+
+    # Reads return (body, ETag).
+
+    def list_books(self) -> tuple[bytes, str]:
+        """Book summaries, from the manifest wherever it is still current."""
+        manifest: dict[str, JsonObject] = {}
+        try:
+            raw = self.cache.get(self.data_dir / MANIFEST_NAME, _parse_json).value
+            manifest = {b["file"]: b for b in raw.get("books", [])}
+        except (OSError, ValueError, KeyError, AttributeError, TypeError):
+            pass  # no manifest yet: every book is read below
+
+        summaries = []
+        for path in book_paths(self.data_dir):
+            entry = manifest.get(path.name)
+            st = path.stat()
+            if (
+                entry is not None
+                and entry.get("mtimeNs") == str(st.st_mtime_ns)
+                and entry.get("bytes") == st.st_size
+            ):
+                summaries.append({key: entry[key] for key in ("id", "name", "chapterCount")})
+                continue
+            book = self.cache.get(path, _parse_book).value
+            summaries.append(
+                {"id": book["id"], "name": book["name"], "chapterCount": len(book["chapters"])}
+            )
+        for book_dir in sharded_book_dirs(self.data_dir):
+            meta = self._meta(book_dir.name).value
+            summaries.append(
+                {"id": meta["id"], "name": meta["name"], "chapterCount": len(meta["chapters"])}
+            )
+        data = minify(summaries)
+        return data, strong_etag(data)
+
+    def book(self, book_id: str) -> tuple[bytes, str]:
+        """The whole book: plain files as stored, compact ones expanded."""
+        if self._is_sharded(book_id):
+            return self._sharded_book(book_id)
+        try:
+            entry = self.cache.get(self._mono(book_id), _parse_book)
+        except FileNotFoundError:
+            raise NOT_FOUND from None
+        if entry.data.startswith(COMPACT_PREFIX):
+            return entry.body("book", lambda: minify(entry.value))
+        return entry.body("book", lambda: entry.data)
+
+    def _sharded_book(self, book_id: str) -> tuple[bytes, str]:
+        meta = self._meta(book_id)
+        shards = [self._shard(book_id, n) for n in meta.value["chapters"]]
+        version = tuple(s.sha256 for s in shards)
+        cached = meta.bodies.get("book")
+        if cached is None or cached[0] != version:
+            book = {**meta.value, "chapters": [s.value for s in shards]}
+            data = dump_json(book).encode("utf-8")
+            cached = meta.bodies["book"] = (version, (data, strong_etag(data)))
+        return cached[1]
+
+    def chapter(self, book_id: str, number: int) -> tuple[bytes, str]:
+        if self._is_sharded(book_id):
+            if number not in self._meta(book_id).value["chapters"]:
+                raise NOT_FOUND
+            shard = self._shard(book_id, number)
+            return shard.body("chapter", lambda: shard.data)
+        try:
+            entry = self.cache.get(self._mono(book_id), _parse_book)
+        except FileNotFoundError:
+            raise NOT_FOUND from None
+        for chapter in entry.value["chapters"]:
+            if chapter["number"] == number:
+                return entry.body(("chapter", number), lambda: dump_json(chapter).encode("utf-8"))
+        raise NOT_FOUND
+
+    # Writes raise ApiError for a bad request and leave the cache current.
+
+    def create_book(self, body: bytes) -> None:
+        book = _parse_body(body)
+        book_id = book.get("id")
+        valid = isinstance(book_id, str) and _BOOK_ID_RE.fullmatch(book_id) is not None
+        if not valid or book_id == MANIFEST_ID:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid book id")
+        with self.writing(book_id):
+            if self._mono(book_id).exists() or self._is_sharded(book_id):
+                raise ApiError(HTTPStatus.CONFLICT, "Book already exists")
+            atomic_write_bytes(self._mono(book_id), body)
+
+    def put_book(self, book_id: str, body: bytes) -> None:
+        """Replace a whole book, keeping its layout."""
+        book = _parse_book_body(body)
+        with self.writing(book_id):
+            layout = book_layout(self.data_dir, book_id)
+            mono = self._mono(book_id)
+            try:
+                if layout == "sharded":
+                    if book.get("id") != book_id:
+                        raise ApiError(HTTPStatus.BAD_REQUEST, "Book id does not match the URL")
+                    write_book_files(self.data_dir, book, layout)
+                    self.cache.invalidate(self.data_dir / book_id)
+                elif layout == "compact":
+                    data = dump_compact(compact_book(book)).encode("utf-8")
+                    atomic_write_bytes(mono, data)
+                    self.cache.put(mono, data, book)
+                else:
+                    atomic_write_bytes(mono, body)
+                    self.cache.put(mono, body, book)
+            except (KeyError, TypeError, AttributeError, ValueError):
+                raise INVALID_BODY from None
+        self._record(book_id)
+
+    def put_chapter(self, book_id: str, number: int, body: bytes) -> None:
+        """Replace one existing chapter (new chapters go through ``put_book``)."""
+        chapter = _parse_body(body)
+        if chapter.get("number") != number:
+            raise NOT_FOUND
+        with self.writing(book_id):
+            if self._is_sharded(book_id):
+                if number not in self._meta(book_id).value["chapters"]:
+                    raise NOT_FOUND
+                path = self.data_dir / book_id / f"{number}.json"
+                data = dump_json(chapter).encode("utf-8")
+                atomic_write_bytes(path, data)
+                self.cache.put(path, data, chapter)
+            else:
+                mono = self._mono(book_id)
+                try:
+                    entry = self.cache.get(mono, _parse_book)
+                except FileNotFoundError:
+                    raise NOT_FOUND from None
+                chapters = list(entry.value["chapters"])
+                index = next((i for i, c in enumerate(chapters) if c["number"] == number), None)
+                if index is None:
+                    raise NOT_FOUND
+                chapters[index] = chapter
+                # A new dict: readers may still hold the cached one.
+                book = {**entry.value, "chapters": chapters}
+                if entry.data.startswith(COMPACT_PREFIX):
+                    data = dump_compact(compact_book(book)).encode("utf-8")
+                else:
+                    data = dump_json(book).encode("utf-8")
+                atomic_write_bytes(mono, data)
+                self.cache.put(mono, data, book)
+        self._record(book_id)
+
+    def delete_book(self, book_id: str) -> None:
+        """Move a book to ``data/.trash/``."""
+        with self.writing(book_id):
+            sharded = self._is_sharded(book_id)
+            mono = self._mono(book_id)
+            if not sharded and not mono.exists():
+                raise NOT_FOUND
+            trash = self.data_dir / TRASH_DIR_NAME
+            trash.mkdir(exist_ok=True)
+            if sharded:
+                # Only the latest deletion of a book is kept in the trash.
+                shutil.rmtree(trash / book_id, ignore_errors=True)
+                os.replace(self.data_dir / book_id, trash / book_id)
+                self.cache.invalidate(self.data_dir / book_id)
+            else:
+                os.replace(mono, trash / mono.name)
+                self.cache.invalidate(mono)
+
+    def _record(self, book_id: str) -> None:
+        if self._revision_pool is not None:
+            self._revision_pool.submit(self._record_now, book_id)
+
+    def _record_now(self, book_id: str) -> None:
+        try:
+            record(RevisionStore(self.data_dir), load_book(self.data_dir, book_id))
+        except Exception:
+            pass  # a failed revision never fails the save, as in server.ts
+
+    def close(self) -> None:
+        """Wait for pending revisions."""
+        if self._revision_pool is not None:
+            self._revision_pool.shutdown(wait=True)
+
+
+def _parse_body(body: bytes) -> JsonObject:
+    try:
+        value = json.loads(body)
+    except ValueError:
+        raise INVALID_BODY from None
+    if not isinstance(value, dict):
+        raise INVALID_BODY
+    return value
+
+
+def _parse_book_body(body: bytes) -> JsonObject:
+    """A whole-book body: an object whose ``chapters`` have integer numbers."""
+    book = _parse_body(body)
+    chapters = book.get("chapters")
+    if not isinstance(chapters, list) or not all(
+        isinstance(c, dict) and type(c.get("number")) is int for c in chapters
+    ):
+        raise INVALID_BODY
+    return book
+
+
+# ── HTTP ──────────────────────────────────────────────────────────
+
+
+class SessionRecorder:
+    """Appends every API request to a JSONL file for ``bench_server.py``."""
+
+    def __init__(self, path: Path) -> None:
+        self._fh: IO[str] = path.open("a", encoding="utf-8")
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, method: str, path: str, body: bytes) -> None:
+        line: JsonObject = {
+            "t": round(time.monotonic() - self._started, 3),
+            "method": method,
+            "path": path,
+        }
+        if body:
+            line["body"] = body.decode("utf-8", errors="replace")
+        with self._lock:
+            self._fh.write(json.dumps(line, ensure_ascii=False) + "\n")
+            self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class DataServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # An editor opens several connections at once; the default backlog of 5
+    # makes the rest wait out a SYN retry.
+    request_queue_size = 64
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        data: BookData,
+        dist: Path,
+        recorder: SessionRecorder | None = None,
+    ) -> None:
+        super().__init__(address, ApiHandler)
+        self.data = data
+        self.dist = dist
+        self.recorder = recorder
+
+
+class ApiHandler(SimpleHTTPRequestHandler):
+    """``/api/...`` from ``server.data``; anything else from ``server.dist``."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this the body waits
+    # for the client's delayed ACK.
+    disable_nagle_algorithm = True
+    server: DataServer
+
+    def __init__(self, request: Any, client_address: Any, server: DataServer) -> None:
+        super().__init__(request, client_address, server, directory=str(server.dist))
+
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        pass  # like server.ts: only errors are logged
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path.startswith("/api/"):
+            self._api("GET", path)
+            return
+        # SPA fallback: unknown paths get the app, which routes client-side.
+        if not (self.server.dist / path.lstrip("/")).is_file():
+            self.path = "/index.html"
+        super().do_GET()
+
+    def do_PUT(self) -> None:
+        self._api("PUT", urlsplit(self.path).path)
+
+    def do_POST(self) -> None:
+        self._api("POST", urlsplit(self.path).path)
+
+    def do_DELETE(self) -> None:
+        self._api("DELETE", urlsplit(self.path).path)
+
+    def _api(self, method: str, path: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.server.recorder is not None:
+            self.server.recorder.write(method, self.path, body)
+        try:
+            status, data, etag = self._route(method, path, body)
+        except ApiError as exc:
+            status, data, etag = exc.status, minify({"error": str(exc)}), None
+        except FileNotFoundError:  # deleted while being read
+            status, data, etag = HTTPStatus.NOT_FOUND, minify({"error": "Not found"}), None
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            self.log_error("%s %s: %r", method, path, exc)
+            status, data, etag = (
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                minify({"error": "Could not read book data"}),
+                None,
+            )
+
+        if etag is not None and etag in _etags(self.headers.get("If-None-Match")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self, method: str, path: str, body: bytes) -> tuple[HTTPStatus, bytes, str | None]:
+        """(status, body, ETag) for an API request; ETags only for reads."""
+        data = self.server.data
+        ok = (HTTPStatus.OK, minify({"ok": True}), None)
+        if path == "/api/books":
+            if method == "GET":
+                return (HTTPStatus.OK, *data.list_books())
+            if method == "POST":
+                data.create_book(body)
+                return (HTTPStatus.CREATED, ok[1], None)
+
+        match = _CHAPTER_ROUTE.fullmatch(path)
+        if match and match[1] != MANIFEST_ID:
+            if method == "GET":
+                return (HTTPStatus.OK, *data.chapter(match[1], int(match[2])))
+            if method == "PUT":
+                data.put_chapter(match[1], int(match[2]), body)
+                return ok
+
+        match = _BOOK_ROUTE.fullmatch(path)
+        if match and match[1] != MANIFEST_ID:
+            if method == "GET":
+                return (HTTPStatus.OK, *data.book(match[1]))
+            if method == "PUT":
+                data.put_book(match[1], body)
+                return ok
+            if method == "DELETE":
+                data.delete_book(match[1])
+                return ok
+        raise NOT_FOUND
+
+
+def _etags(header: str | None) -> set[str]:
+    """The entity tags of an ``If-None-Match`` header (weak ones compared strongly)."""
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+if __name__ == "__main__":
+    root = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"(default: {DEFAULT_PORT})")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"files kept in memory (default: {DEFAULT_CACHE_SIZE})",
+    )
+    parser.add_argument("--record", type=Path, help="append every API request to this JSONL file")
+    parser.add_argument(
+        "--no-revisions", action="store_true", help="do not record revisions after saves"
+    )
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=root / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    parser.add_argument(
+        "--dist", type=Path, default=root / "dist", help="built site to serve (default: dist/)"
+    )
+    args = parser.parse_args()
+
+    if not args.data.is_dir():
+        print(f"ERROR: {args.data} is not a directory")
+        raise SystemExit(1)
+    if args.cache_size < 1:
+        parser.error("--cache-size must be at least 1")
+
+    data = BookData(args.data, FileCache(args.cache_size), revisions=not args.no_revisions)
+    recorder = SessionRecorder(args.record) if args.record else None
+    server = DataServer((args.host, args.port), data, args.dist, recorder)
+    print(f"Server running on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        data.close()
+        if recorder is not None:
+            recorder.close()
@@ -0,0 +1,251 @@
+"""Footnote and endnote texts of DOCX files, decoded on demand.
+
+A ``NoteStore`` maps note keys (``<prefix>:<id>``, the ids the importer
+writes into each footnote) to note text, like the dict the importer used to
+build, without parsing the notes up front:
+
+- ``add_docx`` makes one streaming pass over ``word/footnotes.xml`` and
+  ``word/endnotes.xml``, spooling each part to a temporary file and keeping
+  only the byte range of every note.
+- A note is parsed from its byte range the first time it is looked up, and
+  a bounded LRU keeps the most recent texts.
+
+Memory therefore grows with the notes a run actually looks up, not with the
+size of the notes parts.  Endnotes are keyed under their own prefix (see
+``endnote_prefix``), so one store serves both kinds of note for any number
+of documents, and ``a | b`` combines stores.
+
+A store can be pickled (to hand it to worker processes): the copy reads the
+same temporary files, which are removed once the original store is gone.
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
+import weakref
+import xml.parsers.expat
+import zipfile
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any, BinaryIO
+
+WML = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Notes part → (note element, suffix appended to the document's prefix).
+NOTE_PARTS = {
+    "word/footnotes.xml": ("footnote", ""),
+    "word/endnotes.xml": ("endnote", "-end"),
+}
+# Separator notes hold Word's rule above the notes, not text.
+_SKIPPED_TYPES = {"separator", "continuationSeparator"}
+
+DEFAULT_CACHE_SIZE = 4096
+_CHUNK = 1 << 16
+
+
+def endnote_prefix(prefix: str) -> str:
+    """Key prefix of a document's endnotes (its footnotes use ``prefix``)."""
+    return prefix + NOTE_PARTS["word/endnotes.xml"][1]
+
+
+def _discard(state: dict[str, Any], path: str) -> None:
+    """Close a part's file handle (if it opened one) and remove its spool file."""
+    fh = state.get("_fh")
+    if fh is not None:
+        fh.close()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+class _NotesPart:
+    """One spooled notes part, indexed as sorted note ids → content byte ranges."""
+
+    def __init__(
+        self, path: str, ids: array[int], starts: array[int], ends: array[int], text_names: set[str]
+    ) -> None:
+        self.path = path
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+        # Raw (prefixed) names of w:t in this part: ranges are parsed without
+        # their namespace declarations.
+        self.text_names = text_names
+        self._fh: BinaryIO | None = None
+
+    @classmethod
+    def scan(cls, raw: BinaryIO, note_tag: str) -> _NotesPart:
+        """Spool ``raw`` to a temporary file, indexing every ``w:<note_tag>``."""
+        note_name = f"{WML} {note_tag}"
+        ids, starts, ends = array("q"), array("q"), array("q")
+        text_names = {"w:t"}
+        depth = 0
+        # Id of the note being read, and where its content starts (None until
+        # the first element inside it).
+        note_id: int | None = None
+        start: int | None = None
+
+        parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+
+        def on_namespace(prefix: str | None, uri: str) -> None:
+            if uri == WML:
+                text_names.add(f"{prefix}:t" if prefix else "t")
+
+        def on_start(name: str, attrs: dict[str, str]) -> None:
+            nonlocal depth, note_id, start
+            depth += 1
+            if note_id is not None and start is None:
+                start = parser.CurrentByteIndex
+            elif depth == 2 and name == note_name:
+                raw_id = attrs.get(f"{WML} id")
+                if raw_id is not None and attrs.get(f"{WML} type") not in _SKIPPED_TYPES:
+                    with contextlib.suppress(ValueError):
+                        note_id = int(raw_id)
+
+        def on_end(name: str) -> None:
+            nonlocal depth, note_id, start
+            depth -= 1
+            if depth == 1 and note_id is not None:
+                end = parser.CurrentByteIndex
+                ids.append(note_id)
+                starts.append(end if start is None else start)
+                ends.append(end)
+                note_id = start = None
+
+        parser.StartNamespaceDeclHandler = on_namespace
+        parser.StartElementHandler = on_start
+        parser.EndElementHandler = on_end
+
+        fd, path = tempfile.mkstemp(prefix="docx-notes-", suffix=".xml")
+        try:
+            with os.fdopen(fd, "wb") as spool:
+                for chunk in iter(lambda: raw.read(_CHUNK), b""):
+                    spool.write(chunk)
+                    parser.Parse(chunk, False)
+                parser.Parse(b"", True)
+        except BaseException:
+            os.unlink(path)
+            raise
+        del parser  # the handlers refer to it; free it without waiting for gc
+
+        if any(a >= b for a, b in zip(ids, ids[1:])):
+            # Word writes notes in id order; sort in case a producer did not.
+            # A repeated id keeps its last note, as a dict would.
+            ranges = sorted({r[0]: r for r in zip(ids, starts, ends)}.values())
+            ids, starts, ends = (array("q", column) for column in zip(*ranges))
+        part = cls(path, ids, starts, ends, text_names)
+        weakref.finalize(part, _discard, part.__dict__, path)
+        return part
+
+    def __getstate__(self) -> dict[str, object]:
+        # Copies share the file but never own it (see ``scan``).
+        return {**self.__dict__, "_fh": None}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def find(self, note_id: int) -> int | None:
+        """Position of ``note_id`` in the index, or None."""
+        i = bisect_left(self.ids, note_id)
+        return i if i < len(self.ids) and self.ids[i] == note_id else None
+
+    def text(self, note_id: int) -> str | None:
+        """The note's text (its ``w:t`` runs, stripped); None if there is no such note."""
+        i = self.find(note_id)
+        if i is None:
+            return None
+        start, end = self.starts[i], self.ends[i]
+        if start == end:
+            return ""
+        if self._fh is None:
+            self._fh = open(self.path, "rb")
+        self._fh.seek(start)
+        content = self._fh.read(end - start)
+
+        parts: list[str] = []
+        in_text = False
+        parser = xml.parsers.expat.ParserCreate()
+
+        def on_start(name: str, attrs: dict[str, str]) -> None:
+            nonlocal in_text
+            in_text = name in self.text_names
+
+        def on_end(name: str) -> None:
+            nonlocal in_text
+            in_text = False
+
+        def on_text(data: str) -> None:
+            if in_text:
+                parts.append(data)
+
+        parser.StartElementHandler = on_start
+        parser.EndElementHandler = on_end
+        parser.CharacterDataHandler = on_text
+        parser.Parse(b"<notes>" + content + b"</notes>", True)
+        return "".join(parts).strip()
+
+
+class NoteStore(Mapping[str, str]):
+    """Note key (``prefix:id``) → text, for any number of DOCX files."""
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.cache_size = cache_size
+        self._parts: dict[str, _NotesPart] = {}
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    def add_docx(self, docx_path: Path, prefix: str) -> None:
+        """Index the footnotes (``prefix:id``) and endnotes of one DOCX."""
+        with zipfile.ZipFile(docx_path) as zf:
+            names = set(zf.namelist())
+            for part_name, (note_tag, suffix) in NOTE_PARTS.items():
+                if part_name in names:
+                    with zf.open(part_name) as raw:
+                        self._parts[prefix + suffix] = _NotesPart.scan(raw, note_tag)
+
+    def __or__(self, other: object) -> NoteStore:
+        if not isinstance(other, NoteStore):
+            return NotImplemented
+        merged = NoteStore(max(self.cache_size, other.cache_size))
+        merged._parts = {**self._parts, **other._parts}
+        return merged
+
+    def __getstate__(self) -> dict[str, object]:
+        return {"cache_size": self.cache_size, "_parts": self._parts, "_cache": OrderedDict()}
+
+    def _split(self, key: str) -> tuple[_NotesPart, int] | None:
+        prefix, _, raw_id = key.rpartition(":")
+        part = self._parts.get(prefix)
+        if part is None or not raw_id.isdigit():
+            return None
+        return part, int(raw_id)
+
+    def __getitem__(self, key: str) -> str:
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+            return text
+        found = self._split(key)
+        text = found[0].text(found[1]) if found is not None else None
+        if text is None:
+            raise KeyError(key)
+        self._cache[key] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        found = self._split(key)
+        return found is not None and found[0].find(found[1]) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for prefix, part in self._parts.items():
+            for note_id in part.ids:
+                yield f"{prefix}:{note_id}"
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self._parts.values())
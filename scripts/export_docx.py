@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""Export books from data/ back to DOCX (one language per file) or static HTML.
+
+The DOCX is the inverse of ``import_docx.py``: every book starts with its
+uppercase name, every chapter with a paragraph holding just its number,
+section headings are uppercase paragraphs, and each verse is its own
+``"<number> <text>"`` paragraph carrying ``w:ind`` from ``indentLevel``
+(360 twips per level) and ``firstLineIndent`` (360 twips per em).  Footnotes
+are real ``w:footnoteReference`` runs placed right after word
+``anchorWord``, so re-importing the Armenian and English exports reproduces
+the books.  Footnotes keep their number when their id is the importer's
+``arm:<n>`` / ``eng:<n>``; others (added in the browser) are numbered from
+1000000 up so they never collide with those.
+
+What DOCX cannot carry, and so does not survive a round trip: Classical
+Armenian text (the importer never reads it), ``poetry`` flags, manual line
+breaks inside a verse (written as ``w:br``, read back as a space), footnotes
+with empty text, verses with no text in the exported language, and negative
+``firstLineIndent`` (the importer drops hanging indents).
+
+The HTML export puts any number of language fields side by side, one column
+each, with per-book endnotes — a read-only copy for reviewers.
+
+Both writers hold one book at a time: ``word/document.xml`` is streamed into
+the zip entry book by book while footnotes are spooled to a temporary file
+and copied into ``word/footnotes.xml`` at the end, and the HTML is written
+as each book is rendered.
+
+Usage:
+    python3 scripts/export_docx.py docx FIELD OUT.docx [BOOK_ID ...] [--data DIR]
+    python3 scripts/export_docx.py html OUT.html [BOOK_ID ...]
+        [--fields armenian,english] [--data DIR]
+    python3 scripts/export_docx.py check [BOOK_ID ...] [--data DIR]
+
+The importer only sees a new book where the first chapter number is one the
+previous book already reached, so books starting mid-way (e.g. excerpts from
+chapter 3) must come after a longer book.  With no BOOK_IDs every book is
+exported in id order, except that each book starting mid-way is moved up to
+follow the first book that reaches its first chapter; BOOK_IDs are exported
+in the order given, and the exporter warns when that will not re-import.
+
+``check`` exports Armenian and English to a temporary directory, re-imports
+them and reports every verse, heading or chapter that does not come back
+unchanged.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import html
+import io
+import re
+import shutil
+import tempfile
+import zipfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+from xml.sax.saxutils import escape, quoteattr
+
+from book_shards import load_book
+from book_sync import book_base
+from data_files import book_paths, sharded_book_dirs
+from import_docx import (
+    DEFAULT_FOOTNOTE_PREFIXES,
+    WML,
+    _looks_like_heading,
+    _pair_books,
+    build_book,
+    parse_multibook,
+)
+
+JsonObject = dict[str, Any]
+
+# ── Package parts ─────────────────────────────────────────────────
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/footnotes.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"/>
+<Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>
+</Types>"""
+
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/footnotes" Target="footnotes.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>
+</Relationships>"""
+
+SETTINGS = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings xmlns:w="{WML}"><w:footnotePr><w:footnote w:id="-1"/><w:footnote w:id="0"/></w:footnotePr></w:settings>"""
+
+DOCUMENT_HEAD = f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<w:document xmlns:w="{WML}"><w:body>'
+DOCUMENT_TAIL = "<w:sectPr/></w:body></w:document>"
+
+FOOTNOTES_HEAD = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<w:footnotes xmlns:w="{WML}">'
+    '<w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+    '<w:footnote w:type="continuationSeparator" w:id="0"><w:p><w:r><w:continuationSeparator/></w:r></w:p></w:footnote>'
+)
+FOOTNOTES_TAIL = "</w:footnotes>"
+
+# The importer reads 360 twips as one indent level and as one em.
+TWIPS_PER_LEVEL = 360
+# Footnotes without an importer id are numbered from here.
+FRESH_FOOTNOTE_ID = 1_000_000
+
+_SUPERSCRIPT = '<w:rPr><w:vertAlign w:val="superscript"/></w:rPr>'
+_WORD_RE = re.compile(r"\S+")
+_LINE_BREAK_RE = re.compile(r"[ \t]*\n[ \t]*")
+
+
+def _zip_info(name: str) -> zipfile.ZipInfo:
+    # Fixed timestamps: the same books always give the same bytes.
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+# ── Shared text layout ────────────────────────────────────────────
+
+
+def display_name(book: JsonObject, field: str) -> str:
+    """The book's name in ``field``, falling back to English, then the id."""
+    name = book.get("name") or {}
+    return name.get(field) or name.get("english") or book["id"]
+
+
+def _uppercase(text: str) -> str:
+    # Text already reading as a heading is kept as is: upper() would also
+    # expand ligatures such as U+0587.
+    return text if _looks_like_heading(text) else text.upper()
+
+
+def _note_parts(note: Any, index: int) -> tuple[str, str, int]:
+    """(id, text, anchorWord) of a footnote object or legacy plain string."""
+    if isinstance(note, str):
+        return "", note, index + 1
+    return str(note.get("id", "")), note.get("text", ""), int(note.get("anchorWord") or 1)
+
+
+def anchor_segments(text: str, notes: list[Any]) -> Iterator[tuple[str, list[tuple[str, str]]]]:
+    """Split ``text`` after each anchored word: (chunk, [(id, note text), ...]).
+
+    A footnote anchored past the last word goes after the last word; chunks
+    concatenate back to ``text``.
+    """
+    by_word: dict[int, list[tuple[str, str]]] = {}
+    for index, note in enumerate(notes):
+        note_id, note_text, anchor = _note_parts(note, index)
+        if note_text:
+            by_word.setdefault(max(1, anchor), []).append((note_id, note_text))
+    if not by_word:
+        yield text, []
+        return
+
+    ends = [m.end() for m in _WORD_RE.finditer(text)]
+    last = max(1, len(ends))
+    start = 0
+    for word in sorted(by_word):
+        end = ends[min(word, last) - 1] if ends else len(text)
+        yield text[start:end], by_word[word]
+        start = end
+    if start < len(text):
+        yield text[start:], []
+
+
+# ── DOCX ──────────────────────────────────────────────────────────
+
+
+class _FootnoteSpool:
+    """Numbers footnotes and spools their ``w:footnote`` XML to a temp file."""
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self.fh: IO[str] = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self.used: set[int] = set()
+        self.fresh = FRESH_FOOTNOTE_ID
+
+    def add(self, note_id: str, text: str) -> int:
+        head, _, number = note_id.partition(":")
+        if head == self.prefix and number.isdigit() and int(number) not in self.used:
+            fn_id = int(number)
+        else:
+            while self.fresh in self.used:
+                self.fresh += 1
+            fn_id = self.fresh
+        self.used.add(fn_id)
+        self.fh.write(
+            f'<w:footnote w:id="{fn_id}"><w:p>'
+            f'<w:r>{_SUPERSCRIPT}<w:footnoteRef/></w:r>'
+            f'<w:r><w:t xml:space="preserve"> {escape(text)}</w:t></w:r>'
+            "</w:p></w:footnote>"
+        )
+        return fn_id
+
+
+def _text_runs(text: str) -> str:
+    """``w:r`` runs for plain text; newlines become ``w:br`` after a space."""
+    lines = text.split("\n")
+    runs = [f'<w:r><w:t xml:space="preserve">{escape(lines[0])}</w:t></w:r>']
+    for line in lines[1:]:
+        # The importer ignores w:br, so keep a space in the text for it.
+        runs.append('<w:r><w:t xml:space="preserve"> </w:t></w:r><w:r><w:br/></w:r>')
+        runs.append(f'<w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r>')
+    return "".join(runs)
+
+
+def _title_paragraph(text: str, size: int) -> str:
+    return (
+        f'<w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+        f'<w:r><w:rPr><w:b/><w:sz w:val="{size}"/></w:rPr>'
+        f'<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+    )
+
+
+def _indent_xml(item: JsonObject) -> str:
+    level = item.get("indentLevel") or 0
+    first_line = item.get("firstLineIndent") or 0
+    if not level and not first_line:
+        return ""
+    attrs = []
+    if level:
+        attrs.append(f'w:left="{int(level) * TWIPS_PER_LEVEL}"')
+    if first_line:
+        twips = round(float(first_line) * TWIPS_PER_LEVEL)
+        attrs.append(f'w:firstLine="{twips}"' if twips > 0 else f'w:hanging="{-twips}"')
+    return f"<w:pPr><w:ind {' '.join(attrs)}/></w:pPr>"
+
+
+def _verse_paragraph(item: JsonObject, field: str, notes: _FootnoteSpool) -> str:
+    parts = [
+        f"<w:p>{_indent_xml(item)}",
+        f'<w:r>{_SUPERSCRIPT}<w:t xml:space="preserve">{item["number"]}</w:t></w:r>',
+        '<w:r><w:t xml:space="preserve"> </w:t></w:r>',
+    ]
+    footnotes = (item.get("footnotes") or {}).get(field) or []
+    for chunk, anchored in anchor_segments(item.get(field, ""), footnotes):
+        parts.append(_text_runs(chunk))
+        for note_id, note_text in anchored:
+            fn_id = notes.add(note_id, note_text)
+            parts.append(f'<w:r>{_SUPERSCRIPT}<w:footnoteReference w:id="{fn_id}"/></w:r>')
+    parts.append("</w:p>")
+    return "".join(parts)
+
+
+def book_paragraphs(book: JsonObject, field: str, notes: _FootnoteSpool) -> Iterator[str]:
+    """``w:p`` XML for one book, in document order."""
+    yield _title_paragraph(_uppercase(display_name(book, field)), 32)
+    for chapter in book["chapters"]:
+        yield _title_paragraph(str(chapter["number"]), 28)
+        for item in chapter.get("content", []):
+            text = item.get(field, "")
+            if not text.strip():
+                continue
+            if item.get("kind") == "heading":
+                yield _title_paragraph(_uppercase(text), 24)
+            elif item.get("kind") == "verse":
+                yield _verse_paragraph(item, field, notes)
+
+
+def export_docx(books: Iterable[JsonObject], field: str, out_path: Path) -> int:
+    """Write ``books``' ``field`` text to ``out_path``; returns the number of books."""
+    notes = _FootnoteSpool(DEFAULT_FOOTNOTE_PREFIXES.get(field, field))
+    count = 0
+    with notes.fh, zipfile.ZipFile(out_path, "w") as zf:
+        zf.writestr(_zip_info("[Content_Types].xml"), CONTENT_TYPES)
+        zf.writestr(_zip_info("_rels/.rels"), ROOT_RELS)
+        zf.writestr(_zip_info("word/_rels/document.xml.rels"), DOCUMENT_RELS)
+        zf.writestr(_zip_info("word/settings.xml"), SETTINGS)
+        with io.TextIOWrapper(zf.open(_zip_info("word/document.xml"), "w"), encoding="utf-8") as doc:
+            doc.write(DOCUMENT_HEAD)
+            last_chapter = 0
+            for book in books:
+                numbers = [chapter["number"] for chapter in book["chapters"]]
+                if count and numbers and numbers[0] > last_chapter:
+                    # The importer only starts a new book at a chapter number
+                    # it has already seen in the previous one.
+                    print(
+                        f"  ⚠ {book['id']} starts at chapter {numbers[0]}, after a book "
+                        f"ending at {last_chapter}: it will re-import as part of that book; "
+                        "export it earlier"
+                    )
+                doc.writelines(book_paragraphs(book, field, notes))
+                last_chapter = max(numbers, default=0)
+                count += 1
+            doc.write(DOCUMENT_TAIL)
+        with io.TextIOWrapper(zf.open(_zip_info("word/footnotes.xml"), "w"), encoding="utf-8") as out:
+            out.write(FOOTNOTES_HEAD)
+            notes.fh.seek(0)
+            shutil.copyfileobj(notes.fh, out)
+            out.write(FOOTNOTES_TAIL)
+    return count
+
+
+# ── HTML ──────────────────────────────────────────────────────────
+
+HTML_LANGS = {"armenian": "hy", "english": "en", "classical": "xcl"}
+
+HTML_STYLE = """
+body { font-family: serif; max-width: 72rem; margin: 2rem auto; padding: 0 1rem; line-height: 1.5; }
+h1, h2, h3 { text-align: center; }
+.row { display: grid; grid-template-columns: repeat(var(--cols), 1fr); gap: 2rem; }
+.row > * { margin: 0.25rem 0; }
+sup { font-size: 0.7em; }
+sup a { text-decoration: none; }
+.notes { font-size: 0.9em; border-top: 1px solid #ccc; }
+"""
+
+
+def _html_text(text: str) -> str:
+    return html.escape(text).replace("\n", "<br>")
+
+
+def _html_attrs(field: str) -> str:
+    lang = HTML_LANGS.get(field)
+    return f' lang="{lang}"' if lang else ""
+
+
+def book_html(book: JsonObject, fields: list[str]) -> Iterator[str]:
+    """HTML for one book: name, chapters, headings, verses, then its endnotes."""
+    book_id = html.escape(book["id"], quote=True)
+    endnotes: list[tuple[str, str]] = []  # (field, text), numbered in order
+    yield f'<article id="{book_id}" class="book">\n<div class="row">'
+    yield "".join(
+        f"<h1{_html_attrs(f)}>{html.escape(display_name(book, f))}</h1>" for f in fields
+    )
+    yield "</div>\n"
+    for chapter in book["chapters"]:
+        number = chapter["number"]
+        yield f'<section id="{book_id}-{number}">\n<h2>{number}</h2>\n'
+        for item in chapter.get("content", []):
+            kind = item.get("kind")
+            if kind == "heading":
+                cells = [
+                    f"<h3{_html_attrs(f)}>{_html_text(item.get(f, ''))}</h3>" for f in fields
+                ]
+                yield f'<div class="row">{"".join(cells)}</div>\n'
+                continue
+            if kind != "verse":
+                continue
+            style = ""
+            level = item.get("indentLevel") or 0
+            first_line = item.get("firstLineIndent") or 0
+            if level or first_line:
+                style = f' style="margin-left: {level * 1.5:g}em; text-indent: {float(first_line):g}em"'
+            cells = []
+            for f in fields:
+                parts = [f"<p{_html_attrs(f)}{style}><sup>{item['number']}</sup> "]
+                footnotes = (item.get("footnotes") or {}).get(f) or []
+                for chunk, anchored in anchor_segments(item.get(f, ""), footnotes):
+                    parts.append(_html_text(chunk))
+                    for _, note_text in anchored:
+                        endnotes.append((f, note_text))
+                        n = len(endnotes)
+                        parts.append(
+                            f'<sup id="{book_id}-ref-{n}"><a href="#{book_id}-note-{n}">{n}</a></sup>'
+                        )
+                parts.append("</p>")
+                cells.append("".join(parts))
+            yield f'<div class="row" id="{book_id}-{number}-{item["number"]}">{"".join(cells)}</div>\n'
+        yield "</section>\n"
+    if endnotes:
+        yield '<ol class="notes">\n'
+        for n, (f, note_text) in enumerate(endnotes, start=1):
+            yield (
+                f'<li id="{book_id}-note-{n}"{_html_attrs(f)}>{_html_text(note_text)} '
+                f'<a href="#{book_id}-ref-{n}">↩</a></li>\n'
+            )
+        yield "</ol>\n"
+    yield "</article>\n"
+
+
+def export_html(books: Iterable[JsonObject], fields: list[str], out_path: Path) -> int:
+    """Write ``books`` as one static HTML page; returns the number of books."""
+    count = 0
+    with out_path.open("w", encoding="utf-8") as out:
+        out.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(out_path.stem)}</title>\n<style>{HTML_STYLE}</style>\n"
+            f"</head>\n<body style={quoteattr(f'--cols: {len(fields)}')}>\n"
+        )
+        for book in books:
+            out.writelines(book_html(book, fields))
+            count += 1
+        out.write("</body>\n</html>\n")
+    return count
+
+
+# ── Round trip ────────────────────────────────────────────────────
+
+
+def _layout(book: JsonObject) -> list[tuple[int, list[Any]]]:
+    """Chapter numbers with the order of their headings ("h") and verse numbers."""
+    return [
+        (ch["number"], [item.get("number", "h") for item in ch.get("content", [])])
+        for ch in book["chapters"]
+    ]
+
+
+def docx_carried(book: JsonObject) -> JsonObject:
+    """A copy of ``book`` as a DOCX round trip should bring it back.
+
+    Drops what the module docstring lists as lost: verses with no Armenian
+    or English text, footnotes with empty text and negative
+    ``firstLineIndent``; line breaks inside a verse become spaces.  Fields
+    ``compare_books`` never looks at (``classical``, ``poetry``) are left
+    alone.
+    """
+    book = copy.deepcopy(book)
+    for chapter in book["chapters"]:
+        chapter["content"] = [
+            item
+            for item in chapter.get("content", [])
+            if item.get("kind") != "verse"
+            or item.get("armenian", "").strip()
+            or item.get("english", "").strip()
+        ]
+        for item in chapter["content"]:
+            for field in ("armenian", "english"):
+                if isinstance(item.get(field), str):
+                    item[field] = _LINE_BREAK_RE.sub(" ", item[field])
+            if item.get("kind") != "verse":
+                continue
+            footnotes = item.get("footnotes") or {}
+            for field, notes in footnotes.items():
+                footnotes[field] = [
+                    note for index, note in enumerate(notes) if _note_parts(note, index)[1]
+                ]
+            if float(item.get("firstLineIndent") or 0) < 0:
+                del item["firstLineIndent"]
+    return book
+
+
+def compare_books(original: JsonObject, reimported: JsonObject) -> list[str]:
+    """What differs between a book and its re-import (DOCX-carried parts only).
+
+    The documented losses (see ``docx_carried``) are not reported.
+    """
+    book_id = original["id"]
+    original = docx_carried(original)
+    problems = [
+        f"{book_id}: {field} name {original['name'].get(field)!r} came back as "
+        f"{reimported['name'].get(field)!r}"
+        for field in ("english", "armenian")
+        if original["name"].get(field) != reimported["name"].get(field)
+    ]
+    before, after = book_base(original), book_base(reimported)
+    for key in [*before, *(k for k in after if k not in before)]:
+        if key not in after:
+            problems.append(f"{book_id} {key}: missing after re-import")
+        elif key not in before:
+            problems.append(f"{book_id} {key}: appeared after re-import")
+        else:
+            cells = [cell for cell in before[key] if before[key][cell] != after[key].get(cell)]
+            if cells:
+                problems.append(f"{book_id} {key}: {', '.join(cells)} differ")
+    if not problems and _layout(original) != _layout(reimported):
+        problems.append(f"{book_id}: heading/verse order differs")
+    return problems
+
+
+def reimport(data_dir: Path, book_ids: list[str]) -> dict[str, JsonObject]:
+    """Export Armenian and English and re-import both; books by id."""
+    with tempfile.TemporaryDirectory() as tmp:
+        arm_path, eng_path = Path(tmp, "armenian.docx"), Path(tmp, "english.docx")
+        export_docx(iter_books(data_dir, book_ids), "armenian", arm_path)
+        export_docx(iter_books(data_dir, book_ids), "english", eng_path)
+        arm_books, arm_fns = parse_multibook(arm_path, "arm")
+        eng_books, eng_fns = parse_multibook(eng_path, "eng")
+    fn_map = arm_fns | eng_fns
+    reimported = {}
+    for arm_book, eng_book in _pair_books(arm_books, eng_books):
+        book = build_book(arm_book, eng_book, fn_map).book
+        reimported[book["id"]] = book
+    return reimported
+
+
+def roundtrip_check(data_dir: Path, book_ids: list[str]) -> list[str]:
+    """Export Armenian and English, re-import both, and list every difference."""
+    reimported = reimport(data_dir, book_ids)
+    problems: list[str] = []
+    for book in iter_books(data_dir, book_ids):
+        if book["id"] in reimported:
+            problems.extend(compare_books(book, reimported.pop(book["id"])))
+        else:
+            problems.append(f"{book['id']}: missing after re-import")
+    problems.extend(f"{book_id}: unexpected book after re-import" for book_id in reimported)
+    return problems
+
+
+# ── Books ─────────────────────────────────────────────────────────
+
+
+def all_book_ids(data_dir: Path) -> list[str]:
+    return sorted([p.stem for p in book_paths(data_dir)] + [p.name for p in sharded_book_dirs(data_dir)])
+
+
+def document_order(data_dir: Path, book_ids: list[str]) -> list[str]:
+    """``book_ids`` reordered so that every book re-imports as itself (see module docstring).
+
+    Books starting at chapter 1 can follow any book, so they keep their
+    order; a book starting mid-way goes right after the first book placed
+    that reaches its first chapter.  A book no earlier book reaches is
+    placed when nothing else fits, and ``export_docx`` warns about it.
+    """
+    spans: dict[str, tuple[int, int]] = {}
+    for book in iter_books(data_dir, book_ids):
+        numbers = [chapter["number"] for chapter in book["chapters"]]
+        spans[book["id"]] = (numbers[0] if numbers else 0, max(numbers, default=0))
+    pending = list(book_ids)
+    order: list[str] = []
+    while pending:
+        if order:
+            last = spans[order[-1]][1]
+            fits = [book_id for book_id in pending if spans[book_id][0] <= last]
+            mid_way = [book_id for book_id in fits if spans[book_id][0] > 1]
+            book_id = (mid_way or fits or pending)[0]
+        else:
+            book_id = pending[0]
+        pending.remove(book_id)
+        order.append(book_id)
+    return order
+
+
+def iter_books(data_dir: Path, book_ids: list[str]) -> Iterator[JsonObject]:
+    """Load the books one at a time, in either layout."""
+    for book_id in book_ids:
+        yield load_book(data_dir, book_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    docx_cmd = commands.add_parser("docx", help="export one language field to DOCX")
+    docx_cmd.add_argument("field", metavar="FIELD")
+    docx_cmd.add_argument("out", type=Path, metavar="OUT.docx")
+    docx_cmd.add_argument("book_ids", nargs="*", metavar="BOOK_ID")
+    html_cmd = commands.add_parser("html", help="export side-by-side static HTML")
+    html_cmd.add_argument("out", type=Path, metavar="OUT.html")
+    html_cmd.add_argument("book_ids", nargs="*", metavar="BOOK_ID")
+    html_cmd.add_argument(
+        "--fields",
+        default="armenian,english",
+        help="comma-separated language fields, one column each (default: armenian,english)",
+    )
+    check_cmd = commands.add_parser("check", help="verify that export + re-import is lossless")
+    check_cmd.add_argument("book_ids", nargs="*", metavar="BOOK_ID")
+    args = parser.parse_args()
+
+    missing = [b for b in args.book_ids if b not in set(all_book_ids(args.data))]
+    if missing:
+        print(f"ERROR: no such book in {args.data}: {', '.join(missing)}")
+        raise SystemExit(1)
+    book_ids = args.book_ids or document_order(args.data, all_book_ids(args.data))
+
+    if args.command == "docx":
+        count = export_docx(iter_books(args.data, book_ids), args.field, args.out)
+        print(f"✓ {count} books ({args.field}) → {args.out}")
+    elif args.command == "html":
+        fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+        count = export_html(iter_books(args.data, book_ids), fields, args.out)
+        print(f"✓ {count} books ({', '.join(fields)}) → {args.out}")
+    else:
+        problems = roundtrip_check(args.data, book_ids)
+        for problem in problems:
+            print(f"  ⚠ {problem}")
+        if problems:
+            print(f"⚠ {len(problems)} differences after export + re-import")
+            raise SystemExit(1)
+        print(f"✓ {len(book_ids)} books survive export + re-import unchanged")
@@ -1,20 +1,66 @@
 #!/usr/bin/env python3
-"""One-time DOCX import: merge Armenian + English Bible DOCX files into data/*.json.
+"""DOCX import: merge Armenian + English Bible DOCX files into data/*.json.
 
 Run once to bootstrap the web editor data.  After this, the JSON files
 in data/ become the source of truth and all further editing happens in
-the browser.
+the browser.  A plain re-import overwrites those edits; when a revised
+DOCX arrives, ``--sync`` brings in only what changed in it since the last
+import, keeps browser edits, and reports cells changed on both sides (see
+``book_sync.py``); it also refreshes the precomputed line breaks of poetry
+verses (see ``poetry_breaks.py``).
 
 Usage:
-    python3 scripts/import_docx.py
+    python3 scripts/import_docx.py [--stream | --jobs N] [--sharded | --compact] [--force]
+        [--profile] [--metrics-json PATH] [--output sqlite:PATH]
+    python3 scripts/import_docx.py --manifest sources.json [--jobs N] [--sharded | --compact]
+        [--force]
+    python3 scripts/import_docx.py --books genesis,psalms [--sharded | --compact] [--force]
+    python3 scripts/import_docx.py --sync
+
+Re-runs are incremental: hashes of the DOCX parts and of every merged book
+are kept in ``data/.import-cache.json``, so unchanged inputs skip parsing
+entirely and unchanged books are not rewritten.  Files are written via a
+temp file + ``os.replace`` so the server never serves a half-written book.
+``--sharded`` writes each book as ``data/<book-id>/meta.json`` plus one
+file per chapter, and ``--compact`` writes each ``data/<book-id>.json`` in
+the compact format (see ``book_shards.py`` and ``book_compact.py``).  Every run finishes by
+refreshing the ``data/index.json`` books manifest (see ``book_index.py``).
+``--manifest`` replaces the two built-in DOCX files with a JSON list of any
+number of sources, each filling one text field (e.g. a Classical Armenian
+DOCX for ``classical``); see ``load_sources``.  ``--output sqlite:PATH``
+stores the books in a SQLite database instead of data/ (see ``book_db.py``);
+only books whose content changed are rewritten.  ``--books`` re-imports
+just the listed books, skipping the rest of each DOCX after a quick look
+(see ``iter_selected_books``).
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import os
 import re
 import zipfile
 import xml.etree.ElementTree as ET
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from itertools import accumulate
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from book_db import connect as connect_db, write_book as write_db_book
+from book_index import make_entry, reindex
+from book_shards import book_files, book_layout, clear_superseded, load_book, write_book_files
+from book_sync import BookBase, book_base, load_sync_base, save_sync_base, sync_book
+from data_files import MANIFEST_NAME, atomic_write_text
+from docx_notes import NoteStore, endnote_prefix
+from poetry_breaks import apply_poetry_breaks
+
+if TYPE_CHECKING:
+    from import_profile import ImportProfiler
 
 WML = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
 NS = {"w": WML}
@@ -23,6 +69,17 @@ NS = {"w": WML}
 # The NUL bytes ensure these never collide with real text or verse-number regex.
 FN_MARKER_RE = re.compile(r"\x00FN:([^:]+):(\d+)\x00")
 
+# JSON-shaped output objects (verse/heading items, chapters, footnotes).
+JsonObject = dict[str, Any]
+
+# Set by ``--profile`` / ``--metrics-json``; None keeps instrumentation off.
+PROFILER: ImportProfiler | None = None
+
+
+def _stage(name: str) -> AbstractContextManager[object]:
+    """Profiler stage for coarse (per-book / per-file) steps; no-op when off."""
+    return PROFILER.stage(name) if PROFILER is not None else nullcontext()
+
 
 def _strip_markers(text: str) -> str:
     """Remove all embedded footnote markers from text."""
@@ -98,80 +155,170 @@ def _paragraph_first_line_indent_em(para: ET.Element) -> float | None:
     return round(em_value, 2)
 
 
+# ── Pipeline records ──────────────────────────────────────────────
+#
+# Compact tuple/slot records carried between stages; only ``merge_chapters``
+# turns them into the JSON-shaped dicts written to data/*.json.
+
+
+class Paragraph(NamedTuple):
+    """One non-empty body paragraph (text still carries footnote markers)."""
+
+    text: str
+    indent_level: int | None
+    first_line_indent: float | None
+
+
+class ChapterEvent(NamedTuple):
+    number: int
+
+
+class HeadingEvent(NamedTuple):
+    text: str
+
+
+class TextEvent(NamedTuple):
+    text: str
+    indent_level: int | None
+    first_line_indent: float | None
+
+
+Event = ChapterEvent | HeadingEvent | TextEvent
+
+
+class VerseRecord(NamedTuple):
+    text: str  # still has footnote markers
+    indent_level: int | None
+    first_line_indent: float | None
+
+
+@dataclass(slots=True)
+class ChapterRecord:
+    # (insert-before-verse, heading text)
+    headings: list[tuple[int, str]] = field(default_factory=list)
+    verses: dict[int, VerseRecord] = field(default_factory=dict)
+
+
+BookChapters = dict[int, ChapterRecord]
+BookEntry = tuple[str, BookChapters]
+
+_EMPTY_CHAPTER = ChapterRecord()
+_EMPTY_VERSE = VerseRecord("", None, None)
+
+
 # ── DOCX paragraph + footnote extraction ──────────────────────────
 
 
-def _load_footnote_map(zf: zipfile.ZipFile) -> dict[int, str]:
-    """Parse word/footnotes.xml → {footnote_id: text}."""
-    if "word/footnotes.xml" not in zf.namelist():
-        return {}
-    fn_tree = ET.fromstring(zf.read("word/footnotes.xml"))
-    result: dict[int, str] = {}
-    for fn in fn_tree.findall(".//w:footnote", NS):
-        fn_id_str = fn.get(f"{{{WML}}}id")
-        fn_type = fn.get(f"{{{WML}}}type", "normal")
-        if not fn_id_str or fn_type in ("separator", "continuationSeparator"):
-            continue
-        texts = [t.text or "" for t in fn.findall(".//w:t", NS)]
-        text = "".join(texts).strip()
-        if text:
-            result[int(fn_id_str)] = text
-    return result
+def _paragraph_info(para: ET.Element, prefix: str) -> Paragraph | None:
+    """Flatten one ``w:p`` into a ``Paragraph`` record.
+
+    Returns None for paragraphs with no real text (ignoring markers).
+    """
+    parts: list[str] = []
+    for run in para.findall(".//w:r", NS):
+        fn_ref = run.find("w:footnoteReference", NS)
+        if fn_ref is not None:
+            fn_id = fn_ref.get(f"{{{WML}}}id")
+            if fn_id:
+                parts.append(f"\x00FN:{prefix}:{fn_id}\x00")
+        en_ref = run.find("w:endnoteReference", NS)
+        if en_ref is not None:
+            en_id = en_ref.get(f"{{{WML}}}id")
+            if en_id:
+                parts.append(f"\x00FN:{endnote_prefix(prefix)}:{en_id}\x00")
+        for t_elem in run.findall("w:t", NS):
+            parts.append(t_elem.text or "")
+    line = "".join(parts).strip()
+    # Keep paragraphs that have real text (ignoring markers)
+    if not _strip_markers(line):
+        return None
+    return Paragraph(
+        line, _paragraph_indent_level(para), _paragraph_first_line_indent_em(para)
+    )
+
+
+def _iter_body_paragraphs(docx_path: Path) -> Iterator[ET.Element]:
+    """Stream the ``w:p`` children of ``w:body`` in ``word/document.xml``.
+
+    Uses ``ET.iterparse`` over the zip entry and detaches every top-level
+    body element once it has been handled, so peak memory is bounded by the
+    largest single paragraph rather than by the whole document.
+    """
+    body_tag = f"{{{WML}}}body"
+    para_tag = f"{{{WML}}}p"
+    with zipfile.ZipFile(docx_path) as zf, zf.open("word/document.xml") as raw:
+        fh = PROFILER.reader(raw, "zip_read") if PROFILER is not None else raw
+        depth = 0
+        body: ET.Element | None = None
+        body_depth = -1
+        for event, elem in ET.iterparse(fh, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if elem.tag == body_tag and body is None:
+                    body = elem
+                    body_depth = depth
+                continue
+            depth -= 1
+            if body is None or depth != body_depth:
+                continue
+            # ``elem`` is a direct child of w:body (paragraph, table, sectPr…)
+            if elem.tag == para_tag:
+                yield elem
+            body.remove(elem)
+
+
+def iter_paragraphs(docx_path: Path, prefix: str) -> Iterator[Paragraph]:
+    """Stream body paragraphs from ``word/document.xml`` one at a time."""
+    for para in _iter_body_paragraphs(docx_path):
+        info = _paragraph_info(para, prefix)
+        if info is not None:
+            yield info
 
 
 def extract_paragraphs(
     docx_path: Path, prefix: str
-) -> tuple[list[tuple[str, int | None, float | None]], dict[str, str]]:
+) -> tuple[list[Paragraph], NoteStore]:
     """Read paragraphs with inline footnote markers, plus a prefixed fn map.
 
     Each footnote reference in the DOCX is replaced by a NUL-delimited marker
     ``\\x00FN:<prefix>:<id>\\x00`` so that it flows harmlessly through the
-    verse-number regex split and can be extracted per-verse later.
+    verse-number regex split and can be extracted per-verse later.  Endnote
+    references get the same marker, under ``docx_notes.endnote_prefix``.
 
     Returns:
         (paragraphs, fn_map)  where fn_map keys are ``prefix:id``.
     """
-    with zipfile.ZipFile(docx_path) as zf:
-        doc_xml = zf.read("word/document.xml")
-        raw_fn = _load_footnote_map(zf)
-
-    fn_map: dict[str, str] = {f"{prefix}:{k}": v for k, v in raw_fn.items()}
-
-    doc_tree = ET.fromstring(doc_xml)
-    paragraphs: list[tuple[str, int | None, float | None]] = []
-
-    for para in doc_tree.findall(".//w:body/w:p", NS):
-        text = ""
-        for run in para.findall(".//w:r", NS):
-            fn_ref = run.find("w:footnoteReference", NS)
-            if fn_ref is not None:
-                fn_id = fn_ref.get(f"{{{WML}}}id")
-                if fn_id:
-                    text += f"\x00FN:{prefix}:{fn_id}\x00"
-            for t_elem in run.findall("w:t", NS):
-                text += t_elem.text or ""
-        line = text.strip()
-        indent_level = _paragraph_indent_level(para)
-        first_line_indent = _paragraph_first_line_indent_em(para)
-        # Keep paragraphs that have real text (ignoring markers)
-        if _strip_markers(line):
-            paragraphs.append((line, indent_level, first_line_indent))
-
-    return paragraphs, fn_map
-
-
-def _anchor_word_from_offset(text: str, offset: int) -> int:
-    """Convert a character offset into a 1-based word index."""
-    bounded_offset = max(0, min(offset, len(text)))
-    before = text[:bounded_offset].rstrip()
-    words = before.split()
-    return max(1, len(words))
+    return list(iter_paragraphs(docx_path, prefix)), load_notes(docx_path, prefix)
+
+
+def load_notes(docx_path: Path, prefix: str) -> NoteStore:
+    """Footnotes (``prefix:id``) and endnotes of one DOCX, read on first use.
+
+    Only the notes' byte ranges are indexed here; see ``docx_notes.py``.
+    """
+    with _stage("footnote_load"):
+        notes = NoteStore()
+        notes.add_docx(docx_path, prefix)
+    if PROFILER is not None:
+        PROFILER.count("footnotes", len(notes))
+    return notes
 
 
 def _extract_footnotes(
-    text: str, fn_map: dict[str, str]
-) -> tuple[str, list[dict[str, object]]]:
-    """Strip markers and return (clean_text, anchored footnotes)."""
+    text: str, fn_map: Mapping[str, str]
+) -> tuple[str, list[JsonObject]]:
+    """Strip markers and return (clean_text, anchored footnotes).
+
+    One scan over the markers collects the text segments and each marker's
+    offset; whitespace is then collapsed with a single C-level split/join,
+    and word-start offsets are computed once so every ``anchorWord`` is a
+    ``bisect`` instead of re-splitting the verse prefix per footnote.
+    """
+    if "\x00" not in text:
+        # Normalize DOCX hard/soft line breaks to plain spaces so imported source
+        # formatting doesn't accidentally act like manual poetry line overrides.
+        return " ".join(text.split()), []
+
     pieces: list[str] = []
     anchors: list[tuple[str, str, int]] = []  # (key, fn_text, raw_offset)
     last_idx = 0
@@ -187,24 +334,26 @@ def _extract_footnotes(
             anchors.append((key, fn_text, clean_len))
         last_idx = m.end()
 
-    tail = text[last_idx:]
-    pieces.append(tail)
+    pieces.append(text[last_idx:])
     raw_clean = "".join(pieces)
-    # Normalize DOCX hard/soft line breaks to plain spaces so imported source
-    # formatting doesn't accidentally act like manual poetry line overrides.
-    raw_clean = re.sub(r"\s+", " ", raw_clean)
-    ltrim = len(raw_clean) - len(raw_clean.lstrip())
-    clean_text = raw_clean.strip()
-
-    anchored: list[dict[str, object]] = []
+    words = raw_clean.split()
+    clean_text = " ".join(words)
+    if not anchors:
+        return clean_text, []
+
+    word_starts = list(accumulate((len(w) + 1 for w in words[:-1]), initial=0))
+    # Marker offsets are measured before whitespace runs are collapsed; only
+    # the (single, collapsed) leading space is trimmed off.  This mirrors the
+    # historical anchoring so existing ``anchorWord`` values stay stable.
+    ltrim = 1 if raw_clean[:1].isspace() else 0
+    anchored: list[JsonObject] = []
     for key, fn_text, raw_offset in anchors:
-        adjusted_offset = max(0, raw_offset - ltrim)
-        anchor_word = _anchor_word_from_offset(clean_text, adjusted_offset)
+        offset = min(max(0, raw_offset - ltrim), len(clean_text))
         anchored.append(
             {
                 "id": key,
                 "text": fn_text,
-                "anchorWord": anchor_word,
+                "anchorWord": max(1, bisect_left(word_starts, offset)),
             }
         )
     return clean_text, anchored
@@ -213,17 +362,40 @@ def _extract_footnotes(
 # ── Heuristic helpers ──────────────────────────────────────────────
 
 
+_CHAPTER_RE = re.compile(r"\d{1,3}")
+_VERSE_NUMBER_RE = re.compile(r"(\d{1,3})\s+")
+
+
+def _visible_text(text: str) -> str:
+    """``_strip_markers`` with a fast path for the (common) marker-free paragraph."""
+    return _strip_markers(text) if "\x00" in text else text
+
+
+def _chapter_number(clean: str) -> int | None:
+    stripped = clean.strip()
+    return int(stripped) if _CHAPTER_RE.fullmatch(stripped) else None
+
+
+def _looks_like_heading(clean: str) -> bool:
+    # Single pass with early exit on the first lowercase letter, instead of
+    # materializing every alphabetic character first.
+    alpha_count = 0
+    for c in clean:
+        if c.isalpha():
+            if not c.isupper():
+                return False
+            alpha_count += 1
+    return alpha_count > 2
+
+
 def is_chapter_number(text: str) -> int | None:
     """Return chapter number if the paragraph is just a standalone integer."""
-    m = re.fullmatch(r"\d{1,3}", _strip_markers(text).strip())
-    return int(m.group()) if m else None
+    return _chapter_number(_visible_text(text))
 
 
 def is_heading(text: str) -> bool:
     """Return True if a paragraph looks like a section heading (all-uppercase)."""
-    clean = _strip_markers(text)
-    alpha = [c for c in clean if c.isalpha()]
-    return len(alpha) > 2 and all(c.isupper() for c in alpha)
+    return _looks_like_heading(_visible_text(text))
 
 
 def split_verses(text: str) -> list[tuple[int, str]]:
@@ -235,289 +407,436 @@ def split_verses(text: str) -> list[tuple[int, str]]:
     Handles false-positive digit matches by checking that verse numbers
     increase sequentially (with a small forward-gap tolerance of ≤5).
     """
-    tokens = re.split(r"(\d{1,3})\s+", text.strip())
-    verses: list[tuple[int, str]] = []
+    text = text.strip()
+    # Each verse is collected as a list of parts: normally just its own text,
+    # plus "<number> <text>" pairs when false positives are merged back in.
+    verses: list[tuple[int, list[str]]] = []
     expected: int | None = None
-    i = 1
-    while i < len(tokens) - 1:
-        num = int(tokens[i])
-        txt = tokens[i + 1].strip()
+    matches = _VERSE_NUMBER_RE.finditer(text)
+    m = next(matches, None)
+    while m is not None:
+        nxt = next(matches, None)
+        num_str = m.group(1)
+        num = int(num_str)
+        txt = text[m.end() : nxt.start() if nxt is not None else len(text)].strip()
         # Accept if: first verse, exact next, OR small forward gap (≤5)
         if expected is None or (num >= expected and num <= expected + 5):
-            verses.append((num, txt))
+            verses.append((num, [txt]))
             expected = num + 1
         elif verses:
             # False positive — merge back into previous verse
-            prev_num, prev_txt = verses[-1]
-            verses[-1] = (prev_num, f"{prev_txt} {tokens[i]} {txt}".strip())
+            verses[-1][1].extend((num_str, txt))
+            if PROFILER is not None:
+                PROFILER.count("falsePositiveVerseMerges")
         else:
-            verses.append((num, txt))
+            verses.append((num, [txt]))
             expected = num + 1
-        i += 2
-    return verses
+        m = nxt
+    return [
+        (num, parts[0] if len(parts) == 1 else " ".join(p for p in parts if p))
+        for num, parts in verses
+    ]
 
 
 # ── Event-based paragraph stream ───────────────────────────────────
 
-ParagraphInfo = tuple[str, int | None, float | None]
-TextEvent = dict[str, object]
-Event = tuple[str, object]  # ('chapter', int) | ('heading', str) | ('text', TextEvent)
 
-
-def paragraphs_to_events(paragraphs: list[ParagraphInfo]) -> list[Event]:
-    """Convert raw paragraphs into a tagged event stream."""
-    events: list[Event] = []
+def iter_events(paragraphs: Iterable[Paragraph]) -> Iterator[Event]:
+    """Lazily convert raw paragraphs into a typed event stream."""
     for para, indent_level, first_line_indent in paragraphs:
-        ch = is_chapter_number(para)
+        # Strip markers once and reuse the result for both classifications.
+        clean = _visible_text(para)
+        ch = _chapter_number(clean)
         if ch is not None:
-            events.append(("chapter", ch))
-        elif is_heading(para):
-            events.append(("heading", para))
+            yield ChapterEvent(ch)
+        elif _looks_like_heading(clean):
+            yield HeadingEvent(para)
         else:
-            events.append(
-                (
-                    "text",
-                    {
-                        "text": para,
-                        "indentLevel": indent_level,
-                        "firstLineIndent": first_line_indent,
-                    },
-                )
-            )
-    return events
+            yield TextEvent(para, indent_level, first_line_indent)
 
 
-# ── Multi-book parsing ─────────────────────────────────────────────
+def paragraphs_to_events(paragraphs: Iterable[Paragraph]) -> list[Event]:
+    """Convert raw paragraphs into a typed event stream."""
+    return list(iter_events(paragraphs))
 
-# verses value keeps text + optional indent metadata
-VersePayload = dict[str, object]  # { "text": str, "indentLevel": int | None, "firstLineIndent": float | None }
-ChapterData = dict[str, list[tuple[int, str]] | dict[int, VersePayload]]
-BookChapters = dict[int, ChapterData]
-BookEntry = tuple[str, BookChapters]
+
+# ── Multi-book parsing ─────────────────────────────────────────────
 
 
-def parse_multibook(docx_path: Path, prefix: str) -> tuple[list[BookEntry], dict[str, str]]:
-    """Parse a DOCX into a list of (book_name, {ch_num: {headings, verses}}).
+def _starts_book(book_name: str, chapter: int, max_ch: int) -> bool:
+    """Whether a heading followed by chapter ``chapter`` starts a new book.
 
-    Returns the book list and the footnote map (keyed as ``prefix:id``).
+    It does at the top of the document, and whenever the chapter number does
+    not continue the current book's numbering.
     """
-    paragraphs, fn_map = extract_paragraphs(docx_path, prefix)
-    events = paragraphs_to_events(paragraphs)
+    return book_name == "" or chapter <= max_ch
+
 
-    books: list[BookEntry] = []
+def iter_books(events: Iterable[Event]) -> Iterator[BookEntry]:
+    """Group an event stream into (book_name, {ch_num: ChapterRecord}).
+
+    Each book is yielded as soon as the next book boundary is seen, so only
+    one book's chapters are held in memory at a time.
+    """
     current_book_name: str = ""
     current_chapters: BookChapters = {}
     current_ch: int | None = None
     max_ch: int = 0
     last_verse: int = 0
 
-    i = 0
-    while i < len(events):
-        typ, val = events[i]
+    stream = iter(events)
+    event = next(stream, None)
+    while event is not None:
+        lookahead = next(stream, None)
 
         # ── Detect book boundary ──────────────────────────────────
-        if typ == "heading" and isinstance(val, str):
-            if i + 1 < len(events) and events[i + 1][0] == "chapter":
-                next_ch_raw = events[i + 1][1]
-                assert isinstance(next_ch_raw, int)
-                next_ch = next_ch_raw
-                if current_book_name == "" or next_ch <= max_ch:
-                    if current_book_name or current_chapters:
-                        books.append((current_book_name, current_chapters))
-                    current_book_name = _strip_markers(val)
-                    current_chapters = {}
-                    current_ch = None
-                    max_ch = 0
-                    last_verse = 0
-                    i += 1
-                    continue
+        if type(event) is HeadingEvent:
+            if type(lookahead) is ChapterEvent and _starts_book(
+                current_book_name, lookahead.number, max_ch
+            ):
+                if current_book_name or current_chapters:
+                    yield current_book_name, current_chapters
+                current_book_name = _strip_markers(event.text)
+                current_chapters = {}
+                current_ch = None
+                max_ch = 0
+                last_verse = 0
+                event = lookahead
+                continue
 
             # Regular section heading inside current chapter
             if current_ch is not None:
-                next_verse = last_verse + 1
-                ch_data = current_chapters.setdefault(
-                    current_ch, {"headings": [], "verses": {}}
-                )
-                heading_list: list[tuple[int, str]] = ch_data["headings"]  # type: ignore[assignment]
-                heading_list.append((next_verse, _strip_markers(val)))
-            i += 1
-            continue
+                ch_data = current_chapters.get(current_ch)
+                if ch_data is None:
+                    ch_data = current_chapters[current_ch] = ChapterRecord()
+                ch_data.headings.append((last_verse + 1, _strip_markers(event.text)))
 
         # ── Chapter marker ────────────────────────────────────────
-        if typ == "chapter" and isinstance(val, int):
-            current_ch = val
-            max_ch = max(max_ch, val)
-            current_chapters.setdefault(current_ch, {"headings": [], "verses": {}})
+        elif type(event) is ChapterEvent:
+            current_ch = event.number
+            max_ch = max(max_ch, current_ch)
+            if current_ch not in current_chapters:
+                current_chapters[current_ch] = ChapterRecord()
             last_verse = 0
-            i += 1
-            continue
 
         # ── Verse text ────────────────────────────────────────────
-        if typ == "text" and isinstance(val, dict) and current_ch is not None:
-            ch_data = current_chapters.setdefault(
-                current_ch, {"headings": [], "verses": {}}
+        elif current_ch is not None:
+            ch_data = current_chapters.get(current_ch)
+            if ch_data is None:
+                ch_data = current_chapters[current_ch] = ChapterRecord()
+            verse_dict = ch_data.verses
+            indent_level = event.indent_level
+            first_line_indent = (
+                round(event.first_line_indent, 2)
+                if event.first_line_indent is not None
+                else None
             )
-            verse_dict: dict[int, VersePayload] = ch_data["verses"]  # type: ignore[assignment]
-            para_text_raw = val.get("text")
-            if isinstance(para_text_raw, str):
-                indent_raw = val.get("indentLevel")
-                indent_level = indent_raw if isinstance(indent_raw, int) else None
-                first_line_raw = val.get("firstLineIndent")
-                first_line_indent = (
-                    round(first_line_raw, 2)
-                    if isinstance(first_line_raw, (int, float))
-                    else None
+            # Negative firstLineIndent = Word ruler hanging indent,
+            # not intentional formatting.  Strip it and the related
+            # indentLevel so poetry mode works cleanly.
+            if first_line_indent is not None and first_line_indent < 0:
+                first_line_indent = None
+                indent_level = None
+            if PROFILER is None:
+                parsed_verses = split_verses(event.text)
+            else:
+                with PROFILER.stage("verse_split"):
+                    parsed_verses = split_verses(event.text)
+                PROFILER.count("verses", len(parsed_verses))
+            for v_idx, (num, txt) in enumerate(parsed_verses):
+                # Only the first verse in a paragraph gets the first-line
+                # indent; subsequent verses within the same paragraph are
+                # continuations.
+                verse_dict[num] = VerseRecord(
+                    txt, indent_level, first_line_indent if v_idx == 0 else None
                 )
-                # Negative firstLineIndent = Word ruler hanging indent,
-                # not intentional formatting.  Strip it and the related
-                # indentLevel so poetry mode works cleanly.
-                if first_line_indent is not None and first_line_indent < 0:
-                    first_line_indent = None
-                    indent_level = None
-                parsed_verses = split_verses(para_text_raw)
-                for v_idx, (num, txt) in enumerate(parsed_verses):
-                    verse_dict[num] = {
-                        "text": txt,  # still has footnote markers
-                        "indentLevel": indent_level,
-                        # Only the first verse in a paragraph gets
-                        # the first-line indent; subsequent verses
-                        # within the same paragraph are continuations.
-                        "firstLineIndent": first_line_indent if v_idx == 0 else None,
-                    }
-                    last_verse = num
-
-        i += 1
+                last_verse = num
+
+        event = lookahead
 
     # Commit final book
     if current_book_name or current_chapters:
-        books.append((current_book_name, current_chapters))
+        yield current_book_name, current_chapters
+
+
+def iter_multibook(docx_path: Path, prefix: str) -> Iterator[BookEntry]:
+    """Stream books out of a DOCX: paragraphs → events → books, all lazily."""
+    if PROFILER is None:
+        return iter_books(iter_events(iter_paragraphs(docx_path, prefix)))
+    paragraphs = PROFILER.iterate("xml_parse", iter_paragraphs(docx_path, prefix), "paragraphs")
+    events = PROFILER.iterate("classify_events", iter_events(paragraphs), "events")
+    return PROFILER.iterate("segment_books", iter_books(events), "books")
 
-    return books, fn_map
+
+def parse_books(docx_path: Path, prefix: str) -> list[BookEntry]:
+    """Parse a DOCX into a list of (book_name, {ch_num: {headings, verses}})."""
+    return list(iter_multibook(docx_path, prefix))
+
+
+def parse_multibook(docx_path: Path, prefix: str) -> tuple[list[BookEntry], NoteStore]:
+    """Parse a DOCX into its book list and its notes (keyed as ``prefix:id``).
+
+    Worker processes should run ``parse_books`` only: a ``NoteStore``'s
+    spool files belong to the process that built it (see ``docx_notes.py``).
+    """
+    return parse_books(docx_path, prefix), load_notes(docx_path, prefix)
 
 
 # ── Filter out empty / placeholder books ───────────────────────────
 
 
+def _is_real_verse(text: str) -> bool:
+    return len(_strip_markers(text).strip()) >= 10
+
+
 def has_real_content(chapters: BookChapters) -> bool:
     """True if at least one verse has ≥10 characters of actual text."""
     for ch_data in chapters.values():
-        verse_dict: dict[int, VersePayload] = ch_data["verses"]  # type: ignore[assignment]
-        for payload in verse_dict.values():
-            txt_raw = payload.get("text")
-            txt = txt_raw if isinstance(txt_raw, str) else ""
-            if len(_strip_markers(txt).strip()) >= 10:
+        for verse in ch_data.verses.values():
+            if _is_real_verse(verse.text):
                 return True
     return False
 
 
-# ── Merge two parallel files ───────────────────────────────────────
+# ── Selective parsing (--books) ────────────────────────────────────
+
+_RUN_TAG = f"{{{WML}}}r"
+_TEXT_TAG = f"{{{WML}}}t"
+
+
+def _run_text(para: ET.Element) -> str:
+    """A paragraph's text without footnote markers: ``_paragraph_info`` minus the
+    markers, the outer ``strip()`` and the indentation lookups."""
+    return "".join(
+        child.text or ""
+        for run in para.iter(_RUN_TAG)
+        for child in run
+        if child.tag == _TEXT_TAG
+    )
+
+
+def _classify(para: ET.Element, prefix: str) -> Event | ET.Element | None:
+    """Classify a paragraph as ``iter_events`` would, reading only its run text.
+
+    Chapter numbers and headings come back as events (headings with their
+    full text, since one may name the next book).  Text paragraphs come back
+    as the element itself, to be read in full only if needed, and
+    paragraphs ``iter_paragraphs`` would drop as None.
+    """
+    text = _run_text(para)
+    if not text.strip():
+        # Whitespace between two footnote references still counts as text.
+        if not text or _paragraph_info(para, prefix) is None:
+            return None
+    ch = _chapter_number(text)
+    if ch is not None:
+        return ChapterEvent(ch)
+    if _looks_like_heading(text):
+        info = _paragraph_info(para, prefix)
+        assert info is not None
+        return HeadingEvent(info.text)
+    return para
+
+
+def iter_selected_books(
+    docx_path: Path, prefix: str, select: Callable[[int, str], bool]
+) -> Iterator[tuple[int, BookEntry]]:
+    """Stream only the books ``select`` picks out of a DOCX, in one pass.
+
+    Books are delimited by the same rule as ``iter_books`` (see
+    ``_starts_book``).  ``select(index, name)`` is asked as each book starts;
+    ``index`` counts the books with real content before it, i.e. the
+    position at which ``_align_books`` pairs it with the other language.
+
+    Selected books go through ``iter_books`` unchanged.  Paragraphs of other
+    books are only classified from their run text (see ``_classify``): no
+    footnote markers, indentation or verse splitting, except that text is
+    split until one verse shows that the book has real content, which is
+    all it takes to keep the count.
+
+    Yields:
+        (index, book) for each selected book with real content.
+    """
+    real_count = 0
+    selected = select(real_count, "")
+    events: list[Event] = []  # of the current book, when selected
+    book_name = ""
+    in_chapter = False
+    max_ch = 0
+    real = False
+
+    def finish() -> Iterator[tuple[int, BookEntry]]:
+        nonlocal real_count
+        if selected:
+            for book in iter_books(events):
+                if has_real_content(book[1]):
+                    yield real_count, book
+                    real_count += 1
+        elif real:
+            real_count += 1
+
+    stream = (
+        (event, para)
+        for para in _iter_body_paragraphs(docx_path)
+        if (event := _classify(para, prefix)) is not None
+    )
+    item = next(stream, None)
+    while item is not None:
+        lookahead = next(stream, None)
+        event, para = item
+
+        if (
+            type(event) is HeadingEvent
+            and lookahead is not None
+            and type(lookahead[0]) is ChapterEvent
+            and _starts_book(book_name, lookahead[0].number, max_ch)
+        ):
+            yield from finish()
+            book_name = _strip_markers(event.text)
+            selected = select(real_count, book_name)
+            events = []
+            in_chapter = False
+            max_ch = 0
+            real = False
+        elif type(event) is ChapterEvent:
+            in_chapter = True
+            max_ch = max(max_ch, event.number)
+
+        if selected:
+            if event is para:
+                info = _paragraph_info(para, prefix)
+                assert info is not None
+                event = TextEvent(*info)
+            events.append(event)
+        elif event is para and in_chapter and not real:
+            info = _paragraph_info(para, prefix)
+            assert info is not None
+            real = any(_is_real_verse(text) for _, text in split_verses(info.text))
+        item = lookahead
+
+    yield from finish()
+
+
+def select_book_pairs(
+    arm_docx: Path, eng_docx: Path, book_ids: Iterable[str]
+) -> list[tuple[BookEntry, BookEntry]]:
+    """The (Armenian, English) pairs of the books with the given ids.
+
+    Scans the English DOCX (where book ids come from) for the books, then
+    the Armenian one for the books at the same positions, stopping as soon
+    as it has them all.  Pairs come out in document order.
+
+    Raises:
+        ValueError: if an id is not in the English DOCX, or its book has no
+            Armenian counterpart.
+    """
+    wanted = set(book_ids)
+    eng_books = list(
+        iter_selected_books(eng_docx, "eng", lambda _, name: make_book_id(name) in wanted)
+    )
+    missing = wanted - {make_book_id(name) for _, (name, _) in eng_books}
+    if missing:
+        raise ValueError(f"not in the English DOCX: {', '.join(sorted(missing))}")
+
+    positions = {index for index, _ in eng_books}
+    arm_books: dict[int, BookEntry] = {}
+    if positions:
+        for index, book in iter_selected_books(
+            arm_docx, "arm", lambda index, _: index in positions
+        ):
+            arm_books[index] = book
+            if len(arm_books) == len(positions):
+                break
+    unpaired = [make_book_id(name) for index, (name, _) in eng_books if index not in arm_books]
+    if unpaired:
+        raise ValueError(f"no Armenian counterpart for: {', '.join(unpaired)}")
+    return [(arm_books[index], eng_book) for index, eng_book in eng_books]
+
+
+# ── Merge parallel files ────────────────────────────────────────────
+
+# Text fields every item carries, in output key order; sources for other
+# languages (see ``--manifest``) add their field after these.
+LANGUAGE_FIELDS = ("armenian", "english", "classical")
 
 
 def make_book_id(name: str) -> str:
     return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "unknown"
 
 
-def merge_chapters(
-    arm_chs: BookChapters,
-    eng_chs: BookChapters,
-    fn_map: dict[str, str],
-) -> list[dict[str, object]]:
-    """Merge Armenian and English chapter data into a single list."""
-    all_ch_nums = sorted(set(arm_chs) | set(eng_chs))
-    merged: list[dict[str, object]] = []
+def merge_sources(
+    sources: list[tuple[str, BookChapters]],
+    fn_map: Mapping[str, str],
+) -> list[JsonObject]:
+    """Merge any number of parallel chapter streams into a single list.
 
-    for ch_num in all_ch_nums:
-        arm = arm_chs.get(ch_num, {"headings": [], "verses": {}})
-        eng = eng_chs.get(ch_num, {"headings": [], "verses": {}})
-
-        arm_hdg: dict[int, str] = {v: t for v, t in arm["headings"]}  # type: ignore[union-attr]
-        eng_hdg: dict[int, str] = {v: t for v, t in eng["headings"]}  # type: ignore[union-attr]
-        hdg_positions = sorted(set(arm_hdg) | set(eng_hdg))
+    ``sources`` pairs each stream with the text field it fills.  Chapter,
+    heading and verse numbers are unioned across all streams in one pass,
+    so cost grows linearly with the number of sources.  Where sources
+    disagree on indentation, the first one (in ``sources`` order) that has
+    any wins.
 
-        arm_verses: dict[int, VersePayload] = arm["verses"]  # type: ignore[assignment]
-        eng_verses: dict[int, VersePayload] = eng["verses"]  # type: ignore[assignment]
-        all_verses = sorted(set(arm_verses) | set(eng_verses))
+    This is the output boundary: records go in, JSON-shaped dicts come out.
+    """
+    fields = LANGUAGE_FIELDS + tuple(f for f, _ in sources if f not in LANGUAGE_FIELDS)
+    sourced = {f for f, _ in sources}
+    unsourced = [f for f in fields if f not in sourced]
+    empty_text = dict.fromkeys(fields, "")
+    all_ch_nums = sorted(set().union(*(chs for _, chs in sources)))
+    merged: list[JsonObject] = []
 
-        content: list[dict[str, object]] = []
+    for ch_num in all_ch_nums:
+        chapters = [(f, chs.get(ch_num, _EMPTY_CHAPTER)) for f, chs in sources]
+        headings = [(f, dict(ch.headings)) for f, ch in chapters]
+        hdg_positions = sorted(set().union(*(hdg for _, hdg in headings)))
+        verse_maps = [(f, ch.verses) for f, ch in chapters]
+        all_verses = sorted(set().union(*(verses for _, verses in verse_maps)))
+
+        def heading_item(pos: int) -> JsonObject:
+            item: JsonObject = {"kind": "heading", **empty_text}
+            for f, hdg in headings:
+                if pos in hdg:
+                    item[f] = hdg[pos]
+            return item
+
+        content: list[JsonObject] = []
         hdg_idx = 0
 
         for v_num in all_verses:
             while hdg_idx < len(hdg_positions) and hdg_positions[hdg_idx] <= v_num:
-                pos = hdg_positions[hdg_idx]
-                content.append(
-                    {
-                        "kind": "heading",
-                        "armenian": arm_hdg.get(pos, ""),
-                        "english": eng_hdg.get(pos, ""),
-                        "classical": "",
-                    }
-                )
+                content.append(heading_item(hdg_positions[hdg_idx]))
                 hdg_idx += 1
 
             # Extract clean text + footnotes for each language
-            arm_payload = arm_verses.get(
-                v_num,
-                {"text": "", "indentLevel": None, "firstLineIndent": None},
-            )
-            eng_payload = eng_verses.get(
-                v_num,
-                {"text": "", "indentLevel": None, "firstLineIndent": None},
-            )
-            arm_text_raw_obj = arm_payload.get("text")
-            eng_text_raw_obj = eng_payload.get("text")
-            arm_text_raw = arm_text_raw_obj if isinstance(arm_text_raw_obj, str) else ""
-            eng_text_raw = eng_text_raw_obj if isinstance(eng_text_raw_obj, str) else ""
-            arm_clean, arm_fns = _extract_footnotes(arm_text_raw, fn_map)
-            eng_clean, eng_fns = _extract_footnotes(eng_text_raw, fn_map)
-            arm_indent = arm_payload.get("indentLevel")
-            eng_indent = eng_payload.get("indentLevel")
-            indent_level = (
-                arm_indent
-                if isinstance(arm_indent, int)
-                else eng_indent
-                if isinstance(eng_indent, int)
-                else None
-            )
-            arm_first_line = arm_payload.get("firstLineIndent")
-            eng_first_line = eng_payload.get("firstLineIndent")
-            first_line_indent = (
-                arm_first_line
-                if isinstance(arm_first_line, (int, float))
-                else eng_first_line
-                if isinstance(eng_first_line, (int, float))
-                else None
-            )
+            verse_item: JsonObject = {"kind": "verse", "number": v_num, **empty_text}
+            # Keys in ``fields`` order; every slot gets its own list below.
+            footnotes: JsonObject = dict.fromkeys(fields)
+            for f in unsourced:
+                footnotes[f] = []
+            indent_level: int | None = None
+            first_line_indent: float | None = None
+            for f, verses in verse_maps:
+                verse = verses.get(v_num)
+                if verse is None:
+                    footnotes[f] = []
+                    continue
+                verse_item[f], footnotes[f] = _extract_footnotes(verse.text, fn_map)
+                if indent_level is None:
+                    indent_level = verse.indent_level
+                if first_line_indent is None:
+                    first_line_indent = verse.first_line_indent
 
-            verse_item: dict[str, object] = {
-                "kind": "verse",
-                "number": v_num,
-                "armenian": arm_clean,
-                "english": eng_clean,
-                "classical": "",
-                "footnotes": {
-                    "armenian": arm_fns,
-                    "english": eng_fns,
-                    "classical": [],
-                },
-            }
+            verse_item["footnotes"] = footnotes
             if indent_level is not None:
                 verse_item["indentLevel"] = indent_level
-            if first_line_indent is not None and abs(float(first_line_indent)) >= 0.01:
-                verse_item["firstLineIndent"] = round(float(first_line_indent), 2)
+            if first_line_indent is not None and abs(first_line_indent) >= 0.01:
+                verse_item["firstLineIndent"] = round(first_line_indent, 2)
 
             content.append(verse_item)
 
         # Trailing headings
         while hdg_idx < len(hdg_positions):
-            pos = hdg_positions[hdg_idx]
-            content.append(
-                {
-                    "kind": "heading",
-                    "armenian": arm_hdg.get(pos, ""),
-                    "english": eng_hdg.get(pos, ""),
-                    "classical": "",
-                }
-            )
+            content.append(heading_item(hdg_positions[hdg_idx]))
             hdg_idx += 1
 
         merged.append({"number": ch_num, "content": content})
@@ -525,90 +844,810 @@ def merge_chapters(
     return merged
 
 
+def merge_chapters(
+    arm_chs: BookChapters,
+    eng_chs: BookChapters,
+    fn_map: Mapping[str, str],
+) -> list[JsonObject]:
+    """Merge Armenian and English chapter data into a single list."""
+    return merge_sources([("armenian", arm_chs), ("english", eng_chs)], fn_map)
+
+
+# ── Incremental import cache ──────────────────────────────────────
+
+IMPORT_CACHE_NAME = ".import-cache.json"
+HASHED_PARTS = ("word/document.xml", "word/footnotes.xml", "word/endnotes.xml")
+
+
+def _sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_matches(path: Path, digest: str) -> bool:
+    """Whether ``path`` exists and its bytes hash to ``digest``.
+
+    The import cache only records what the last import wrote; the file may
+    have been edited in the browser since.
+    """
+    try:
+        return _sha256_hex(path.read_bytes()) == digest
+    except OSError:
+        return False
+
+
+def docx_part_hashes(docx_path: Path) -> dict[str, str]:
+    """SHA-256 of each DOCX part the importer reads (missing parts are skipped)."""
+    hashes: dict[str, str] = {}
+    with zipfile.ZipFile(docx_path) as zf:
+        names = set(zf.namelist())
+        for part in HASHED_PARTS:
+            if part not in names:
+                continue
+            digest = hashlib.sha256()
+            with zf.open(part) as fh:
+                for chunk in iter(lambda: fh.read(1 << 16), b""):
+                    digest.update(chunk)
+            hashes[part] = digest.hexdigest()
+    return hashes
+
+
+def load_import_cache(output_dir: Path) -> dict[str, Any]:
+    """Read ``<output_dir>/.import-cache.json`` (empty cache if absent/corrupt)."""
+    cache_path = output_dir / IMPORT_CACHE_NAME
+    try:
+        raw = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        raw = {}
+    if not isinstance(raw, dict):
+        raw = {}
+    return {
+        "sources": raw.get("sources") if isinstance(raw.get("sources"), dict) else {},
+        "books": raw.get("books") if isinstance(raw.get("books"), dict) else {},
+        "layout": raw.get("layout") if isinstance(raw.get("layout"), str) else "monolithic",
+    }
+
+
+def save_import_cache(output_dir: Path, cache: dict[str, Any]) -> None:
+    atomic_write_text(
+        output_dir / IMPORT_CACHE_NAME,
+        json.dumps(cache, ensure_ascii=False, indent=2, sort_keys=True),
+    )
+
+
+class RenderedBook(NamedTuple):
+    book_id: str
+    files: list[tuple[str, str]]  # (path relative to the output dir, text)
+    summary: str
+    entry: JsonObject  # books-manifest entry, see ``book_index.make_entry``
+    base: BookBase  # per-verse cell hashes for ``--sync``, see ``book_sync.py``
+
+
+def write_output(
+    output_dir: Path,
+    file_name: str,
+    text: str,
+    book_hashes: dict[str, str] | None = None,
+) -> bool:
+    """Atomically write one output file unless its bytes are unchanged.
+
+    ``book_hashes`` is the ``books`` section of the import cache; when given,
+    a file whose merged content hashes the same as last import is left
+    untouched, provided the file on disk still holds exactly those bytes.
+
+    Returns:
+        True if the file was written.
+    """
+    out_path = output_dir / file_name
+    digest = _sha256_hex(text.encode("utf-8"))
+    if book_hashes is not None:
+        unchanged = book_hashes.get(file_name) == digest and file_matches(out_path, digest)
+        book_hashes[file_name] = digest
+        if unchanged:
+            return False
+    with _stage("write"):
+        out_path.parent.mkdir(exist_ok=True)
+        atomic_write_text(out_path, text)
+    if PROFILER is not None:
+        PROFILER.count("bytesWritten", len(text.encode("utf-8")))
+    return True
+
+
+class MergedBook(NamedTuple):
+    book: JsonObject  # ``data/<book-id>.json`` shape
+    verse_counts: list[int]  # per chapter
+    footnote_count: int
+
+
+def build_book_from_sources(
+    books: list[tuple[str, BookEntry]],
+    fn_map: Mapping[str, str],
+) -> MergedBook:
+    """Merge one book's parallel (text field, book) sources into the book JSON structure.
+
+    The id comes from the English name (the first source's, without one).
+    """
+    names = {f: name for f, (name, _) in books}
+    id_name = names.get("english", books[0][1][0])
+
+    with _stage("merge"):
+        chapters = merge_sources([(f, chs) for f, (_, chs) in books], fn_map)
+    verse_counts = [
+        sum(1 for item in ch["content"] if item["kind"] == "verse") for ch in chapters
+    ]
+    total_fns = sum(
+        len(fns)
+        for ch in chapters
+        for item in ch["content"]
+        if item["kind"] == "verse"
+        for fns in item["footnotes"].values()
+    )
+
+    name = {
+        "english": id_name.title(),
+        "armenian": names.get("armenian", ""),
+        "classical": names.get("classical", ""),
+    }
+    name.update((f, n) for f, n in names.items() if f not in name)
+    book = {
+        "id": make_book_id(id_name),
+        "name": name,
+        "chapters": chapters,
+    }
+
+    if PROFILER is not None:
+        PROFILER.count("footnotesAnchored", total_fns)
+    return MergedBook(book, verse_counts, total_fns)
+
+
+def build_book(
+    arm_book: BookEntry,
+    eng_book: BookEntry,
+    fn_map: Mapping[str, str],
+) -> MergedBook:
+    """Merge one Armenian/English book pair into the book JSON structure."""
+    return build_book_from_sources([("armenian", arm_book), ("english", eng_book)], fn_map)
+
+
+def summary_line(merged: MergedBook, target: str) -> str:
+    return (
+        f"  \u2713 {merged.book['name']['english']:40s} \u2192 {target:30s} "
+        f"({len(merged.verse_counts)} ch, {sum(merged.verse_counts)} verses, "
+        f"{merged.footnote_count} footnotes)"
+    )
+
+
+def render_book(
+    arm_book: BookEntry,
+    eng_book: BookEntry,
+    fn_map: Mapping[str, str],
+    layout: str = "monolithic",
+) -> RenderedBook:
+    """Merge one Armenian/English book pair and serialize it.
+
+    ``layout`` is ``"monolithic"``, ``"sharded"`` (``<book-id>/meta.json``
+    plus one file per chapter) or ``"compact"`` (see ``book_shards.py``).
+    """
+    return render_merged(build_book(arm_book, eng_book, fn_map), layout)
+
+
+def render_merged(merged: MergedBook, layout: str = "monolithic") -> RenderedBook:
+    """Serialize a merged book (see ``render_book``)."""
+    book = merged.book
+    book_id = book["id"]
+    file_name = f"{book_id}/" if layout == "sharded" else f"{book_id}.json"
+    with _stage("serialize"):
+        files = book_files(book, layout)
+        base = book_base(book)
+    data = b"".join(text.encode("utf-8") for _, text in files)
+    entry = make_entry(
+        book_id, book["name"], merged.verse_counts, merged.footnote_count, data, file_name
+    )
+    return RenderedBook(book_id, files, summary_line(merged, file_name), entry, base)
+
+
+def _render_book_pair(
+    args: tuple[BookEntry, BookEntry, dict[str, str], str],
+) -> RenderedBook:
+    """Single-argument wrapper so ``render_book`` can be used with ``Executor.map``."""
+    return render_book(*args)
+
+
+def _render_book_sources(
+    args: tuple[list[tuple[str, BookEntry]], dict[str, str], str],
+) -> RenderedBook:
+    """``Executor.map`` wrapper: merge one book's N sources and serialize it."""
+    books, fn_map, layout = args
+    return render_merged(build_book_from_sources(books, fn_map), layout)
+
+
+def _write_rendered(
+    rendered: RenderedBook,
+    output_dir: Path,
+    book_hashes: dict[str, str] | None,
+    manifest: dict[str, JsonObject] | None,
+    sync_base: dict[str, BookBase] | None = None,
+) -> None:
+    """Write (or skip) one rendered book, report it, and record its manifest entry.
+
+    ``sync_base`` (if given) gets the book's per-verse base hashes, written or
+    not: they describe what the DOCX says, which is what ``--sync`` merges from.
+    """
+    written = False
+    # Chapters before meta.json, so a reader never sees meta listing a missing shard.
+    for file_name, text in reversed(rendered.files):
+        written |= write_output(output_dir, file_name, text, book_hashes)
+    clear_superseded(output_dir, rendered.book_id, {name for name, _ in rendered.files})
+    print(rendered.summary if written else f"{rendered.summary}  [unchanged]")
+    # Skipped files may have been edited in the browser since; reindex reads those.
+    if written and manifest is not None:
+        manifest[rendered.entry["file"]] = rendered.entry
+    if sync_base is not None:
+        sync_base[rendered.book_id] = rendered.base
+
+
+def write_book(
+    arm_book: BookEntry,
+    eng_book: BookEntry,
+    fn_map: Mapping[str, str],
+    output_dir: Path,
+    book_hashes: dict[str, str] | None = None,
+    manifest: dict[str, JsonObject] | None = None,
+    layout: str = "monolithic",
+    sync_base: dict[str, BookBase] | None = None,
+) -> None:
+    """Merge one Armenian/English book pair and write its JSON file(s)."""
+    rendered = render_book(arm_book, eng_book, fn_map, layout)
+    _write_rendered(rendered, output_dir, book_hashes, manifest, sync_base)
+
+
+def _align_books(parsed: list[tuple[str, list[BookEntry]]]) -> list[tuple[BookEntry, ...]]:
+    """Drop placeholder books and line up the remaining ones by index across sources."""
+    kept = [(f, [(n, c) for n, c in books if has_real_content(c)]) for f, books in parsed]
+
+    count = min(len(books) for _, books in kept)
+    if any(len(books) != count for _, books in kept):
+        counts = ", ".join(f"{f.title()}={len(books)}" for f, books in kept)
+        print(f"\u26a0  Book count mismatch: {counts}. Merging first {count}.")
+    return list(zip(*(books[:count] for _, books in kept)))
+
+
+def _pair_books(
+    arm_books: list[BookEntry], eng_books: list[BookEntry]
+) -> list[tuple[BookEntry, BookEntry]]:
+    """Drop placeholder books and pair the remaining ones by index."""
+    aligned = _align_books([("armenian", arm_books), ("english", eng_books)])
+    return [(arm_book, eng_book) for arm_book, eng_book in aligned]
+
+
 def merge_and_write(
     arm_books: list[BookEntry],
     eng_books: list[BookEntry],
-    fn_map: dict[str, str],
+    fn_map: Mapping[str, str],
     output_dir: Path,
+    book_hashes: dict[str, str] | None = None,
+    manifest: dict[str, JsonObject] | None = None,
+    layout: str = "monolithic",
+    sync_base: dict[str, BookBase] | None = None,
 ) -> None:
-    """Merge parallel book lists and write JSON files."""
+    """Merge parallel book lists and write JSON files.
+
+    ``manifest`` (if given) collects ``index.json`` entries for the files
+    actually written, keyed by file name, for ``book_index.reindex``.
+    ``layout`` picks how each book is stored (see ``render_book``).  ``sync_base`` collects each
+    book's ``--sync`` base hashes, keyed by book id.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for arm_book, eng_book in _pair_books(arm_books, eng_books):
+        write_book(
+            arm_book, eng_book, fn_map, output_dir, book_hashes, manifest, layout, sync_base
+        )
+
+
+def stream_merge_and_write(
+    arm_books: Iterable[BookEntry],
+    eng_books: Iterable[BookEntry],
+    fn_map: Mapping[str, str],
+    output_dir: Path,
+    book_hashes: dict[str, str] | None = None,
+    manifest: dict[str, JsonObject] | None = None,
+    layout: str = "monolithic",
+    sync_base: dict[str, BookBase] | None = None,
+) -> None:
+    """Streaming counterpart of ``merge_and_write``.
+
+    Pulls one book at a time from each language in lockstep and writes it
+    as soon as both sides have finished it, so memory and time-to-first-file
+    are bounded by the largest single book rather than the whole corpus.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Filter out empty/placeholder books
-    arm_books = [(n, c) for n, c in arm_books if has_real_content(c)]
-    eng_books = [(n, c) for n, c in eng_books if has_real_content(c)]
+    arm_iter = ((n, c) for n, c in arm_books if has_real_content(c))
+    eng_iter = ((n, c) for n, c in eng_books if has_real_content(c))
+
+    count = 0
+    while True:
+        arm_book = next(arm_iter, None)
+        eng_book = next(eng_iter, None)
+        if arm_book is None or eng_book is None:
+            break
+        write_book(
+            arm_book, eng_book, fn_map, output_dir, book_hashes, manifest, layout, sync_base
+        )
+        count += 1
 
-    count = min(len(arm_books), len(eng_books))
-    if len(arm_books) != len(eng_books):
+    # Drain whichever side is longer so the mismatch can be reported.
+    arm_total = count + (arm_book is not None) + sum(1 for _ in arm_iter)
+    eng_total = count + (eng_book is not None) + sum(1 for _ in eng_iter)
+    if arm_total != eng_total:
         print(
-            f"\u26a0  Book count mismatch: Armenian={len(arm_books)}, English={len(eng_books)}. "
-            f"Merging first {count}."
+            f"\u26a0  Book count mismatch: Armenian={arm_total}, English={eng_total}. "
+            f"Merged first {count}."
         )
 
-    for idx in range(count):
-        arm_name, arm_chs = arm_books[idx]
-        eng_name, eng_chs = eng_books[idx]
-
-        chapters = merge_chapters(arm_chs, eng_chs, fn_map)
-        book_id = make_book_id(eng_name)
-        total_verses = sum(
-            1
-            for ch in chapters
-            for item in ch["content"]  # type: ignore[union-attr]
-            if isinstance(item, dict) and item.get("kind") == "verse"
-        )
-        total_fns = sum(
-            len(fns.get("armenian", [])) + len(fns.get("english", [])) + len(fns.get("classical", []))  # type: ignore[union-attr]
-            for ch in chapters
-            for item in ch["content"]  # type: ignore[union-attr]
-            if isinstance(item, dict) and item.get("kind") == "verse"
-            for fns in [item.get("footnotes", {})]  # type: ignore[union-attr]
-        )
 
-        book = {
-            "id": book_id,
-            "name": {
-                "english": eng_name.title(),
-                "armenian": arm_name,
-                "classical": "",
-            },
-            "chapters": chapters,
-        }
+def parallel_import(
+    arm_docx: Path,
+    eng_docx: Path,
+    output_dir: Path,
+    jobs: int,
+    book_hashes: dict[str, str] | None = None,
+    manifest: dict[str, JsonObject] | None = None,
+    layout: str = "monolithic",
+    sync_base: dict[str, BookBase] | None = None,
+) -> None:
+    """Parse both DOCX files concurrently, then merge + serialize books in a pool.
 
-        out_path = output_dir / f"{book_id}.json"
-        out_path.write_text(
-            json.dumps(book, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
-        print(
-            f"  \u2713 {eng_name.title():40s} \u2192 {out_path.name:30s} "
-            f"({len(chapters)} ch, {total_verses} verses, {total_fns} footnotes)"
+    Files are still written (and reported) by the parent in book order, so
+    the output is byte-identical to the serial ``merge_and_write`` path.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        arm_future = pool.submit(parse_books, arm_docx, "arm")
+        eng_future = pool.submit(parse_books, eng_docx, "eng")
+        # Notes are only indexed, here, while the workers parse.
+        arm_fn_map = load_notes(arm_docx, "arm")
+        eng_fn_map = load_notes(eng_docx, "eng")
+        arm_books = arm_future.result()
+        eng_books = eng_future.result()
+        print(f"  Armenian: {len(arm_books)} sections, {len(arm_fn_map)} footnotes")
+        print(f"  English:  {len(eng_books)} sections, {len(eng_fn_map)} footnotes")
+
+        fn_map = arm_fn_map | eng_fn_map
+        output_dir.mkdir(parents=True, exist_ok=True)
+        tasks = (
+            (arm_book, eng_book, fn_map, layout)
+            for arm_book, eng_book in _pair_books(arm_books, eng_books)
         )
+        for rendered in pool.map(_render_book_pair, tasks):
+            _write_rendered(rendered, output_dir, book_hashes, manifest, sync_base)
+
+
+# ── Source manifest (N languages) ──────────────────────────────────
+
+
+class Source(NamedTuple):
+    field: str  # text field the DOCX fills, e.g. "classical"
+    docx: Path
+    prefix: str  # footnote ids are ``<prefix>:<n>``
+
+
+_SOURCE_FIELD_RE = re.compile(r"[a-z][a-z0-9_]*")
+_RESERVED_FIELDS = {"kind", "number", "footnotes", "indentLevel", "firstLineIndent", "poetry"}
+DEFAULT_FOOTNOTE_PREFIXES = {"armenian": "arm", "english": "eng"}
+
+
+def load_sources(manifest_path: Path) -> list[Source]:
+    """Read a ``--manifest`` file mapping DOCX files to text fields.
+
+    The file is JSON: ``{"sources": [{"field": "armenian", "docx": "a.docx"},
+    ...]}``, with ``docx`` paths relative to the manifest.  An optional
+    ``"prefix"`` sets the footnote id prefix (default ``arm``/``eng`` for
+    Armenian/English, the field name otherwise).
+
+    Raises:
+        ValueError: if the file is not a valid source manifest.
+    """
+    raw = json.loads(manifest_path.read_text(encoding="utf-8"))
+    entries = raw.get("sources") if isinstance(raw, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError('expected {"sources": [...]} with at least one source')
+
+    sources: list[Source] = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"source {i}: expected an object")
+        field_name, docx = entry.get("field"), entry.get("docx")
+        if not isinstance(field_name, str) or not _SOURCE_FIELD_RE.fullmatch(field_name):
+            raise ValueError(f"source {i}: 'field' must be a lowercase identifier")
+        if field_name in _RESERVED_FIELDS:
+            raise ValueError(f"source {i}: '{field_name}' is not a text field")
+        if not isinstance(docx, str) or not docx:
+            raise ValueError(f"source {i}: 'docx' must be a path")
+        prefix = entry.get("prefix", DEFAULT_FOOTNOTE_PREFIXES.get(field_name, field_name))
+        if not isinstance(prefix, str) or not prefix or ":" in prefix or "\x00" in prefix:
+            raise ValueError(f"source {i}: 'prefix' must be a non-empty string without ':'")
+        sources.append(Source(field_name, manifest_path.parent / docx, prefix))
+
+    for attr in ("field", "prefix"):
+        values = [getattr(source, attr) for source in sources]
+        if len(set(values)) != len(values):
+            raise ValueError(f"each source needs a distinct {attr}")
+    return sources
+
+
+def import_sources(
+    sources: list[Source],
+    output_dir: Path,
+    jobs: int = 1,
+    book_hashes: dict[str, str] | None = None,
+    manifest: dict[str, JsonObject] | None = None,
+    layout: str = "monolithic",
+    sync_base: dict[str, BookBase] | None = None,
+) -> None:
+    """Parse every source DOCX (concurrently with ``jobs`` > 1), merge, and write.
+
+    Each DOCX is parsed once, and each book is merged in a single pass over
+    all of its sources, so the cost is linear in the number of sources.
+    Files are written (and reported) in book order by this process, as in
+    ``parallel_import``.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext() as pool:
+        if pool is None:
+            parsed = [parse_multibook(source.docx, source.prefix) for source in sources]
+        else:
+            futures = [pool.submit(parse_books, src.docx, src.prefix) for src in sources]
+            notes = [load_notes(src.docx, src.prefix) for src in sources]
+            parsed = [(future.result(), fns) for future, fns in zip(futures, notes)]
+
+        fn_map = NoteStore()
+        width = max(len(source.field) for source in sources) + 2
+        for source, (books, source_fn_map) in zip(sources, parsed):
+            label = f"{source.field.title()}:"
+            print(f"  {label:{width}s}{len(books)} sections, {len(source_fn_map)} footnotes")
+            fn_map |= source_fn_map
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        fields = [source.field for source in sources]
+        aligned = _align_books([(f, books) for f, (books, _) in zip(fields, parsed)])
+        tasks = ((list(zip(fields, group)), fn_map, layout) for group in aligned)
+        render = map if pool is None else pool.map
+        for rendered in render(_render_book_sources, tasks):
+            _write_rendered(rendered, output_dir, book_hashes, manifest, sync_base)
+
+
+def merge_into_sqlite(
+    arm_books: list[BookEntry],
+    eng_books: list[BookEntry],
+    fn_map: Mapping[str, str],
+    db_path: Path,
+) -> None:
+    """Merge parallel book lists into a ``book_db.py`` SQLite database.
+
+    Each book is stored with the SHA-256 of the JSON file the default output
+    would have written, so re-imports leave unchanged books alone and a later
+    ``book_db.py to-sqlite`` sync sees them as up to date.
+    """
+    conn = connect_db(db_path)
+    stored = dict(conn.execute("SELECT id, sha256 FROM books"))
+    for arm_book, eng_book in _pair_books(arm_books, eng_books):
+        merged = build_book(arm_book, eng_book, fn_map)
+        book_id = merged.book["id"]
+        with _stage("serialize"):
+            digest = _sha256_hex(book_files(merged.book, "monolithic")[0][1].encode("utf-8"))
+        summary = summary_line(merged, f"{db_path.name}:{book_id}")
+        if stored.get(book_id) == digest:
+            print(f"{summary}  [unchanged]")
+            continue
+        with _stage("write"):
+            write_db_book(conn, merged.book, digest)
+        print(summary)
+    conn.close()
+
+
+def sync_and_write(
+    arm_books: list[BookEntry],
+    eng_books: list[BookEntry],
+    fn_map: Mapping[str, str],
+    output_dir: Path,
+    sync_base: dict[str, BookBase],
+) -> int:
+    """Three-way merge a fresh parse into existing (possibly edited) books.
+
+    Only DOCX cells that changed since the base was recorded are applied;
+    local edits are kept, and cells changed on both sides are reported as
+    conflicts (see ``book_sync.py``).  Books keep their current layout and
+    are rewritten only if something changed.  Books new to the DOCX are
+    written as on import.
+
+    Returns:
+        The number of conflicts reported.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    conflicts = 0
+    for arm_book, eng_book in _pair_books(arm_books, eng_books):
+        merged = build_book(arm_book, eng_book, fn_map)
+        source = merged.book
+        book_id = source["id"]
+        layout = book_layout(output_dir, book_id)
+        target = f"{book_id}/" if layout == "sharded" else f"{book_id}.json"
+        try:
+            local = load_book(output_dir, book_id)
+        except FileNotFoundError:
+            if book_id in sync_base:
+                print(f"  \u26a0 {book_id}: deleted locally; not restored")
+                continue
+            local = None
+
+        label = f"  \u2713 {source['name']['english']:40s} \u2192 {target:30s}"
+        if local is None:
+            sync_base[book_id] = book_base(source)
+            with _stage("write"):
+                write_book_files(output_dir, source, layout)
+            print(f"{label} (new)")
+            continue
+
+        with _stage("sync"):
+            sync_base[book_id], report = sync_book(local, source, sync_base.get(book_id, {}))
+            # Local books keep their poetry flags; re-break text the sync changed.
+            rebroken = apply_poetry_breaks(local)
+        if report.changed or rebroken:
+            with _stage("write"):
+                write_book_files(output_dir, local, layout)
+            print(
+                f"{label} ({report.updated} cells updated, {report.added} added, "
+                f"{report.removed} removed, {len(report.conflicts)} conflicts, "
+                f"{rebroken} poetry verses re-broken)"
+            )
+        else:
+            print(f"{label} [unchanged]")
+        for conflict in report.conflicts:
+            print(f"      \u26a0 {conflict}")
+        conflicts += len(report.conflicts)
+    return conflicts
 
 
 # ── Main ──────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--stream",
+        action="store_true",
+        help="pipeline books through generators, writing each as soon as both languages finish it",
+    )
+    mode.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="parse both DOCX files and merge books across N worker processes",
+    )
+    layout_mode = parser.add_mutually_exclusive_group()
+    layout_mode.add_argument(
+        "--sharded",
+        action="store_true",
+        help="write data/<book-id>/meta.json + one file per chapter instead of data/<book-id>.json",
+    )
+    layout_mode.add_argument(
+        "--compact",
+        action="store_true",
+        help="write data/<book-id>.json in the compact format (footnote table, no defaults)",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        metavar="PATH",
+        help="import the DOCX sources listed in PATH (any number of languages) in parallel",
+    )
+    parser.add_argument(
+        "--books",
+        metavar="ID,ID",
+        help="re-import only these comma-separated book ids, leaving every other book alone",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="merge DOCX changes since the last import into edited books, keeping local edits",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="sqlite:PATH",
+        help="write books into the SQLite database at PATH instead of data/",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"ignore data/{IMPORT_CACHE_NAME} and rewrite every book file",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-stage wall/CPU time, tracemalloc peak and counters",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=Path,
+        metavar="PATH",
+        help="write the --profile metrics as JSON to PATH (implies profiling)",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if (args.profile or args.metrics_json) and args.jobs > 1:
+        parser.error("--profile/--metrics-json measure a single process; drop --jobs")
+    db_path: Path | None = None
+    if args.output is not None:
+        if not args.output.startswith("sqlite:") or args.output == "sqlite:":
+            parser.error("--output must be sqlite:PATH")
+        if args.stream or args.jobs > 1 or args.sharded or args.compact:
+            parser.error(
+                "--output sqlite:PATH cannot be combined with --stream/--jobs/--sharded/--compact"
+            )
+        db_path = Path(args.output.removeprefix("sqlite:"))
+    if args.sync and (
+        args.stream or args.jobs > 1 or args.sharded or args.compact or db_path is not None
+    ):
+        parser.error("--sync cannot be combined with --stream/--jobs/--sharded/--compact/--output")
+    if args.manifest and (args.stream or args.sync or db_path is not None):
+        parser.error("--manifest cannot be combined with --stream/--sync/--output")
+    book_ids: list[str] = []
+    if args.books is not None:
+        book_ids = list(dict.fromkeys(b.strip() for b in args.books.split(",") if b.strip()))
+        if not book_ids:
+            parser.error("--books needs at least one book id")
+        if args.stream or args.jobs > 1 or args.manifest or args.sync or db_path is not None:
+            parser.error("--books cannot be combined with --stream/--jobs/--manifest/--sync/--output")
+
+    if args.profile or args.metrics_json:
+        from import_profile import ImportProfiler
+
+        PROFILER = ImportProfiler()
+        PROFILER.start()
+
     root = Path(__file__).resolve().parent.parent
     arm_docx = root / "Krapar Asdvadzashouche Ashkharaparov.docx"
     eng_docx = root / "The Classical Armenian Bible in English.docx"
     out_dir = root / "data"
 
-    for docx in (arm_docx, eng_docx):
-        if not docx.exists():
-            print(f"ERROR: {docx.name} not found at {docx}")
+    if args.manifest is not None:
+        try:
+            sources = load_sources(args.manifest)
+        except (OSError, ValueError) as exc:
+            print(f"ERROR: {args.manifest}: {exc}")
             raise SystemExit(1)
+    else:
+        sources = [Source("armenian", arm_docx, "arm"), Source("english", eng_docx, "eng")]
 
-    print("Parsing Armenian DOCX...")
-    arm_books, arm_fn_map = parse_multibook(arm_docx, "arm")
-    print(f"  Found {len(arm_books)} sections, {len(arm_fn_map)} footnotes")
+    for source in sources:
+        if not source.docx.exists():
+            print(f"ERROR: {source.docx.name} not found at {source.docx}")
+            raise SystemExit(1)
 
-    print("Parsing English DOCX...")
-    eng_books, eng_fn_map = parse_multibook(eng_docx, "eng")
-    print(f"  Found {len(eng_books)} sections, {len(eng_fn_map)} footnotes")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = load_import_cache(out_dir)
+    source_hashes = {source.prefix: docx_part_hashes(source.docx) for source in sources}
+    # --sync keeps each book's layout, so it leaves the recorded one alone.
+    if args.sync:
+        layout = cache["layout"]
+    else:
+        layout = "sharded" if args.sharded else "compact" if args.compact else "monolithic"
+    if (
+        db_path is None
+        and not args.sync
+        and not args.force
+        and cache["sources"] == source_hashes
+        and cache["layout"] == layout
+        and cache["books"]
+        and all(file_matches(out_dir / name, digest) for name, digest in cache["books"].items())
+    ):
+        reindex(out_dir)
+        print("DOCX inputs unchanged since last import; nothing to do (use --force to re-run).")
+        raise SystemExit(0)
+
+    book_hashes: dict[str, str] = {} if args.force else dict(cache["books"])
+    if args.force and book_ids:
+        # Forget only the listed books' hashes; the others stay as imported.
+        book_hashes = {
+            name: h
+            for name, h in cache["books"].items()
+            if name.split("/")[0].removesuffix(".json") not in book_ids
+        }
+    manifest: dict[str, JsonObject] = {}
+    sync_base = load_sync_base(out_dir)
+
+    if db_path is not None:
+        print("Parsing Armenian + English DOCX...")
+        arm_books, arm_fn_map = parse_multibook(arm_docx, "arm")
+        eng_books, eng_fn_map = parse_multibook(eng_docx, "eng")
+        print(f"\nMerging into {db_path}...")
+        merge_into_sqlite(arm_books, eng_books, arm_fn_map | eng_fn_map, db_path)
+        print(f"\nDone! Books are in {db_path}")
+    elif args.sync:
+        print("Parsing Armenian + English DOCX...")
+        arm_books, arm_fn_map = parse_multibook(arm_docx, "arm")
+        eng_books, eng_fn_map = parse_multibook(eng_docx, "eng")
+        print("\nSyncing DOCX changes into data/...")
+        conflicts = sync_and_write(
+            arm_books, eng_books, arm_fn_map | eng_fn_map, out_dir, sync_base
+        )
+        if conflicts:
+            print(f"\u26a0  {conflicts} conflicts kept their local values; review them in the editor")
+    elif book_ids:
+        print(f"Scanning Armenian + English DOCX for {', '.join(book_ids)}...")
+        try:
+            pairs = select_book_pairs(arm_docx, eng_docx, book_ids)
+        except ValueError as exc:
+            print(f"ERROR: {exc}")
+            raise SystemExit(1)
+        fn_map = load_notes(arm_docx, "arm") | load_notes(eng_docx, "eng")
+        print("\nMerging and writing JSON files...")
+        for arm_book, eng_book in pairs:
+            write_book(
+                arm_book, eng_book, fn_map, out_dir, book_hashes, manifest, layout, sync_base
+            )
+    elif args.manifest is not None:
+        # One process per source by default; --profile needs everything in-process.
+        jobs = args.jobs if args.jobs > 1 or PROFILER is not None else len(sources)
+        jobs = min(jobs, os.cpu_count() or 1)
+        print(f"Parsing {len(sources)} DOCX sources (--jobs {jobs})...")
+        import_sources(sources, out_dir, jobs, book_hashes, manifest, layout, sync_base)
+    elif args.stream:
+        fn_map = load_notes(arm_docx, "arm") | load_notes(eng_docx, "eng")
+        print(f"Streaming Armenian + English DOCX ({len(fn_map)} footnotes)...")
+        stream_merge_and_write(
+            iter_multibook(arm_docx, "arm"),
+            iter_multibook(eng_docx, "eng"),
+            fn_map,
+            out_dir,
+            book_hashes,
+            manifest,
+            layout,
+            sync_base,
+        )
+    elif args.jobs > 1:
+        print(f"Parsing Armenian + English DOCX across {args.jobs} processes...")
+        parallel_import(
+            arm_docx, eng_docx, out_dir, args.jobs, book_hashes, manifest, layout, sync_base
+        )
+    else:
+        print("Parsing Armenian DOCX...")
+        arm_books, arm_fn_map = parse_multibook(arm_docx, "arm")
+        print(f"  Found {len(arm_books)} sections, {len(arm_fn_map)} footnotes")
 
-    # Merge footnote maps
-    fn_map = {**arm_fn_map, **eng_fn_map}
+        print("Parsing English DOCX...")
+        eng_books, eng_fn_map = parse_multibook(eng_docx, "eng")
+        print(f"  Found {len(eng_books)} sections, {len(eng_fn_map)} footnotes")
 
-    print("\nMerging and writing JSON files...")
-    merge_and_write(arm_books, eng_books, fn_map, out_dir)
-    print("\nDone! JSON files are in data/")
+        # Merge footnote maps
+        fn_map = arm_fn_map | eng_fn_map
+
+        print("\nMerging and writing JSON files...")
+        merge_and_write(
+            arm_books, eng_books, fn_map, out_dir, book_hashes, manifest, layout, sync_base
+        )
+
+    if db_path is None:
+        # Drop hashes of files a layout switch (or a vanished book) removed.
+        book_hashes = {name: h for name, h in book_hashes.items() if (out_dir / name).exists()}
+        if book_ids:
+            # The other books still come from the DOCX files (and layout) last
+            # imported in full, so the next full import must not look current.
+            source_hashes, layout = cache["sources"], cache["layout"]
+        save_import_cache(
+            out_dir, {"sources": source_hashes, "books": book_hashes, "layout": layout}
+        )
+        save_sync_base(out_dir, sync_base)
+        index, _ = reindex(out_dir, manifest)
+        print(f"  \u2713 {len(index['books'])} books \u2192 data/{MANIFEST_NAME}")
+        print("\nDone! JSON files are in data/")
+
+    if PROFILER is not None:
+        PROFILER.stop()
+        if args.profile:
+            PROFILER.print_summary()
+        if args.metrics_json:
+            args.metrics_json.write_text(
+                json.dumps(PROFILER.report(), indent=2) + "\n", encoding="utf-8"
+            )
+            print(f"  \u2713 metrics \u2192 {args.metrics_json}")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Precompute poetry line breaks for the poetry verses in data/.
+
+The editor lays poetry verses out one clause per line (``src/lib/poetry.ts``):
+every word ending in strong punctuation closes a line, then each resulting
+clause is split once more at the punctuated word nearest its character
+midpoint.  This is a line-for-line port that stores the result on every
+verse with ``"poetry": true`` as
+
+    "poetryBreaks": {"armenian": [4, 9], "english": [5, 11], "classical": []}
+
+— the 1-based indices of the words ending each line but the last — so the
+editor only lays the lines out.  Languages with no text, or with manual
+line breaks (which the editor follows as typed), get no entry, and verses
+that are not poetry carry no ``poetryBreaks``.  The editor drops a
+language's entry when that text is edited and splits it on the fly until
+the next run; ``import_docx.py --sync`` refreshes the breaks of every book
+it syncs.
+
+Lengths are measured in UTF-16 code units and whitespace is JavaScript's
+``\\s``, as in the browser, so both sides pick the same midpoint.
+
+Usage:
+    python3 scripts/poetry_breaks.py [BOOK_ID ...] [--data DIR]
+    python3 scripts/poetry_breaks.py --parity [--data DIR]
+
+``--parity`` runs the TypeScript implementation (``scripts/poetry_parity.ts``,
+with ``bun`` or ``node`` 22.6+) over every verse and language in the data
+directory — poetry or not — plus a few edge cases, and lists every text for
+which the two disagree.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any
+
+from book_index import reindex
+from book_shards import book_layout, load_book, write_book_files
+from data_files import book_paths, sharded_book_dirs
+
+JsonObject = dict[str, Any]
+
+POETRY_FIELDS = ("armenian", "english", "classical")
+
+# Strong punctuation indicates multi-couplet boundaries
+ENGLISH_STRONG_RE = re.compile("[.;:!?]|\u2014")
+ARMENIAN_STRONG_RE = re.compile("[.;:!?\u0589]")
+# All punctuation (including commas) — used for midpoint breaks
+ENGLISH_ANY_PUNCT_RE = re.compile("[.;:,!?]|\u2014")
+ARMENIAN_ANY_PUNCT_RE = re.compile("[.,:;!?\u0589\u055d]")
+
+# JavaScript's \s: unlike Python's it includes U+FEFF and excludes
+# U+001C–U+001F and U+0085.
+_JS_SPACE = "\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff"
+_TOKEN_RE = re.compile(f"[{_JS_SPACE}]+|[^{_JS_SPACE}]+")
+_SPACE_RE = re.compile(f"[{_JS_SPACE}]")
+_ASTRAL_RE = re.compile("[\U00010000-\U0010ffff]")
+
+PARITY_SCRIPT = Path(__file__).resolve().parent / "poetry_parity.ts"
+# Node runs TypeScript (with --experimental-strip-types) from 22.6.
+NODE_MIN_VERSION = (22, 6)
+
+# Texts the corpus may lack: JS-only whitespace, astral characters
+# (two UTF-16 units each), dashes inside words, trailing punctuation.
+EDGE_CASES = (
+    ("english", "one two"),
+    ("english", "  leading and trailing space, with a comma  "),
+    ("english", "dash\u2014inside a word, and a clause; then more: to the end."),
+    ("english", "no punctuation anywhere in this line"),
+    ("english", "tab\tand\u00a0no-break\u2003spaces, then; a\ufeffBOM"),
+    ("english", "astral \U0001d400\U0001d401 letters, count twice; in UTF-16, yes."),
+    ("english", "\u0085next-line\u001cseparators, are not; JS whitespace"),
+    ("armenian", "abc\u0589 def\u055d ghi, jkl\u0589 mno pqr\u055d stu vwx\u0589"),
+    ("classical", "a, b, c, d, e, f, g, h."),
+)
+
+
+def _js_length(token: str) -> int:
+    return len(token) + len(_ASTRAL_RE.findall(token))
+
+
+def _last_word(is_word: list[bool], start: int, end: int) -> int:
+    """Index of the last word token in ``[start, end)``, or -1."""
+    for i in range(end - 1, start - 1, -1):
+        if is_word[i]:
+            return i
+    return -1
+
+
+def _nearest_punct_to_mid(
+    tokens: list[str],
+    is_word: list[bool],
+    lengths: list[int],
+    start: int,
+    end: int,
+    punct: re.Pattern[str],
+) -> int:
+    """Word token in ``[start, end)`` matching ``punct`` whose cumulative
+    length is closest to the range's midpoint, skipping the range's last
+    word; -1 if none."""
+    last = _last_word(is_word, start, end)
+    mid = sum(lengths[start:end]) / 2
+    cum = 0
+    best, best_dist = -1, float("inf")
+    for i in range(start, end):
+        cum += lengths[i]
+        if not is_word[i] or i == last or not punct.search(tokens[i]):
+            continue
+        dist = abs(cum - mid)
+        if dist < best_dist:
+            best, best_dist = i, dist
+    return best
+
+
+def poetry_break_words(text: str, field: str) -> list[int]:
+    """1-based indices of the words ending each poetry line but the last."""
+    tokens = _TOKEN_RE.findall(text)
+    is_word = [not _SPACE_RE.match(token) for token in tokens]
+    lengths = (
+        [_js_length(token) for token in tokens]
+        if _ASTRAL_RE.search(text)
+        else [len(token) for token in tokens]
+    )
+    if field == "english":
+        strong, punct = ENGLISH_STRONG_RE, ENGLISH_ANY_PUNCT_RE
+    else:
+        strong, punct = ARMENIAN_STRONG_RE, ARMENIAN_ANY_PUNCT_RE
+    last = _last_word(is_word, 0, len(tokens))
+
+    # 1. Words ending in strong punctuation close a line (never the last word).
+    strong_breaks = [
+        i
+        for i, token in enumerate(tokens)
+        if is_word[i] and i != last and strong.search(token)
+    ]
+    # 2. Split each clause once more at the punctuation nearest its midpoint.
+    breaks = set(strong_breaks)
+    start = 0
+    for end in [b + 1 for b in strong_breaks] + [len(tokens)]:
+        if start < end:
+            mid = _nearest_punct_to_mid(tokens, is_word, lengths, start, end, punct)
+            if mid >= 0:
+                breaks.add(mid)
+        start = end
+    # 3. Token indices → word numbers.
+    words: list[int] = []
+    word_index = 0
+    for i, word in enumerate(is_word):
+        if word:
+            word_index += 1
+            if i in breaks:
+                words.append(word_index)
+    return words
+
+
+def verse_poetry_breaks(verse: JsonObject) -> dict[str, list[int]]:
+    """``poetryBreaks`` for one verse (languages with text and no manual breaks)."""
+    breaks: dict[str, list[int]] = {}
+    for field in POETRY_FIELDS:
+        text = verse.get(field) or ""
+        if text.strip() and "\n" not in text:
+            breaks[field] = poetry_break_words(text, field)
+    return breaks
+
+
+def apply_poetry_breaks(book: JsonObject) -> int:
+    """Bring every verse's ``poetryBreaks`` up to date, in place.
+
+    Returns:
+        The number of verses changed.
+    """
+    changed = 0
+    for chapter in book["chapters"]:
+        for item in chapter.get("content", []):
+            if item.get("kind") != "verse":
+                continue
+            breaks = verse_poetry_breaks(item) if item.get("poetry") is True else {}
+            if item.get("poetryBreaks", {}) == breaks:
+                continue
+            item.pop("poetryBreaks", None)
+            if breaks:
+                item["poetryBreaks"] = breaks
+            changed += 1
+    return changed
+
+
+# ── Parity with src/lib/poetry.ts ─────────────────────────────────
+
+
+def _ts_command() -> list[str]:
+    """Command running ``poetry_parity.ts`` with bun, or else node 22.6+.
+
+    Raises:
+        RuntimeError: if neither is on PATH, or node is too old for TypeScript.
+    """
+    if shutil.which("bun"):
+        return ["bun", str(PARITY_SCRIPT)]
+    node = shutil.which("node")
+    if node is None:
+        raise RuntimeError("the parity check needs bun or node 22.6+ on PATH; found neither")
+    version = subprocess.run([node, "--version"], capture_output=True, text=True).stdout.strip()
+    match = re.match(r"v(\d+)\.(\d+)", version)
+    if match is None or (int(match[1]), int(match[2])) < NODE_MIN_VERSION:
+        raise RuntimeError(
+            f"the parity check needs bun or node 22.6+ on PATH; {node} is {version or 'unknown'}"
+        )
+    return [node, "--experimental-strip-types", "--no-warnings", str(PARITY_SCRIPT)]
+
+
+def typescript_breaks(texts: list[tuple[str, str]]) -> list[list[int]]:
+    """``poetryBreakWords`` from src/lib/poetry.ts for each (field, text).
+
+    Raises:
+        RuntimeError: if the TypeScript side cannot run (see ``_ts_command``).
+    """
+    command = _ts_command()
+    stdin = "".join(json.dumps([field, text]) + "\n" for field, text in texts)
+    proc = subprocess.run(command, input=stdin, capture_output=True, text=True, encoding="utf-8")
+    if proc.returncode != 0:
+        raise RuntimeError(f"{Path(command[0]).name} failed: {proc.stderr.strip()}")
+    results = [json.loads(line) for line in proc.stdout.splitlines()]
+    if len(results) != len(texts):
+        raise RuntimeError(f"expected {len(texts)} results, got {len(results)}")
+    return results
+
+
+def parity(data_dir: Path, book_ids: list[str]) -> tuple[int, list[str]]:
+    """Compare both implementations; returns (texts compared, mismatches).
+
+    Raises:
+        RuntimeError: if the TypeScript side cannot run (see ``_ts_command``).
+    """
+    cases: list[tuple[str, str, str]] = [
+        (f"edge case {i}", field, text) for i, (field, text) in enumerate(EDGE_CASES, 1)
+    ]
+    for book_id in book_ids:
+        for chapter in load_book(data_dir, book_id)["chapters"]:
+            for item in chapter.get("content", []):
+                if item.get("kind") != "verse":
+                    continue
+                for field in POETRY_FIELDS:
+                    if item.get(field):
+                        label = f"{book_id} {chapter['number']}:{item['number']} {field}"
+                        cases.append((label, field, item[field]))
+
+    results = typescript_breaks([(field, text) for _, field, text in cases])
+    mismatches = []
+    for (label, field, text), expected in zip(cases, results):
+        got = poetry_break_words(text, field)
+        if got != expected:
+            mismatches.append(f"{label}: TypeScript {expected}, Python {got}")
+    return len(cases), mismatches
+
+
+def all_book_ids(data_dir: Path) -> list[str]:
+    return sorted([p.stem for p in book_paths(data_dir)] + [p.name for p in sharded_book_dirs(data_dir)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("book_ids", nargs="*", metavar="BOOK_ID")
+    parser.add_argument(
+        "--parity",
+        action="store_true",
+        help="compare against the TypeScript implementation instead of writing",
+    )
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    args = parser.parse_args()
+
+    book_ids = args.book_ids or all_book_ids(args.data)
+    if args.parity:
+        try:
+            compared, mismatches = parity(args.data, book_ids)
+        except RuntimeError as exc:
+            print(f"ERROR: {exc}")
+            raise SystemExit(1)
+        for mismatch in mismatches:
+            print(f"  \u26a0 {mismatch}")
+        if mismatches:
+            print(f"\u26a0 {len(mismatches)} of {compared} texts differ")
+            raise SystemExit(1)
+        print(f"\u2713 {compared} texts: Python and TypeScript agree")
+        raise SystemExit(0)
+
+    written = 0
+    for book_id in book_ids:
+        layout = book_layout(args.data, book_id)
+        try:
+            book = load_book(args.data, book_id)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"  \u26a0 {book_id}: {exc}")
+            continue
+        changed = apply_poetry_breaks(book)
+        if changed:
+            write_book_files(args.data, book, layout)
+            written += 1
+            print(f"  \u2713 {book_id}: {changed} verses updated")
+    if written:
+        reindex(args.data)
+    print(f"\u2713 {written} of {len(book_ids)} books updated")
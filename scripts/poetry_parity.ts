@@ -0,0 +1,16 @@
+/* Reads JSON lines of [field, text] on stdin and prints poetryBreakWords()
+ * for each as a JSON line.  Driven by `python3 scripts/poetry_breaks.py --parity`.
+ */
+
+import { readFileSync } from 'node:fs';
+import { poetryBreakWords } from '../src/lib/poetry.ts';
+import type { UILanguage } from '../src/lib/types.ts';
+
+const output = readFileSync(0, 'utf-8')
+  .split('\n')
+  .filter((line) => line.length > 0)
+  .map((line) => {
+    const [field, text] = JSON.parse(line) as [UILanguage, string];
+    return JSON.stringify(poetryBreakWords(text, field));
+  });
+process.stdout.write(output.map((line) => `${line}\n`).join(''));
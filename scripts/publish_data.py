@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Publish minified, precompressed copies of every book for serving.
+
+For each book, writes to ``data/.publish/``:
+
+- ``<book-id>.json``: the book as the API serves it (sharded and compact books
+  are expanded) with no whitespace;
+- ``<book-id>.json.gz``: the same bytes, gzipped (level 9, no timestamp, so
+  re-publishing identical input gives identical files);
+- ``<book-id>.json.br``: the same bytes, Brotli-compressed, when the optional
+  ``brotli`` package is installed.
+
+``data/.publish/etags.json`` records, per published file, the size, mtime and
+SHA-256 of its source and the size and strong ETag (a quoted SHA-256 prefix
+of the exact bytes) of every variant.  ``server.ts`` serves these bytes with
+``ETag``/``If-None-Match`` handling and ``Content-Encoding`` negotiation as
+long as the source file's size and mtime still match, and falls back to the
+data file otherwise.
+
+Publishing is incremental: it refreshes the manifest first (see
+``book_index.py``) and only rebuilds files whose source hash changed, so it
+is cheap to run after every import or on a schedule.
+
+Usage:
+    python3 scripts/publish_data.py [--force] [--data DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+try:
+    import brotli
+except ImportError:  # optional: without it only .json and .json.gz are published
+    brotli = None
+
+from book_index import reindex
+from book_shards import load_book
+from data_files import atomic_write_bytes, atomic_write_text
+
+JsonObject = dict[str, Any]
+
+PUBLISH_DIR_NAME = ".publish"
+ETAGS_NAME = "etags.json"
+ETAGS_VERSION = 1
+
+# Variant name → file suffix, in the order the server prefers them.
+SUFFIXES = {"br": ".br", "gzip": ".gz", "identity": ""}
+
+
+def encodings() -> list[str]:
+    """Variants this Python can produce."""
+    return [name for name in SUFFIXES if name != "br" or brotli is not None]
+
+
+def minify(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br":
+        assert brotli is not None
+        return brotli.compress(data, quality=11)
+    return data
+
+
+def strong_etag(data: bytes) -> str:
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def load_etags(publish_dir: Path) -> dict[str, JsonObject]:
+    """Sidecar entries keyed by published file name (empty if absent/corrupt)."""
+    try:
+        raw = json.loads((publish_dir / ETAGS_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != ETAGS_VERSION:
+        return {}
+    files = raw.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _is_current(entry: JsonObject | None, sha256: str, publish_dir: Path) -> bool:
+    return (
+        entry is not None
+        and entry.get("sourceSha256") == sha256
+        and list(entry.get("variants", {})) == encodings()
+        and all((publish_dir / v["file"]).is_file() for v in entry["variants"].values())
+    )
+
+
+def publish_file(
+    publish_dir: Path, name: str, data: bytes, source: JsonObject
+) -> JsonObject:
+    """Write every variant of ``data`` as ``name`` (+ suffix); returns its sidecar entry."""
+    variants: JsonObject = {}
+    for encoding in encodings():
+        encoded = encode(data, encoding)
+        file_name = name + SUFFIXES[encoding]
+        atomic_write_bytes(publish_dir / file_name, encoded)
+        variants[encoding] = {
+            "file": file_name,
+            "bytes": len(encoded),
+            "etag": strong_etag(encoded),
+        }
+    return {**source, "variants": variants}
+
+
+def publish(data_dir: Path, force: bool = False) -> tuple[dict[str, JsonObject], list[str]]:
+    """Bring ``data/.publish/`` up to date.
+
+    Returns:
+        The sidecar entries and the names of files (re)built or removed.
+    """
+    manifest, _ = reindex(data_dir)
+    publish_dir = data_dir / PUBLISH_DIR_NAME
+    publish_dir.mkdir(exist_ok=True)
+    previous = {} if force else load_etags(publish_dir)
+    entries: dict[str, JsonObject] = {}
+    changed: list[str] = []
+
+    def refresh(name: str, source: JsonObject, build: Callable[[], bytes]) -> None:
+        old = previous.get(name)
+        if _is_current(old, source["sourceSha256"], publish_dir):
+            # Same content; a touched source only needs its stat refreshed.
+            entries[name] = {**old, **source}
+            return
+        entries[name] = publish_file(publish_dir, name, build(), source)
+        changed.append(name)
+
+    for book in manifest["books"]:
+        source = {
+            "source": book["file"],
+            "sourceBytes": book["bytes"],
+            "sourceMtimeNs": book["mtimeNs"],
+            "sourceSha256": book["sha256"],
+        }
+        book_id = book["id"]
+        refresh(f"{book_id}.json", source, lambda: minify(load_book(data_dir, book_id)))
+
+    # Drop variants of removed books (and of encodings no longer produced,
+    # and the index.json copies earlier versions published).
+    live = {v["file"] for entry in entries.values() for v in entry["variants"].values()}
+    for path in sorted(publish_dir.iterdir()):
+        if path.name != ETAGS_NAME and path.name not in live and not path.name.startswith("."):
+            path.unlink()
+            changed.append(path.name)
+
+    atomic_write_text(
+        publish_dir / ETAGS_NAME,
+        json.dumps({"version": ETAGS_VERSION, "files": entries}, ensure_ascii=False, indent=2)
+        + "\n",
+    )
+    return entries, changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="rebuild every published file")
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    args = parser.parse_args()
+
+    if not args.data.is_dir():
+        print(f"ERROR: {args.data} is not a directory")
+        raise SystemExit(1)
+    if brotli is None:
+        print("  ⚠ brotli is not installed; publishing .json and .json.gz only")
+    entries, changed = publish(args.data, args.force)
+    for name in changed:
+        entry = entries.get(name)
+        if entry is None:
+            print(f"  ✓ {name} (removed)")
+            continue
+        sizes = ", ".join(
+            f"{encoding} {variant['bytes']:,}" for encoding, variant in entry["variants"].items()
+        )
+        print(f"  ✓ {name:30s} {entry['sourceBytes']:,} → {sizes} bytes")
+    print(
+        f"✓ {len(entries)} files published, {len(changed)} updated "
+        f"→ {args.data / PUBLISH_DIR_NAME}"
+    )
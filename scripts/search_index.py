@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""Inverted full-text index over every book in data/.
+
+Indexes the ``armenian``, ``english`` and ``classical`` text of every verse
+and heading, plus each verse's footnotes.  Every occurrence of a term is
+recorded as a posting: (book, chapter, verse, field, kind, word index), the
+word index being 1-based over the whitespace-separated words of the text,
+like footnote ``anchorWord``s.
+
+Normalization (applied to indexed text and queries alike):
+  * NFKC, which also expands the ech-yiwn ligature U+0587 to U+0565 U+0582
+    and the U+FB13–U+FB17 presentation ligatures to their letter pairs;
+  * case folding, so capital and title-case ``u`` digraphs (U+0548 U+0552,
+    U+0548 U+0582) both fold to U+0578 U+0582;
+  * marks written inside Armenian words — apostrophe U+055A, emphasis
+    U+055B, exclamation U+055C, question U+055E, abbreviation U+055F — and
+    ASCII/typographic apostrophes are dropped, so a word matches with or
+    without them;
+  * everything else that is not a letter or digit, including the Armenian
+    full stop U+0589 (or ``:``), comma U+055D and hyphen U+058A, separates
+    terms.
+
+The index is stored as one gzipped segment per book under
+``data/.search/``, tagged with the book's SHA-256 from the ``index.json``
+manifest; refreshing it re-tokenizes only books whose hash changed.
+Queries read the index as it is and never write to data/; ``--refresh``
+brings it up to date first.
+
+Usage:
+    python3 scripts/search_index.py build [--force] [--data DIR]
+    python3 scripts/search_index.py query QUERY [--limit N] [--refresh] [--data DIR]
+
+QUERY is a term (``light``), a prefix (``lig*``) or a quoted phrase
+(``'"let there be light"'``); several unquoted terms must all occur in the
+same verse, heading or footnote.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import re
+import sys
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from book_index import load_manifest, reindex
+from book_shards import load_book
+from data_files import atomic_write_bytes
+
+JsonObject = dict[str, Any]
+
+SEARCH_DIR_NAME = ".search"
+SEGMENT_VERSION = 1
+
+FIELDS = ("armenian", "english", "classical")
+KINDS = ("verse", "heading", "footnote")
+
+# Apostrophes and the Armenian marks written inside words (U+055A–U+055F
+# except the comma U+055D) are removed rather than treated as separators.
+_IN_WORD_MARKS = dict.fromkeys(map(ord, "'\u2019\u055a\u055b\u055c\u055e\u055f"))
+_TERM_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold().translate(_IN_WORD_MARKS)
+
+
+def tokenize(text: str) -> list[tuple[str, int]]:
+    """(term, 1-based whitespace word index) for every term of ``text``, in order."""
+    return [
+        (term, word_index)
+        for word_index, word in enumerate(normalize(text).split(), 1)
+        for term in _TERM_RE.findall(word)
+    ]
+
+
+def query_terms(text: str) -> list[str]:
+    return [term for term, _ in tokenize(text)]
+
+
+class Hit(NamedTuple):
+    book: str
+    chapter: int
+    verse: int | None  # None for headings
+    field: str
+    kind: str
+    word: int
+
+
+# ── Segments (one per book) ───────────────────────────────────────
+
+
+class Segment:
+    """One book's slice of the index.
+
+    ``docs`` holds four uint32s per indexed text — chapter, verse (0 for
+    headings), field and kind (indexes into FIELDS/KINDS).  ``vocab`` is the
+    sorted term list; ``data`` is a flat uint32 array of ``(doc, position,
+    word)`` triples grouped by term in vocab order, ``starts[i]`` being the
+    first triple of ``vocab[i]``.  On disk a segment is gzip of a one-line
+    JSON header (book, hash, vocab) followed by the little-endian docs,
+    per-term counts and data arrays, so loading parses no postings; they are
+    unpacked per term on first use.
+    """
+
+    __slots__ = ("book", "sha256", "docs", "vocab", "starts", "data", "_index", "_decoded")
+
+    def __init__(
+        self,
+        book: str,
+        sha256: str,
+        docs: array[int],
+        vocab: list[str],
+        counts: Iterable[int],
+        data: array[int],
+    ) -> None:
+        self.book = book
+        self.sha256 = sha256
+        self.docs = docs
+        self.vocab = vocab
+        self.starts = [0, *accumulate(counts)]
+        self.data = data
+        self._index = {term: i for i, term in enumerate(vocab)}
+        self._decoded: dict[str, list[tuple[int, int, int]]] = {}
+
+    def postings(self, term: str) -> list[tuple[int, int, int]]:
+        """(doc, position, word) triples for ``term``, in order (empty if absent)."""
+        decoded = self._decoded.get(term)
+        if decoded is None:
+            i = self._index.get(term)
+            if i is None:
+                return []
+            flat = iter(self.data[self.starts[i] * 3 : self.starts[i + 1] * 3])
+            decoded = self._decoded[term] = list(zip(flat, flat, flat))
+        return decoded
+
+    def hit(self, doc: int, word: int) -> Hit:
+        chapter, verse, field, kind = self.docs[doc * 4 : doc * 4 + 4]
+        return Hit(self.book, chapter, verse or None, FIELDS[field], KINDS[kind], word)
+
+    def to_bytes(self) -> bytes:
+        header = {
+            "version": SEGMENT_VERSION,
+            "book": self.book,
+            "sha256": self.sha256,
+            "docCount": len(self.docs) // 4,
+            "vocab": self.vocab,
+        }
+        counts = array("I", (b - a for a, b in zip(self.starts, self.starts[1:])))
+        body = array("I", self.docs)
+        body.extend(counts)
+        body.extend(self.data)
+        if sys.byteorder != "little":
+            body.byteswap()
+        head = json.dumps(header, ensure_ascii=False, separators=(",", ":"))
+        return gzip.compress(
+            head.encode("utf-8") + b"\n" + body.tobytes(), compresslevel=6, mtime=0
+        )
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> Segment | None:
+        """Decode ``to_bytes`` output (None if corrupt or from another version)."""
+        try:
+            head, _, tail = gzip.decompress(raw).partition(b"\n")
+            header = json.loads(head)
+            body = array("I")
+            body.frombytes(tail)
+        except (OSError, ValueError, EOFError):
+            return None
+        if not isinstance(header, dict) or header.get("version") != SEGMENT_VERSION:
+            return None
+        if sys.byteorder != "little":
+            body.byteswap()
+        n_docs = header["docCount"] * 4
+        n_terms = len(header["vocab"])
+        return cls(
+            header["book"],
+            header["sha256"],
+            body[:n_docs],
+            header["vocab"],
+            body[n_docs : n_docs + n_terms],
+            body[n_docs + n_terms :],
+        )
+
+
+def build_segment(book: JsonObject, sha256: str) -> Segment:
+    """Tokenize one book's verses, headings and footnotes into a segment."""
+    docs = array("I")
+    occurrences: dict[str, list[int]] = {}
+
+    def add(text: str, chapter: int, verse: int, field: int, kind: int) -> None:
+        tokens = tokenize(text)
+        if not tokens:
+            return
+        doc = len(docs) // 4
+        docs.extend((chapter, verse, field, kind))
+        for position, (term, word) in enumerate(tokens):
+            occurrences.setdefault(term, []).extend((doc, position, word))
+
+    for chapter in book.get("chapters", []):
+        number = chapter["number"]
+        for item in chapter.get("content", []):
+            is_verse = item.get("kind") == "verse"
+            verse = item.get("number", 0) if is_verse else 0
+            for field, lang in enumerate(FIELDS):
+                add(item.get(lang) or "", number, verse, field, 0 if is_verse else 1)
+                if is_verse:
+                    for fn in (item.get("footnotes") or {}).get(lang, []):
+                        add(fn.get("text") or "", number, verse, field, 2)
+
+    vocab = sorted(occurrences)
+    data = array("I")
+    for term in vocab:
+        data.extend(occurrences[term])
+    counts = (len(occurrences[term]) // 3 for term in vocab)
+    return Segment(book["id"], sha256, docs, vocab, counts, data)
+
+
+def _segment_path(index_dir: Path, book_id: str) -> Path:
+    return index_dir / f"{book_id}.seg.gz"
+
+
+# ── Index ─────────────────────────────────────────────────────────
+
+
+class SearchIndex:
+    """All book segments in memory; ``refresh`` keeps them in step with data/."""
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = data_dir
+        self.index_dir = data_dir / SEARCH_DIR_NAME
+        self.segments: dict[str, Segment] = {}
+
+    def refresh(self, force: bool = False) -> list[str]:
+        """Rebuild the segments of new/changed books and drop removed ones.
+
+        Returns:
+            Ids of books whose segments were (re)built or removed.
+        """
+        manifest, _ = reindex(self.data_dir)
+        self.index_dir.mkdir(exist_ok=True)
+        changed: list[str] = []
+        live: dict[str, Segment] = {}
+
+        for entry in manifest["books"]:
+            book_id = entry["id"]
+            segment = self.segments.get(book_id)
+            if force or segment is None or segment.sha256 != entry["sha256"]:
+                path = _segment_path(self.index_dir, book_id)
+                segment = None
+                if not force and path.exists():
+                    segment = Segment.from_bytes(path.read_bytes())
+                if segment is None or segment.sha256 != entry["sha256"]:
+                    segment = build_segment(load_book(self.data_dir, book_id), entry["sha256"])
+                    atomic_write_bytes(path, segment.to_bytes())
+                    changed.append(book_id)
+            live[book_id] = segment
+
+        for path in self.index_dir.glob("*.seg.gz"):
+            book_id = path.name.removesuffix(".seg.gz")
+            if book_id not in live:
+                path.unlink()
+                changed.append(book_id)
+        self.segments = live
+        return changed
+
+    def load(self) -> list[str]:
+        """Read the segments already on disk, writing nothing.
+
+        Only books listed in ``index.json`` are searched.
+
+        Returns:
+            Ids of listed books with no segment or with one built from an
+            older version of the book.
+        """
+        stale: list[str] = []
+        live: dict[str, Segment] = {}
+        for entry in sorted(load_manifest(self.data_dir).values(), key=lambda e: e["id"]):
+            book_id = entry["id"]
+            path = _segment_path(self.index_dir, book_id)
+            segment = Segment.from_bytes(path.read_bytes()) if path.exists() else None
+            if segment is None:
+                stale.append(book_id)
+                continue
+            if segment.sha256 != entry.get("sha256"):
+                stale.append(book_id)
+            live[book_id] = segment
+        self.segments = live
+        return stale
+
+    # ── queries ────────────────────────────────────────────────────
+
+    def term(self, text: str) -> list[Hit]:
+        """Occurrences of one term (several terms after normalization → phrase)."""
+        terms = query_terms(text)
+        if len(terms) != 1:
+            return self.phrase(text)
+        return [
+            seg.hit(doc, word)
+            for seg in self.segments.values()
+            for doc, _, word in seg.postings(terms[0])
+        ]
+
+    def prefix(self, text: str) -> list[Hit]:
+        """Occurrences of every term starting with ``text`` (normalized)."""
+        terms = query_terms(text)
+        if len(terms) != 1:
+            return []
+        stem = terms[0]
+        hits: list[Hit] = []
+        for seg in self.segments.values():
+            postings: list[tuple[int, int, int]] = []
+            for i in range(bisect_left(seg.vocab, stem), len(seg.vocab)):
+                if not seg.vocab[i].startswith(stem):
+                    break
+                postings.extend(seg.postings(seg.vocab[i]))
+            postings.sort()
+            hits.extend(seg.hit(doc, word) for doc, _, word in postings)
+        return hits
+
+    def phrase(self, text: str) -> list[Hit]:
+        """Places where the terms of ``text`` occur consecutively; hits point at the first word."""
+        terms = query_terms(text)
+        if not terms:
+            return []
+        hits: list[Hit] = []
+        for seg in self.segments.values():
+            lists = [seg.postings(term) for term in terms]
+            if not all(lists):
+                continue
+            rest = [{(doc, pos) for doc, pos, _ in postings} for postings in lists[1:]]
+            hits.extend(
+                seg.hit(doc, word)
+                for doc, pos, word in lists[0]
+                if all((doc, pos + i) in later for i, later in enumerate(rest, 1))
+            )
+        return hits
+
+    def all_terms(self, text: str) -> list[Hit]:
+        """Docs containing every term; one hit (first term's first word) per doc."""
+        terms = query_terms(text)
+        if not terms:
+            return []
+        hits: list[Hit] = []
+        for seg in self.segments.values():
+            lists = [seg.postings(term) for term in terms]
+            if not all(lists):
+                continue
+            docs = set.intersection(*({doc for doc, _, _ in postings} for postings in lists))
+            seen: set[int] = set()
+            for doc, _, word in lists[0]:
+                if doc in docs and doc not in seen:
+                    seen.add(doc)
+                    hits.append(seg.hit(doc, word))
+        return hits
+
+    def search(self, query: str) -> list[Hit]:
+        """``"a phrase"``, ``prefix*``, ``term`` or ``several terms`` (all in one doc)."""
+        query = query.strip()
+        if len(query) > 1 and query[0] == query[-1] == '"':
+            return self.phrase(query[1:-1])
+        if query.endswith("*"):
+            return self.prefix(query[:-1])
+        if len(query.split()) > 1:
+            return self.all_terms(query)
+        return self.term(query)
+
+
+def open_index(data_dir: Path, force: bool = False) -> SearchIndex:
+    """Load the index for ``data_dir``, bringing it up to date first."""
+    index = SearchIndex(data_dir)
+    index.refresh(force)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data",
+        help="directory holding the book files (default: data/)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="create or incrementally update the index")
+    build.add_argument("--force", action="store_true", help="re-tokenize every book")
+    query = sub.add_parser("query", help="search the index")
+    query.add_argument("query")
+    query.add_argument("--limit", type=int, default=20, help="hits to print (default: 20)")
+    query.add_argument(
+        "--refresh", action="store_true", help="bring the index up to date before searching"
+    )
+    args = parser.parse_args()
+
+    index = SearchIndex(args.data)
+    start = time.perf_counter()
+    if args.command == "build":
+        changed = index.refresh(force=args.force)
+        for book_id in changed:
+            print(f"  ✓ {book_id}")
+        print(
+            f"{len(index.segments)} books indexed, {len(changed)} updated "
+            f"({time.perf_counter() - start:.2f}s) → {index.index_dir}"
+        )
+        raise SystemExit(0)
+
+    if args.refresh:
+        index.refresh()
+    else:
+        stale = index.load()
+        if not index.segments:
+            print(f"ERROR: no search index in {index.index_dir}; run `build` or pass --refresh")
+            raise SystemExit(1)
+        if stale:
+            print(
+                f"  ⚠ {len(stale)} book(s) changed or added since the index was built "
+                f"({', '.join(stale[:5])}{', …' if len(stale) > 5 else ''}); "
+                "pass --refresh to update it",
+                file=sys.stderr,
+            )
+
+    start = time.perf_counter()
+    hits = index.search(args.query)
+    elapsed = time.perf_counter() - start
+    for hit in hits[: args.limit]:
+        verse = f":{hit.verse}" if hit.verse is not None else " (heading)"
+        note = " [footnote]" if hit.kind == "footnote" else ""
+        print(f"  {hit.book} {hit.chapter}{verse}  {hit.field} word {hit.word}{note}")
+    more = f" (showing {args.limit})" if len(hits) > args.limit else ""
+    print(f"{len(hits)} hits in {elapsed * 1000:.3f} ms{more}")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic Armenian/English DOCX pair for importer benchmarks.
+
+Builds the same WordprocessingML structures ``import_docx.py`` reads —
+body ``w:p`` paragraphs made of ``w:r``/``w:t`` runs, inline
+``w:footnoteReference`` runs backed by ``word/footnotes.xml``, and
+``w:pPr/w:ind`` indentation — laid out as books (uppercase title followed
+by chapter ``1``), chapter-number paragraphs, uppercase section headings
+and multi-verse text paragraphs.  The same seed always yields the same
+bytes, so benchmark runs are comparable.
+
+Usage:
+    python3 scripts/synth_docx.py OUT_DIR [--books N] [--chapters N]
+        [--verses N] [--footnotes-per-chapter N] [--seed N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from import_docx import WML
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/footnotes.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"/>
+</Types>"""
+
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/footnotes" Target="footnotes.xml"/>
+</Relationships>"""
+
+# Separator footnotes every real DOCX carries; the importer must skip them.
+SEPARATOR_FOOTNOTES = (
+    '<w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+    '<w:footnote w:type="continuationSeparator" w:id="0"><w:p><w:r><w:continuationSeparator/></w:r></w:p></w:footnote>'
+)
+
+ENGLISH_LOWER = "abcdefghijklmnopqrstuvwxyz"
+# Armenian small letters ayb..feh (U+0561–U+0586); generated, not real text.
+ARMENIAN_LOWER = "".join(chr(cp) for cp in range(0x0561, 0x0587))
+
+
+@dataclass(frozen=True)
+class SynthSpec:
+    """Shape of one synthetic corpus."""
+
+    books: int = 4
+    chapters: int = 8
+    verses: int = 20
+    footnotes_per_chapter: int = 6
+    headings_per_chapter: int = 1
+    verses_per_paragraph: int = 3
+    seed: int = 1
+
+    def scaled(self, factor: int) -> SynthSpec:
+        """Same shape with ``factor`` times as many books."""
+        return SynthSpec(
+            books=self.books * factor,
+            chapters=self.chapters,
+            verses=self.verses,
+            footnotes_per_chapter=self.footnotes_per_chapter,
+            headings_per_chapter=self.headings_per_chapter,
+            verses_per_paragraph=self.verses_per_paragraph,
+            seed=self.seed,
+        )
+
+
+class _DocBuilder:
+    """Accumulates document/footnote XML fragments for one language."""
+
+    def __init__(self, alphabet: str, rng: random.Random) -> None:
+        self.alphabet = alphabet
+        self.rng = rng
+        self.body: list[str] = []
+        self.notes: list[str] = []
+        self.next_note_id = 1
+
+    def word(self) -> str:
+        return "".join(self.rng.choices(self.alphabet, k=self.rng.randint(2, 9)))
+
+    def words(self, count: int) -> str:
+        return " ".join(self.word() for _ in range(count))
+
+    def plain(self, text: str, ind: str = "") -> None:
+        ppr = f"<w:pPr>{ind}</w:pPr>" if ind else ""
+        self.body.append(f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>')
+
+    def footnote_run(self) -> str:
+        note_id = self.next_note_id
+        self.next_note_id += 1
+        self.notes.append(
+            f'<w:footnote w:id="{note_id}"><w:p><w:r><w:t>{escape(self.words(6))}</w:t></w:r></w:p></w:footnote>'
+        )
+        return f'<w:r><w:footnoteReference w:id="{note_id}"/></w:r>'
+
+    def document_xml(self) -> bytes:
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{WML}"><w:body>{"".join(self.body)}'
+            f'<w:sectPr/></w:body></w:document>'
+        ).encode("utf-8")
+
+    def footnotes_xml(self) -> bytes:
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:footnotes xmlns:w="{WML}">{SEPARATOR_FOOTNOTES}{"".join(self.notes)}</w:footnotes>'
+        ).encode("utf-8")
+
+
+def _build(spec: SynthSpec, alphabet: str, salt: int) -> _DocBuilder:
+    # Structure (headings, notes, indents) comes from a seed shared by both
+    # languages so the pair stays parallel; only the words differ.
+    rng = random.Random(spec.seed)
+    doc = _DocBuilder(alphabet, random.Random(spec.seed * 1000 + salt))
+    for _book in range(spec.books):
+        doc.plain(doc.words(2).upper())
+        for ch in range(1, spec.chapters + 1):
+            doc.plain(str(ch))
+            heading_at = {
+                rng.randint(1, spec.verses) for _ in range(spec.headings_per_chapter)
+            }
+            note_at = {
+                rng.randint(1, spec.verses) for _ in range(spec.footnotes_per_chapter)
+            }
+            runs: list[str] = []
+            ind = ""
+
+            def flush() -> None:
+                if runs:
+                    ppr = f"<w:pPr>{ind}</w:pPr>" if ind else ""
+                    doc.body.append(f"<w:p>{ppr}{''.join(runs)}</w:p>")
+                    runs.clear()
+
+            for verse in range(1, spec.verses + 1):
+                if verse in heading_at:
+                    flush()
+                    doc.plain(doc.words(3).upper())
+                if not runs:
+                    # Mix of plain, first-line, hanging and poetry-style indents.
+                    ind = rng.choice(
+                        (
+                            "",
+                            '<w:ind w:firstLine="360"/>',
+                            '<w:ind w:left="720" w:hanging="360"/>',
+                            '<w:ind w:left="720"/>',
+                            '<w:ind w:leftChars="200" w:firstLineChars="100"/>',
+                        )
+                    )
+                text = f"{verse} {doc.words(doc.rng.randint(6, 24))}"
+                if verse in note_at:
+                    cut = text.rfind(" ", 0, len(text) // 2 + 1)
+                    runs.append(f'<w:r><w:t xml:space="preserve">{escape(text[:cut])}</w:t></w:r>')
+                    runs.append(doc.footnote_run())
+                    runs.append(f'<w:r><w:t xml:space="preserve">{escape(text[cut:])} </w:t></w:r>')
+                else:
+                    runs.append(f'<w:r><w:t xml:space="preserve">{escape(text)} </w:t></w:r>')
+                if verse % spec.verses_per_paragraph == 0:
+                    flush()
+            flush()
+    return doc
+
+
+def write_docx(path: Path, doc: _DocBuilder) -> None:
+    parts = (
+        ("[Content_Types].xml", CONTENT_TYPES.encode("utf-8")),
+        ("_rels/.rels", ROOT_RELS.encode("utf-8")),
+        ("word/_rels/document.xml.rels", DOCUMENT_RELS.encode("utf-8")),
+        ("word/document.xml", doc.document_xml()),
+        ("word/footnotes.xml", doc.footnotes_xml()),
+    )
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in parts:
+            # Fixed timestamps keep the archive bytes reproducible.
+            info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, data)
+
+
+def generate_pair(spec: SynthSpec, out_dir: Path) -> tuple[Path, Path]:
+    """Write ``synthetic-armenian.docx`` + ``synthetic-english.docx`` into out_dir."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    arm_path = out_dir / "synthetic-armenian.docx"
+    eng_path = out_dir / "synthetic-english.docx"
+    write_docx(arm_path, _build(spec, ARMENIAN_LOWER, salt=1))
+    write_docx(eng_path, _build(spec, ENGLISH_LOWER, salt=2))
+    return arm_path, eng_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--books", type=int, default=SynthSpec.books)
+    parser.add_argument("--chapters", type=int, default=SynthSpec.chapters)
+    parser.add_argument("--verses", type=int, default=SynthSpec.verses)
+    parser.add_argument(
+        "--footnotes-per-chapter", type=int, default=SynthSpec.footnotes_per_chapter
+    )
+    parser.add_argument("--seed", type=int, default=SynthSpec.seed)
+    args = parser.parse_args()
+
+    spec = SynthSpec(
+        books=args.books,
+        chapters=args.chapters,
+        verses=args.verses,
+        footnotes_per_chapter=args.footnotes_per_chapter,
+        seed=args.seed,
+    )
+    for path in generate_pair(spec, args.out_dir):
+        print(f"  ✓ {path} ({path.stat().st_size} bytes)")
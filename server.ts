@@ -12,33 +12,337 @@ import {
   existsSync,
   mkdirSync,
   renameSync,
+  rmSync,
+  statSync,
+  unlinkSync,
 } from 'node:fs';
-import { join, resolve } from 'node:path';
+import { basename, dirname, join, resolve } from 'node:path';
+import {
+  expandBook,
+  expandBookText,
+  expandChapter,
+  isCompactText,
+  serializeBook,
+} from './src/lib/bookFormat';
 
 const PORT = parseInt(process.env['PORT'] ?? '3000', 10);
 const DATA_DIR = resolve(import.meta.dir, 'data');
 const DIST_DIR = resolve(import.meta.dir, 'dist');
 
+/** Books manifest written by scripts/book_index.py (and the importer). */
+const MANIFEST_FILE = 'index.json';
+const MANIFEST_ID = 'index';
+/** Sharded books live in data/<id>/ as meta.json + <chapter>.json (scripts/book_shards.py). */
+const SHARD_META = 'meta.json';
+
 if (!existsSync(DATA_DIR)) {
   mkdirSync(DATA_DIR, { recursive: true });
 }
 
-async function handleApi(req: Request): Promise<Response | null> {
-  const url = new URL(req.url);
-  const path = url.pathname;
+interface ManifestEntry {
+  id: string;
+  file: string;
+  name: unknown;
+  chapterCount: number;
+  bytes: number;
+  mtimeNs: string;
+}
 
-  /* GET /api/books — list all books */
-  if (path === '/api/books' && req.method === 'GET') {
-    const files = readdirSync(DATA_DIR).filter((f) => f.endsWith('.json'));
-    const summaries = files.map((f) => {
-      const data = JSON.parse(readFileSync(join(DATA_DIR, f), 'utf-8'));
+function isBookFile(f: string): boolean {
+  return f.endsWith('.json') && !f.startsWith('.') && f !== MANIFEST_FILE;
+}
+
+/**
+ * Book summaries for the sidebar. Taken from data/index.json for every file
+ * whose size and mtime still match its manifest entry; only books edited
+ * since the last reindex (or missing from the manifest) are parsed.
+ */
+function listBooks() {
+  let manifest = new Map<string, ManifestEntry>();
+  try {
+    const raw = JSON.parse(readFileSync(join(DATA_DIR, MANIFEST_FILE), 'utf-8')) as {
+      books?: ManifestEntry[];
+    };
+    manifest = new Map((raw.books ?? []).map((b) => [b.file, b]));
+  } catch {
+    /* no manifest yet — every book is parsed below */
+  }
+
+  const entries = readdirSync(DATA_DIR, { withFileTypes: true });
+  const monolithic = entries.filter((e) => e.isFile() && isBookFile(e.name)).map((e) => e.name);
+  const sharded = entries
+    .filter((e) => e.isDirectory() && isShardedBook(e.name))
+    .map((e) => {
+      const meta = readShardMeta(e.name);
+      return { id: meta.id, name: meta.name, chapterCount: meta.chapters.length };
+    });
+
+  return monolithic
+    .map((f) => {
+      const filePath = join(DATA_DIR, f);
+      const entry = manifest.get(f);
+      if (entry) {
+        const st = statSync(filePath, { bigint: true });
+        if (st.mtimeNs.toString() === entry.mtimeNs && Number(st.size) === entry.bytes) {
+          return { id: entry.id, name: entry.name, chapterCount: entry.chapterCount };
+        }
+      }
+      const data = JSON.parse(readFileSync(filePath, 'utf-8'));
       return {
         id: data.id,
         name: data.name,
         chapterCount: data.chapters.length,
       };
+    })
+    .concat(sharded);
+}
+
+/* ── Sharded book layout ── */
+
+interface ChapterShard {
+  number: number;
+}
+
+/** Write via a sibling temp file + rename so readers never see a partial file. */
+function writeFileAtomic(filePath: string, text: string): void {
+  const tmp = join(dirname(filePath), `.${basename(filePath)}.${process.pid}.tmp`);
+  try {
+    writeFileSync(tmp, text, 'utf-8');
+    renameSync(tmp, filePath);
+  } catch (err) {
+    rmSync(tmp, { force: true });
+    throw err;
+  }
+}
+
+/** A book is sharded when data/<id>/meta.json exists and data/<id>.json does not. */
+function isShardedBook(bookId: string): boolean {
+  return (
+    !bookId.startsWith('.') &&
+    !existsSync(join(DATA_DIR, `${bookId}.json`)) &&
+    existsSync(join(DATA_DIR, bookId, SHARD_META))
+  );
+}
+
+function readShardMeta(bookId: string): { id: string; name: unknown; chapters: number[] } {
+  return JSON.parse(readFileSync(join(DATA_DIR, bookId, SHARD_META), 'utf-8'));
+}
+
+function readShardedBook(bookId: string): string {
+  const meta = readShardMeta(bookId);
+  const chapters = meta.chapters.map((n) =>
+    JSON.parse(readFileSync(join(DATA_DIR, bookId, `${n}.json`), 'utf-8')),
+  );
+  return JSON.stringify({ ...meta, chapters }, null, 2);
+}
+
+interface BookBody {
+  chapters: ChapterShard[];
+}
+
+/**
+ * A whole-book PUT body, or null unless it is a JSON object whose
+ * `chapters` are objects with integer numbers (checked before any write).
+ */
+function parseBookBody(body: string): BookBody | null {
+  let book: unknown;
+  try {
+    book = JSON.parse(body);
+  } catch {
+    return null;
+  }
+  if (typeof book !== 'object' || book === null || Array.isArray(book)) return null;
+  const chapters = (book as { chapters?: unknown }).chapters;
+  if (!Array.isArray(chapters)) return null;
+  const numbered = chapters.every(
+    (c) => typeof c === 'object' && c !== null && Number.isInteger((c as ChapterShard).number),
+  );
+  return numbered ? (book as BookBody) : null;
+}
+
+function writeShardedBook(bookId: string, book: BookBody): void {
+  const dir = join(DATA_DIR, bookId);
+  const numbers = book.chapters.map((c) => c.number);
+  /* Chapters first, so meta.json never lists a shard that isn't there yet */
+  for (const chapter of book.chapters) {
+    writeFileAtomic(
+      join(dir, `${chapter.number}.json`),
+      JSON.stringify(chapter, null, 2),
+    );
+  }
+  writeFileAtomic(
+    join(dir, SHARD_META),
+    JSON.stringify({ ...book, chapters: numbers }, null, 2),
+  );
+  for (const f of readdirSync(dir)) {
+    if (/^\d+\.json$/.test(f) && !numbers.includes(parseInt(f, 10))) {
+      unlinkSync(join(dir, f));
+    }
+  }
+}
+
+/** Chapter JSON text, or null if the book has no such chapter. */
+function readChapter(bookId: string, chapterNumber: number): string | null {
+  if (isShardedBook(bookId)) {
+    if (!readShardMeta(bookId).chapters.includes(chapterNumber)) return null;
+    return readFileSync(join(DATA_DIR, bookId, `${chapterNumber}.json`), 'utf-8');
+  }
+  const filePath = join(DATA_DIR, `${bookId}.json`);
+  if (!existsSync(filePath)) return null;
+  const book = JSON.parse(readFileSync(filePath, 'utf-8')) as {
+    chapters: ChapterShard[];
+    footnoteTexts?: string[];
+  };
+  const chapter = book.chapters.find((c) => c.number === chapterNumber);
+  if (!chapter) return null;
+  return JSON.stringify(expandChapter({ ...chapter }, book.footnoteTexts ?? []), null, 2);
+}
+
+/**
+ * Replace one existing chapter. Sharded books rewrite only that chapter's
+ * file; monolithic books are patched in place (compact ones stay compact).
+ * Returns false if the book has no such chapter (new chapters go through a
+ * whole-book PUT).
+ */
+function writeChapter(bookId: string, chapterNumber: number, body: string): boolean {
+  const chapter = JSON.parse(body) as ChapterShard;
+  if (chapter.number !== chapterNumber) return false;
+  if (isShardedBook(bookId)) {
+    if (!readShardMeta(bookId).chapters.includes(chapterNumber)) return false;
+    writeFileAtomic(
+      join(DATA_DIR, bookId, `${chapterNumber}.json`),
+      JSON.stringify(chapter, null, 2),
+    );
+    return true;
+  }
+  const filePath = join(DATA_DIR, `${bookId}.json`);
+  if (!existsSync(filePath)) return false;
+  const text = readFileSync(filePath, 'utf-8');
+  const book = expandBook(JSON.parse(text)) as { chapters: ChapterShard[] };
+  const index = book.chapters.findIndex((c) => c.number === chapterNumber);
+  if (index < 0) return false;
+  book.chapters[index] = chapter;
+  writeFileAtomic(filePath, serializeBook(book, isCompactText(text)));
+  return true;
+}
+
+/**
+ * Record the saved book in the revision history (scripts/book_revisions.py).
+ * Runs in the background; a failure never fails the save.
+ */
+function recordRevision(bookId: string): void {
+  try {
+    const script = join(import.meta.dir, 'scripts', 'book_revisions.py');
+    Bun.spawn(['python3', script, '--data', DATA_DIR, 'record', bookId], {
+      stdout: 'ignore',
+      stderr: 'ignore',
     });
-    return new Response(JSON.stringify(summaries), {
+  } catch {
+    // python3 missing: saves still work, just without history.
+  }
+}
+
+/* ── Published copies (scripts/publish_data.py) ── */
+
+const PUBLISH_DIR = join(DATA_DIR, '.publish');
+const PUBLISH_ETAGS = join(PUBLISH_DIR, 'etags.json');
+
+interface PublishedVariant {
+  file: string;
+  bytes: number;
+  etag: string;
+}
+
+interface PublishedFile {
+  source: string;
+  sourceBytes: number;
+  sourceMtimeNs: string;
+  variants: Record<string, PublishedVariant>;
+}
+
+let published: { mtimeNs: string; files: Record<string, PublishedFile> } | null = null;
+
+/** The etags.json sidecar, re-read only when it changes. */
+function publishedFiles(): Record<string, PublishedFile> {
+  let mtimeNs: string;
+  try {
+    mtimeNs = statSync(PUBLISH_ETAGS, { bigint: true }).mtimeNs.toString();
+  } catch {
+    return {};
+  }
+  if (published?.mtimeNs !== mtimeNs) {
+    try {
+      const raw = JSON.parse(readFileSync(PUBLISH_ETAGS, 'utf-8')) as {
+        version?: number;
+        files?: Record<string, PublishedFile>;
+      };
+      published = { mtimeNs, files: raw.version === 1 ? (raw.files ?? {}) : {} };
+    } catch {
+      published = { mtimeNs, files: {} };
+    }
+  }
+  return published.files;
+}
+
+/** Content codings the client accepts (those with a nonzero q). */
+function acceptedEncodings(req: Request): Set<string> {
+  const accepted = new Set<string>();
+  for (const part of (req.headers.get('Accept-Encoding') ?? '').split(',')) {
+    const [coding, ...params] = part.trim().split(';');
+    const q = params.map((p) => p.trim()).find((p) => p.startsWith('q='));
+    if (coding && !(q && parseFloat(q.slice(2)) === 0)) accepted.add(coding.toLowerCase());
+  }
+  return accepted;
+}
+
+/**
+ * Serve data/<name> from its published copy while that is current (the data
+ * file still has the size and mtime it was published from): 304 for a
+ * matching If-None-Match, else the smallest precompressed variant the client
+ * accepts. Null when there is no current copy, e.g. after an edit.
+ */
+function publishedResponse(req: Request, name: string): Response | null {
+  const entry = publishedFiles()[name];
+  if (!entry || entry.source !== name) return null;
+  try {
+    const st = statSync(join(DATA_DIR, name), { bigint: true });
+    if (st.mtimeNs.toString() !== entry.sourceMtimeNs || Number(st.size) !== entry.sourceBytes) {
+      return null;
+    }
+  } catch {
+    return null;
+  }
+
+  const ifNoneMatch = (req.headers.get('If-None-Match') ?? '').split(',').map((t) => t.trim());
+  const matched = Object.values(entry.variants).find((v) => ifNoneMatch.includes(v.etag));
+  if (matched) {
+    return new Response(null, {
+      status: 304,
+      headers: { ETag: matched.etag, Vary: 'Accept-Encoding', 'Cache-Control': 'no-cache' },
+    });
+  }
+
+  const accepted = acceptedEncodings(req);
+  const encoding = ['br', 'gzip'].find((e) => entry.variants[e] && accepted.has(e)) ?? 'identity';
+  const variant = entry.variants[encoding];
+  if (!variant) return null;
+  const headers: Record<string, string> = {
+    'Content-Type': 'application/json',
+    ETag: variant.etag,
+    Vary: 'Accept-Encoding',
+    'Cache-Control': 'no-cache',
+  };
+  if (encoding !== 'identity') headers['Content-Encoding'] = encoding;
+  return new Response(Bun.file(join(PUBLISH_DIR, variant.file)), { headers });
+}
+
+async function handleApi(req: Request): Promise<Response | null> {
+  const url = new URL(req.url);
+  const path = url.pathname;
+
+  /* GET /api/books — list all books */
+  if (path === '/api/books' && req.method === 'GET') {
+    return new Response(JSON.stringify(listBooks()), {
       headers: { 'Content-Type': 'application/json' },
     });
   }
@@ -49,14 +353,14 @@ async function handleApi(req: Request): Promise<Response | null> {
       const raw = await req.text();
       const parsed = JSON.parse(raw) as { id?: string };
       const bookId = parsed.id;
-      if (!bookId || !/^[a-z0-9_-]+$/.test(bookId)) {
+      if (!bookId || !/^[a-z0-9_-]+$/.test(bookId) || bookId === MANIFEST_ID) {
         return new Response(JSON.stringify({ error: 'Invalid book id' }), {
           status: 400,
           headers: { 'Content-Type': 'application/json' },
         });
       }
       const filePath = join(DATA_DIR, `${bookId}.json`);
-      if (existsSync(filePath)) {
+      if (existsSync(filePath) || isShardedBook(bookId)) {
         return new Response(JSON.stringify({ error: 'Book already exists' }), {
           status: 409,
           headers: { 'Content-Type': 'application/json' },
@@ -75,15 +379,63 @@ async function handleApi(req: Request): Promise<Response | null> {
     }
   }
 
+  /* GET/PUT /api/books/:id/chapters/:n — one chapter at a time */
+  const chapterMatch = path.match(/^\/api\/books\/([a-z0-9_-]+)\/chapters\/(\d+)$/);
+  if (chapterMatch && chapterMatch[1] !== MANIFEST_ID) {
+    const bookId = chapterMatch[1]!;
+    const chapterNumber = parseInt(chapterMatch[2]!, 10);
+
+    if (req.method === 'GET') {
+      const text = readChapter(bookId, chapterNumber);
+      if (text !== null) {
+        return new Response(text, {
+          headers: { 'Content-Type': 'application/json' },
+        });
+      }
+      return new Response(JSON.stringify({ error: 'Not found' }), {
+        status: 404,
+        headers: { 'Content-Type': 'application/json' },
+      });
+    }
+
+    if (req.method === 'PUT') {
+      try {
+        if (writeChapter(bookId, chapterNumber, await req.text())) {
+          recordRevision(bookId);
+          return new Response(JSON.stringify({ ok: true }), {
+            headers: { 'Content-Type': 'application/json' },
+          });
+        }
+        return new Response(JSON.stringify({ error: 'Not found' }), {
+          status: 404,
+          headers: { 'Content-Type': 'application/json' },
+        });
+      } catch {
+        return new Response(JSON.stringify({ error: 'Invalid JSON body' }), {
+          status: 400,
+          headers: { 'Content-Type': 'application/json' },
+        });
+      }
+    }
+  }
+
   /* GET/PUT /api/books/:id */
   const match = path.match(/^\/api\/books\/([a-z0-9_-]+)$/);
-  if (match) {
+  if (match && match[1] !== MANIFEST_ID) {
     const bookId = match[1]!;
     const filePath = join(DATA_DIR, `${bookId}.json`);
+    const sharded = isShardedBook(bookId);
 
     if (req.method === 'GET') {
+      if (sharded) {
+        return new Response(readShardedBook(bookId), {
+          headers: { 'Content-Type': 'application/json' },
+        });
+      }
+      const publishedRes = publishedResponse(req, `${bookId}.json`);
+      if (publishedRes) return publishedRes;
       if (existsSync(filePath)) {
-        return new Response(readFileSync(filePath, 'utf-8'), {
+        return new Response(expandBookText(readFileSync(filePath, 'utf-8')), {
           headers: { 'Content-Type': 'application/json' },
         });
       }
@@ -95,17 +447,34 @@ async function handleApi(req: Request): Promise<Response | null> {
 
     if (req.method === 'PUT') {
       const body = await req.text();
-      writeFileSync(filePath, body, 'utf-8');
+      const book = parseBookBody(body);
+      if (!book) {
+        return new Response(JSON.stringify({ error: 'Invalid JSON body' }), {
+          status: 400,
+          headers: { 'Content-Type': 'application/json' },
+        });
+      }
+      if (sharded) {
+        writeShardedBook(bookId, book);
+      } else if (existsSync(filePath) && isCompactText(readFileSync(filePath, 'utf-8'))) {
+        writeFileAtomic(filePath, serializeBook(book, true));
+      } else {
+        writeFileAtomic(filePath, body);
+      }
+      recordRevision(bookId);
       return new Response(JSON.stringify({ ok: true }), {
         headers: { 'Content-Type': 'application/json' },
       });
     }
 
     if (req.method === 'DELETE') {
-      if (existsSync(filePath)) {
+      if (sharded || existsSync(filePath)) {
         const trashDir = join(DATA_DIR, '.trash');
         if (!existsSync(trashDir)) mkdirSync(trashDir, { recursive: true });
-        renameSync(filePath, join(trashDir, `${bookId}.json`));
+        /* Only the latest deletion of a book is kept in the trash */
+        const trashPath = join(trashDir, sharded ? bookId : `${bookId}.json`);
+        rmSync(trashPath, { recursive: true, force: true });
+        renameSync(sharded ? join(DATA_DIR, bookId) : filePath, trashPath);
         return new Response(JSON.stringify({ ok: true }), {
           headers: { 'Content-Type': 'application/json' },
         });
@@ -1,4 +1,4 @@
-import type { BookSummary, BookData } from './types';
+import type { BookSummary, BookData, Chapter } from './types';
 
 const API_BASE = '/api';
 const MAX_RETRIES = 3;
@@ -50,6 +50,21 @@ export async function saveBook(book: BookData): Promise<void> {
   if (!res.ok) throw new Error(`Failed to save book ${book.id}: ${res.statusText}`);
 }
 
+/* Save one existing chapter; the server rewrites only that chapter's shard */
+export async function saveChapter(bookId: string, chapter: Chapter): Promise<void> {
+  const res = await fetchWithRetry(
+    `${API_BASE}/books/${encodeURIComponent(bookId)}/chapters/${chapter.number}`,
+    {
+      method: 'PUT',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(chapter, null, 2),
+    },
+  );
+  if (!res.ok) {
+    throw new Error(`Failed to save chapter ${chapter.number} of ${bookId}: ${res.statusText}`);
+  }
+}
+
 export async function createBook(book: BookData): Promise<void> {
   const res = await fetchWithRetry(`${API_BASE}/books`, {
     method: 'POST',
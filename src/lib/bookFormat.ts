@@ -0,0 +1,195 @@
+/* ── Compact book file format ("format": "compact-1") ──
+ *
+ * TypeScript twin of `scripts/book_compact.py`, used by the API servers to
+ * read and write `data/<id>.json` files stored in the compact layout: no
+ * indentation, a per-book `footnoteTexts` table that footnotes point into as
+ * `[id, textIndex, anchorWord]`, no `kind` on verses and headings, and no
+ * empty texts or footnote lists.  Items not in the importer's key order keep
+ * `kind` and are stored verbatim, so expanding a compacted book gives back
+ * the same JSON, key order included.  Keep the two implementations in step.
+ */
+
+type Json = Record<string, unknown>;
+
+export const COMPACT_FORMAT = 'compact-1';
+
+const TEXT_FIELDS = ['armenian', 'english', 'classical'] as const;
+const VERSE_HEAD = ['kind', 'number', ...TEXT_FIELDS];
+const HEADING_HEAD = ['kind', ...TEXT_FIELDS];
+const FOOTNOTE_KEYS = ['id', 'text', 'anchorWord'];
+
+function isObject(value: unknown): value is Json {
+  return typeof value === 'object' && value !== null && !Array.isArray(value);
+}
+
+function sameKeys(actual: string[], expected: readonly string[]): boolean {
+  return actual.length === expected.length && actual.every((key, i) => key === expected[i]);
+}
+
+function isTextField(key: string): boolean {
+  return (TEXT_FIELDS as readonly string[]).includes(key);
+}
+
+/** True if a book file's text is in the compact format (the "format" key comes first). */
+export function isCompactText(text: string): boolean {
+  return text.startsWith('{"format":"compact-');
+}
+
+export function isCompactBook(book: unknown): boolean {
+  return isObject(book) && book['format'] === COMPACT_FORMAT;
+}
+
+/* ── Compacting ── */
+
+class TextTable {
+  readonly texts: string[] = [];
+  private readonly index = new Map<string, number>();
+
+  add(text: string): number {
+    let i = this.index.get(text);
+    if (i === undefined) {
+      i = this.texts.length;
+      this.index.set(text, i);
+      this.texts.push(text);
+    }
+    return i;
+  }
+}
+
+function compactFootnote(footnote: Json, table: TextTable): unknown {
+  if (sameKeys(Object.keys(footnote), FOOTNOTE_KEYS) && typeof footnote['text'] === 'string') {
+    return [footnote['id'], table.add(footnote['text']), footnote['anchorWord']];
+  }
+  return footnote;
+}
+
+function compactVerse(item: Json, table: TextTable): Json | null {
+  const keys = Object.keys(item);
+  if (!sameKeys(keys.slice(0, 5), VERSE_HEAD) || !keys.includes('footnotes')) return null;
+  // Extra-language texts sit between classical and footnotes.
+  const extra = keys.slice(5, keys.indexOf('footnotes'));
+  const footnotes = item['footnotes'];
+  if (
+    !isObject(footnotes) ||
+    !sameKeys(Object.keys(footnotes), [...TEXT_FIELDS, ...extra]) ||
+    !Object.values(footnotes).every((fns) => Array.isArray(fns) && fns.every(isObject))
+  ) {
+    return null;
+  }
+
+  const compact: Json = {};
+  for (const [key, value] of Object.entries(item)) {
+    if (key === 'kind' || (isTextField(key) && value === '')) continue;
+    if (key === 'footnotes') {
+      const lists: Json = {};
+      for (const [lang, fns] of Object.entries(footnotes) as [string, Json[]][]) {
+        if (fns.length > 0 || !isTextField(lang)) {
+          lists[lang] = fns.map((fn) => compactFootnote(fn, table));
+        }
+      }
+      if (Object.keys(lists).length > 0) compact[key] = lists;
+      continue;
+    }
+    compact[key] = value;
+  }
+  return compact;
+}
+
+function compactHeading(item: Json): Json | null {
+  const keys = Object.keys(item);
+  if (!sameKeys(keys.slice(0, 4), HEADING_HEAD) || keys.includes('number')) return null;
+  const compact: Json = {};
+  for (const [key, value] of Object.entries(item)) {
+    if (key === 'kind' || (isTextField(key) && value === '')) continue;
+    compact[key] = value;
+  }
+  return compact;
+}
+
+/** The compact form of an expanded book (which is left untouched). */
+export function compactBook(book: Json): Json {
+  const table = new TextTable();
+  const chapters = (book['chapters'] as Json[]).map((chapter) => {
+    if (!Array.isArray(chapter['content'])) return chapter;
+    const content = (chapter['content'] as unknown[]).map((item) => {
+      if (!isObject(item)) return item;
+      let compact: Json | null = null;
+      if (item['kind'] === 'verse') compact = compactVerse(item, table);
+      else if (item['kind'] === 'heading') compact = compactHeading(item);
+      return compact ?? item;
+    });
+    return { ...chapter, content };
+  });
+
+  const compact: Json = { format: COMPACT_FORMAT };
+  for (const [key, value] of Object.entries(book)) {
+    if (key === 'chapters') compact['footnoteTexts'] = table.texts;
+    compact[key] = key === 'chapters' ? chapters : value;
+  }
+  return compact;
+}
+
+/* ── Expanding ── */
+
+function expandFootnotes(footnotes: Json, texts: string[]): Json {
+  const lists: Json = {};
+  for (const lang of TEXT_FIELDS) lists[lang] = footnotes[lang] ?? [];
+  Object.assign(lists, footnotes);
+  const expanded: Json = {};
+  for (const [lang, fns] of Object.entries(lists)) {
+    expanded[lang] = (fns as unknown[]).map((fn) => {
+      if (!Array.isArray(fn)) return fn;
+      const [id, textIndex, anchorWord] = fn as [unknown, number, unknown];
+      return { id, text: texts[textIndex], anchorWord };
+    });
+  }
+  return expanded;
+}
+
+function expandItem(item: Json, texts: string[]): Json {
+  if ('kind' in item) return item;
+  const isVerse = 'number' in item;
+  const expanded: Json = { kind: isVerse ? 'verse' : 'heading' };
+  if (isVerse) expanded['number'] = item['number'];
+  for (const field of TEXT_FIELDS) expanded[field] = item[field] ?? '';
+  if (isVerse && !('footnotes' in item)) {
+    expanded['footnotes'] = { armenian: [], english: [], classical: [] };
+  }
+  for (const [key, value] of Object.entries(item)) {
+    if (key === 'footnotes') expanded[key] = expandFootnotes(value as Json, texts);
+    else if (!(key in expanded)) expanded[key] = value;
+  }
+  return expanded;
+}
+
+/** One chapter of a compact book in the expanded shape. */
+export function expandChapter(chapter: Json, texts: string[]): Json {
+  if (!Array.isArray(chapter['content'])) return chapter;
+  return {
+    ...chapter,
+    content: (chapter['content'] as Json[]).map((item) => expandItem(item, texts)),
+  };
+}
+
+/** The expanded form of a book; books that are not compact are returned as is. */
+export function expandBook(book: Json): Json {
+  if (!isCompactBook(book)) return book;
+  const texts = book['footnoteTexts'] as string[];
+  const expanded: Json = {};
+  for (const [key, value] of Object.entries(book)) {
+    if (key === 'format' || key === 'footnoteTexts') continue;
+    expanded[key] =
+      key === 'chapters' ? (value as Json[]).map((c) => expandChapter(c, texts)) : value;
+  }
+  return expanded;
+}
+
+/** A book file's text in the expanded shape (text that is not compact is returned as is). */
+export function expandBookText(text: string): string {
+  return isCompactText(text) ? JSON.stringify(expandBook(JSON.parse(text) as Json)) : text;
+}
+
+/** File text for an expanded book: compact, or indented like the importer's output. */
+export function serializeBook(book: object, compact: boolean): string {
+  return compact ? JSON.stringify(compactBook(book as Json)) : JSON.stringify(book, null, 2);
+}
@@ -0,0 +1,126 @@
+/* ── Poetry line breaking (clause-based) ──
+ *
+ * Splits a verse into poetry lines at punctuation: every word ending in
+ * strong punctuation closes a line, then each resulting clause is split once
+ * more at the punctuated word nearest its character midpoint.
+ *
+ * `scripts/poetry_breaks.py` is a Python port of this algorithm that stores
+ * the result as `poetryBreaks` on poetry verses; keep the two in step
+ * (`python3 scripts/poetry_breaks.py --parity` compares them on the corpus).
+ */
+
+import type { UILanguage } from './types';
+
+// Strong punctuation indicates multi-couplet boundaries
+const ENGLISH_STRONG_RE = /[.;:!?]|\u2014/u;
+const ARMENIAN_STRONG_RE = /[.;:!?\u0589]/u;
+// All punctuation (including commas) — used for midpoint breaks
+const ENGLISH_ANY_PUNCT_RE = /[.;:,!?]|\u2014/u;
+const ARMENIAN_ANY_PUNCT_RE = /[.,:;!?\u0589\u055d]/u;
+
+interface Token {
+  text: string;
+  isWord: boolean;
+}
+
+function strongPunctRe(lang: UILanguage): RegExp {
+  return lang === 'english' ? ENGLISH_STRONG_RE : ARMENIAN_STRONG_RE;
+}
+function anyPunctRe(lang: UILanguage): RegExp {
+  return lang === 'english' ? ENGLISH_ANY_PUNCT_RE : ARMENIAN_ANY_PUNCT_RE;
+}
+
+/** Words and the whitespace runs between them, in order. */
+function tokenize(text: string): Token[] {
+  return text
+    .split(/(\s+)/)
+    .filter((token) => token.length > 0)
+    .map((token) => ({ text: token, isWord: !/^\s+$/.test(token) }));
+}
+
+/** Find the index (within `parts`) of the last real word token. */
+function lastWordIdx(parts: Token[]): number {
+  for (let i = parts.length - 1; i >= 0; i -= 1) {
+    if (parts[i]?.isWord) return i;
+  }
+  return -1;
+}
+
+/**
+ * Find the word-token index in `parts[start..end)` whose cumulative
+ * character position is closest to the character midpoint of that range.
+ * Only considers tokens matching `re`.  Ignores the very last word
+ * (end-of-verse punctuation shouldn't trigger a break).
+ */
+function nearestPunctToMid(parts: Token[], start: number, end: number, re: RegExp): number {
+  const lastWord = lastWordIdx(parts.slice(start, end));
+  let totalChars = 0;
+  for (let i = start; i < end; i += 1) totalChars += (parts[i]?.text ?? '').length;
+  const mid = totalChars / 2;
+
+  let cum = 0;
+  let bestIdx = -1;
+  let bestDist = Infinity;
+  for (let i = start; i < end; i += 1) {
+    cum += (parts[i]?.text ?? '').length;
+    const seg = parts[i];
+    if (!seg?.isWord) continue;
+    if (i - start === lastWord) continue; // skip last word
+    if (!re.test(seg.text)) continue;
+    const dist = Math.abs(cum - mid);
+    if (dist < bestDist) {
+      bestDist = dist;
+      bestIdx = i;
+    }
+  }
+  return bestIdx;
+}
+
+/**
+ * 1-based indices (as in footnote `anchorWord`) of the words that end a
+ * poetry line, ascending.  The verse's last word is never included, so an
+ * empty list means a single line.
+ */
+export function poetryBreakWords(text: string, lang: UILanguage): number[] {
+  const parts = tokenize(text);
+  const strong = strongPunctRe(lang);
+  const any = anyPunctRe(lang);
+  const lastWord = lastWordIdx(parts);
+
+  // 1. Collect strong-punctuation break indices (skip last word)
+  const strongBreaks: number[] = [];
+  for (let i = 0; i < parts.length; i += 1) {
+    const seg = parts[i];
+    if (!seg?.isWord || i === lastWord) continue;
+    if (strong.test(seg.text)) strongBreaks.push(i);
+  }
+
+  // 2. Build ranges separated by strong breaks
+  type Range = { start: number; end: number };
+  const ranges: Range[] = [];
+  let rangeStart = 0;
+  for (const bi of strongBreaks) {
+    ranges.push({ start: rangeStart, end: bi + 1 });
+    rangeStart = bi + 1;
+  }
+  if (rangeStart < parts.length) {
+    ranges.push({ start: rangeStart, end: parts.length });
+  }
+
+  // 3. For each range, find the weak punct nearest the midpoint
+  const allBreaks = new Set(strongBreaks);
+  for (const r of ranges) {
+    const midIdx = nearestPunctToMid(parts, r.start, r.end, any);
+    if (midIdx >= 0) allBreaks.add(midIdx);
+  }
+
+  // 4. Token indices → word numbers
+  const breakWords: number[] = [];
+  let wordIndex = 0;
+  for (let i = 0; i < parts.length; i += 1) {
+    if (!parts[i]?.isWord) continue;
+    wordIndex += 1;
+    if (allBreaks.has(i)) breakWords.push(wordIndex);
+  }
+  return breakWords;
+}
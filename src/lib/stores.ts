@@ -2,6 +2,7 @@ import { writable, derived, get } from 'svelte/store';
 import type {
   BookSummary,
   BookData,
+  Chapter,
   UILanguage,
   VerseFootnotes,
   WordFootnote,
@@ -10,7 +11,12 @@ import type {
   HeadingItem,
 } from './types';
 import { isVerse } from './types';
-import { saveBook, createBook as createBookApi, deleteBook as deleteBookApi } from './api';
+import {
+  saveBook,
+  saveChapter,
+  createBook as createBookApi,
+  deleteBook as deleteBookApi,
+} from './api';
 import { getLocale, type FootnoteDisplayMode } from './locales';
 import { hasRedo, hasUndo, pushSnapshot, redoSnapshot, undoSnapshot } from './undoStack';
 
@@ -68,6 +74,8 @@ export const chapterNumbers = derived(bookData, ($bookData) => {
 /* ── Auto-save logic (debounced 1.5s) ── */
 
 let saveTimer: ReturnType<typeof setTimeout> | undefined;
+/* Book as last loaded from / saved to the server, for chapter-level saves */
+let lastSavedBook: BookData | null = null;
 
 function syncUndoState(): void {
   canUndo.set(hasUndo());
@@ -139,13 +147,46 @@ export function scheduleAutoSave(): void {
   }, 1500);
 }
 
+/**
+ * Chapters changed since the last save, or null when only a whole-book save
+ * will do (different book, renamed, or chapters added/removed/reordered).
+ * Mutations copy just the chapters they touch, so identity tells what changed.
+ */
+function changedChapters(saved: BookData | null, next: BookData): Chapter[] | null {
+  if (!saved || saved.id !== next.id || saved.name !== next.name) return null;
+  if (saved.chapters.length !== next.chapters.length) return null;
+  const changed: Chapter[] = [];
+  for (let i = 0; i < next.chapters.length; i++) {
+    const before = saved.chapters[i]!;
+    const after = next.chapters[i]!;
+    if (before.number !== after.number) return null;
+    if (before !== after) changed.push(after);
+  }
+  return changed;
+}
+
+export function setLoadedBook(data: BookData | null): void {
+  lastSavedBook = data;
+  bookData.set(data);
+}
+
 async function performSave(): Promise<void> {
   const data = get(bookData);
   if (!data) return;
 
   saveStatus.set('saving');
   try {
-    await saveBook(data);
+    const chapters = changedChapters(lastSavedBook, data);
+    if (chapters) {
+      try {
+        for (const chapter of chapters) await saveChapter(data.id, chapter);
+      } catch {
+        await saveBook(data);
+      }
+    } else {
+      await saveBook(data);
+    }
+    lastSavedBook = data;
     saveStatus.set('saved');
     isDirty.set(false);
     setTimeout(() => {
@@ -218,7 +259,12 @@ export function updateVerse(
         ...c,
         content: c.content.map((item) => {
           if (item.kind !== 'verse' || item.number !== verseNumber) return item;
-          return { ...item, [field]: value };
+          const breaks = item.poetryBreaks;
+          if (!breaks?.[field]) return { ...item, [field]: value };
+          // Precomputed poetry breaks describe the old text.
+          const { [field]: staleBreaks, ...poetryBreaks } = breaks;
+          void staleBreaks;
+          return { ...item, [field]: value, poetryBreaks };
         }),
       };
     }),
@@ -596,7 +642,7 @@ export async function createBook(): Promise<void> {
     return next;
   });
   currentBookId.set(newBook.id);
-  bookData.set(newBook);
+  setLoadedBook(newBook);
   currentChapter.set(1);
   isDirty.set(false);
   saveStatus.set('idle');
@@ -611,7 +657,7 @@ export async function deleteBook(bookId: string): Promise<void> {
   });
   if (get(currentBookId) === bookId) {
     currentBookId.set(null);
-    bookData.set(null);
+    setLoadedBook(null);
     currentChapter.set(1);
   }
 }
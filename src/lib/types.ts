@@ -28,6 +28,13 @@ export interface VerseItem {
   indentLevel?: number;
   /** Optional imported DOCX first-line indent (em units, can be negative for hanging). */
   firstLineIndent?: number;
+  /**
+   * Precomputed poetry line breaks per language (see `lib/poetry.ts`): the
+   * 1-based indices of the words ending each line but the last.  Written by
+   * `scripts/poetry_breaks.py` for poetry verses; a language without an
+   * entry is split on the fly.
+   */
+  poetryBreaks?: Partial<Record<UILanguage, number[]>>;
 }
 
 export interface HeadingItem {
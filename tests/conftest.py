@@ -0,0 +1,6 @@
+"""Make the ``scripts/`` modules importable the way they import each other."""
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
@@ -0,0 +1,30 @@
+"""Atomic writes leave files with the permissions a plain write would."""
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from data_files import atomic_write_text
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+
+
+def _mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_new_file_gets_the_same_mode_as_a_plain_write(tmp_path: Path) -> None:
+    plain = tmp_path / "plain.json"
+    plain.write_text("{}", encoding="utf-8")
+    atomic_write_text(tmp_path / "atomic.json", "{}")
+    assert _mode(tmp_path / "atomic.json") == _mode(plain)
+
+
+def test_rewrite_keeps_the_existing_mode(tmp_path: Path) -> None:
+    path = tmp_path / "genesis.json"
+    path.write_text("{}", encoding="utf-8")
+    path.chmod(0o640)
+    atomic_write_text(path, '{"v": 2}')
+    assert _mode(path) == 0o640
+    assert path.read_text(encoding="utf-8") == '{"v": 2}'
@@ -0,0 +1,48 @@
+"""The Python data server rejects malformed whole-book saves before writing."""
+import json
+from pathlib import Path
+
+import pytest
+
+from data_server import ApiError, BookData, FileCache
+
+BOOK = {
+    "id": "genesis",
+    "name": {"english": "Genesis", "armenian": "", "classical": ""},
+    "chapters": [{"number": 1, "content": []}],
+}
+
+
+@pytest.fixture
+def data(tmp_path: Path):
+    (tmp_path / "genesis.json").write_text(json.dumps(BOOK), encoding="utf-8")
+    books = BookData(tmp_path, FileCache())
+    yield books
+    books.close()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"{",
+        b"[]",
+        b"{}",
+        b'{"chapters": {}}',
+        b'{"chapters": [{"number": "1"}]}',
+        b'{"chapters": [null]}',
+    ],
+)
+def test_put_book_rejects_malformed_bodies(data: BookData, tmp_path: Path, body: bytes) -> None:
+    before = (tmp_path / "genesis.json").read_bytes()
+    with pytest.raises(ApiError) as err:
+        data.put_book("genesis", body)
+    assert err.value.status == 400
+    assert (tmp_path / "genesis.json").read_bytes() == before
+
+
+def test_put_book_writes_a_valid_body(data: BookData, tmp_path: Path) -> None:
+    chapters = [{"number": 1, "content": []}, {"number": 2, "content": []}]
+    body = json.dumps({**BOOK, "chapters": chapters})
+    data.put_book("genesis", body.encode("utf-8"))
+    saved = json.loads((tmp_path / "genesis.json").read_text(encoding="utf-8"))
+    assert [c["number"] for c in saved["chapters"]] == [1, 2]
@@ -0,0 +1,55 @@
+"""The incremental import cache: what it hashes and what it lets a re-import skip."""
+import zipfile
+from pathlib import Path
+
+from import_docx import HASHED_PARTS, docx_part_hashes, file_matches, write_output
+
+
+def _docx(path: Path, parts: dict[str, str]) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in parts.items():
+            zf.writestr(name, text)
+    return path
+
+
+def test_every_part_is_hashed(tmp_path: Path) -> None:
+    parts = {name: f"<{name}/>" for name in HASHED_PARTS}
+    assert docx_part_hashes(_docx(tmp_path / "a.docx", parts)).keys() == set(HASHED_PARTS)
+
+
+def test_endnote_only_change_is_seen(tmp_path: Path) -> None:
+    base = {"word/document.xml": "<doc/>", "word/footnotes.xml": "<fn/>"}
+    before = docx_part_hashes(_docx(tmp_path / "a.docx", {**base, "word/endnotes.xml": "<a/>"}))
+    after = docx_part_hashes(_docx(tmp_path / "b.docx", {**base, "word/endnotes.xml": "<b/>"}))
+    assert before != after
+    assert before["word/document.xml"] == after["word/document.xml"]
+
+
+def test_missing_parts_are_skipped(tmp_path: Path) -> None:
+    hashes = docx_part_hashes(_docx(tmp_path / "a.docx", {"word/document.xml": "<doc/>"}))
+    assert list(hashes) == ["word/document.xml"]
+
+
+def test_unchanged_output_is_not_rewritten(tmp_path: Path) -> None:
+    hashes: dict[str, str] = {}
+    assert write_output(tmp_path, "genesis.json", "{}\n", hashes)
+    mtime = (tmp_path / "genesis.json").stat().st_mtime_ns
+    assert not write_output(tmp_path, "genesis.json", "{}\n", hashes)
+    assert (tmp_path / "genesis.json").stat().st_mtime_ns == mtime
+
+
+def test_edited_output_is_overwritten(tmp_path: Path) -> None:
+    hashes: dict[str, str] = {}
+    write_output(tmp_path, "genesis.json", '{"v": 1}\n', hashes)
+    # An edit saved from the browser; the DOCX (and so the output) is unchanged.
+    (tmp_path / "genesis.json").write_text('{"v": 2}\n', encoding="utf-8")
+    assert not file_matches(tmp_path / "genesis.json", hashes["genesis.json"])
+    assert write_output(tmp_path, "genesis.json", '{"v": 1}\n', hashes)
+    assert (tmp_path / "genesis.json").read_text(encoding="utf-8") == '{"v": 1}\n'
+
+
+def test_deleted_output_is_rewritten(tmp_path: Path) -> None:
+    hashes: dict[str, str] = {}
+    write_output(tmp_path, "genesis.json", "{}\n", hashes)
+    (tmp_path / "genesis.json").unlink()
+    assert write_output(tmp_path, "genesis.json", "{}\n", hashes)
@@ -0,0 +1,44 @@
+"""Poetry line breaks match src/lib/poetry.ts on fixed verses.
+
+The expected breaks were recorded from the TypeScript implementation;
+``test_typescript_agrees`` re-checks them against it when bun or node 22.6+
+is available (like ``poetry_breaks.py --parity``, but on fixed texts).
+"""
+import pytest
+
+from poetry_breaks import EDGE_CASES, poetry_break_words, typescript_breaks
+
+# Breaks (1-based words ending each line but the last) of EDGE_CASES, in order.
+EDGE_CASE_BREAKS = [[], [4], [1, 3, 6, 8], [], [4, 5], [3, 5, 7], [1, 3], [1, 2, 4, 6], [4]]
+
+FIXTURES = [
+    *((field, text, breaks) for (field, text), breaks in zip(EDGE_CASES, EDGE_CASE_BREAKS, strict=True)),
+    (
+        "english",
+        "The Lord is my shepherd; I shall not want. He makes me lie down in green pastures, "
+        "he leads me beside still waters.",
+        [5, 9, 17],
+    ),
+    (
+        "english",
+        "Blessed is the man who walks not in the counsel of the ungodly, nor stands in the "
+        "way of sinners, nor sits in the seat of the scornful.",
+        [13],
+    ),
+    ("english", "short", []),
+    ("english", "", []),
+    ("armenian", "\u0561\u0575\u0580 \u0565\u0582 \u056f\u056b\u0576\u055d \u0574\u0561\u0580\u0564 \u0565\u0582 \u056f\u056b\u0576\u0589 \u0561\u0575\u0580 \u0565\u0582 \u056f\u056b\u0576\u055d \u0574\u0561\u0580\u0564\u0589", [3, 6, 9]),
+]
+
+
+@pytest.mark.parametrize("field,text,breaks", FIXTURES)
+def test_python_breaks(field: str, text: str, breaks: list[int]) -> None:
+    assert poetry_break_words(text, field) == breaks
+
+
+def test_typescript_agrees() -> None:
+    try:
+        results = typescript_breaks([(field, text) for field, text, _ in FIXTURES])
+    except RuntimeError as exc:
+        pytest.skip(str(exc))
+    assert results == [breaks for _, _, breaks in FIXTURES]
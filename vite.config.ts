@@ -7,9 +7,237 @@ import {
   existsSync,
   mkdirSync,
   renameSync,
+  rmSync,
+  statSync,
+  unlinkSync,
 } from 'node:fs';
-import { resolve, join } from 'node:path';
+import { basename, dirname, resolve, join } from 'node:path';
+import { spawn } from 'node:child_process';
 import type { IncomingMessage, ServerResponse } from 'node:http';
+import {
+  expandBook,
+  expandBookText,
+  expandChapter,
+  isCompactText,
+  serializeBook,
+} from './src/lib/bookFormat';
+
+/** Books manifest written by scripts/book_index.py (and the importer). */
+const MANIFEST_FILE = 'index.json';
+const MANIFEST_ID = 'index';
+/** Sharded books live in data/<id>/ as meta.json + <chapter>.json (scripts/book_shards.py). */
+const SHARD_META = 'meta.json';
+
+interface ManifestEntry {
+  id: string;
+  file: string;
+  name: unknown;
+  chapterCount: number;
+  bytes: number;
+  mtimeNs: string;
+}
+
+function isBookFile(f: string): boolean {
+  return f.endsWith('.json') && !f.startsWith('.') && f !== MANIFEST_FILE;
+}
+
+/**
+ * Book summaries for the sidebar. Taken from data/index.json for every file
+ * whose size and mtime still match its manifest entry; only books edited
+ * since the last reindex (or missing from the manifest) are parsed.
+ */
+function listBooks(dataDir: string) {
+  let manifest = new Map<string, ManifestEntry>();
+  try {
+    const raw = JSON.parse(readFileSync(join(dataDir, MANIFEST_FILE), 'utf-8')) as {
+      books?: ManifestEntry[];
+    };
+    manifest = new Map((raw.books ?? []).map((b) => [b.file, b]));
+  } catch {
+    // no manifest yet — every book is parsed below
+  }
+
+  const entries = readdirSync(dataDir, { withFileTypes: true });
+  const monolithic = entries.filter((e) => e.isFile() && isBookFile(e.name)).map((e) => e.name);
+  const sharded = entries
+    .filter((e) => e.isDirectory() && isShardedBook(dataDir, e.name))
+    .map((e) => {
+      const meta = readShardMeta(dataDir, e.name);
+      return { id: meta.id, name: meta.name, chapterCount: meta.chapters.length };
+    });
+
+  return monolithic
+    .map((f) => {
+      const filePath = join(dataDir, f);
+      const entry = manifest.get(f);
+      if (entry) {
+        const st = statSync(filePath, { bigint: true });
+        if (st.mtimeNs.toString() === entry.mtimeNs && Number(st.size) === entry.bytes) {
+          return { id: entry.id, name: entry.name, chapterCount: entry.chapterCount };
+        }
+      }
+      const raw = readFileSync(filePath, 'utf-8');
+      const data = JSON.parse(raw);
+      return {
+        id: data.id,
+        name: data.name,
+        chapterCount: data.chapters.length,
+      };
+    })
+    .concat(sharded);
+}
+
+// ── Sharded book layout ──
+
+interface ChapterShard {
+  number: number;
+}
+
+/** Write via a sibling temp file + rename so readers never see a partial file. */
+function writeFileAtomic(filePath: string, text: string): void {
+  const tmp = join(dirname(filePath), `.${basename(filePath)}.${process.pid}.tmp`);
+  try {
+    writeFileSync(tmp, text, 'utf-8');
+    renameSync(tmp, filePath);
+  } catch (err) {
+    rmSync(tmp, { force: true });
+    throw err;
+  }
+}
+
+/** A book is sharded when data/<id>/meta.json exists and data/<id>.json does not. */
+function isShardedBook(dataDir: string, bookId: string): boolean {
+  return (
+    !bookId.startsWith('.') &&
+    !existsSync(join(dataDir, `${bookId}.json`)) &&
+    existsSync(join(dataDir, bookId, SHARD_META))
+  );
+}
+
+function readShardMeta(
+  dataDir: string,
+  bookId: string,
+): { id: string; name: unknown; chapters: number[] } {
+  return JSON.parse(readFileSync(join(dataDir, bookId, SHARD_META), 'utf-8'));
+}
+
+function readShardedBook(dataDir: string, bookId: string): string {
+  const meta = readShardMeta(dataDir, bookId);
+  const chapters = meta.chapters.map((n) =>
+    JSON.parse(readFileSync(join(dataDir, bookId, `${n}.json`), 'utf-8')),
+  );
+  return JSON.stringify({ ...meta, chapters }, null, 2);
+}
+
+interface BookBody {
+  chapters: ChapterShard[];
+}
+
+/**
+ * A whole-book PUT body, or null unless it is a JSON object whose
+ * `chapters` are objects with integer numbers (checked before any write).
+ */
+function parseBookBody(body: string): BookBody | null {
+  let book: unknown;
+  try {
+    book = JSON.parse(body);
+  } catch {
+    return null;
+  }
+  if (typeof book !== 'object' || book === null || Array.isArray(book)) return null;
+  const chapters = (book as { chapters?: unknown }).chapters;
+  if (!Array.isArray(chapters)) return null;
+  const numbered = chapters.every(
+    (c) => typeof c === 'object' && c !== null && Number.isInteger((c as ChapterShard).number),
+  );
+  return numbered ? (book as BookBody) : null;
+}
+
+function writeShardedBook(dataDir: string, bookId: string, book: BookBody): void {
+  const dir = join(dataDir, bookId);
+  const numbers = book.chapters.map((c) => c.number);
+  // Chapters first, so meta.json never lists a shard that isn't there yet
+  for (const chapter of book.chapters) {
+    writeFileAtomic(
+      join(dir, `${chapter.number}.json`),
+      JSON.stringify(chapter, null, 2),
+    );
+  }
+  writeFileAtomic(
+    join(dir, SHARD_META),
+    JSON.stringify({ ...book, chapters: numbers }, null, 2),
+  );
+  for (const f of readdirSync(dir)) {
+    if (/^\d+\.json$/.test(f) && !numbers.includes(parseInt(f, 10))) {
+      unlinkSync(join(dir, f));
+    }
+  }
+}
+
+/** Chapter JSON text, or null if the book has no such chapter. */
+function readChapter(dataDir: string, bookId: string, chapterNumber: number): string | null {
+  if (isShardedBook(dataDir, bookId)) {
+    if (!readShardMeta(dataDir, bookId).chapters.includes(chapterNumber)) return null;
+    return readFileSync(join(dataDir, bookId, `${chapterNumber}.json`), 'utf-8');
+  }
+  const filePath = join(dataDir, `${bookId}.json`);
+  if (!existsSync(filePath)) return null;
+  const book = JSON.parse(readFileSync(filePath, 'utf-8')) as {
+    chapters: ChapterShard[];
+    footnoteTexts?: string[];
+  };
+  const chapter = book.chapters.find((c) => c.number === chapterNumber);
+  if (!chapter) return null;
+  return JSON.stringify(expandChapter({ ...chapter }, book.footnoteTexts ?? []), null, 2);
+}
+
+/**
+ * Replace one existing chapter. Sharded books rewrite only that chapter's
+ * file; monolithic books are patched in place (compact ones stay compact).
+ * Returns false if the book has no such chapter (new chapters go through a
+ * whole-book PUT).
+ */
+function writeChapter(
+  dataDir: string,
+  bookId: string,
+  chapterNumber: number,
+  body: string,
+): boolean {
+  const chapter = JSON.parse(body) as ChapterShard;
+  if (chapter.number !== chapterNumber) return false;
+  if (isShardedBook(dataDir, bookId)) {
+    if (!readShardMeta(dataDir, bookId).chapters.includes(chapterNumber)) return false;
+    writeFileAtomic(
+      join(dataDir, bookId, `${chapterNumber}.json`),
+      JSON.stringify(chapter, null, 2),
+    );
+    return true;
+  }
+  const filePath = join(dataDir, `${bookId}.json`);
+  if (!existsSync(filePath)) return false;
+  const text = readFileSync(filePath, 'utf-8');
+  const book = expandBook(JSON.parse(text)) as { chapters: ChapterShard[] };
+  const index = book.chapters.findIndex((c) => c.number === chapterNumber);
+  if (index < 0) return false;
+  book.chapters[index] = chapter;
+  writeFileAtomic(filePath, serializeBook(book, isCompactText(text)));
+  return true;
+}
+
+/**
+ * Record the saved book in the revision history (scripts/book_revisions.py).
+ * Runs in the background; a failure never fails the save.
+ */
+function recordRevision(dataDir: string, bookId: string): void {
+  const child = spawn(
+    'python3',
+    [resolve('scripts', 'book_revisions.py'), '--data', dataDir, 'record', bookId],
+    { stdio: 'ignore' },
+  );
+  child.on('error', () => {
+    // python3 missing: saves still work, just without history.
+  });
+}
 
 function bibleApiPlugin(): Plugin {
   const dataDir = resolve('data');
@@ -27,20 +255,8 @@ function bibleApiPlugin(): Plugin {
 
           // GET /api/books — list available books
           if (url === '/api/books' && req.method === 'GET') {
-            const files = readdirSync(dataDir).filter((f) =>
-              f.endsWith('.json'),
-            );
-            const summaries = files.map((f) => {
-              const raw = readFileSync(join(dataDir, f), 'utf-8');
-              const data = JSON.parse(raw);
-              return {
-                id: data.id,
-                name: data.name,
-                chapterCount: data.chapters.length,
-              };
-            });
             res.writeHead(200, { 'Content-Type': 'application/json' });
-            res.end(JSON.stringify(summaries));
+            res.end(JSON.stringify(listBooks(dataDir)));
             return;
           }
 
@@ -54,13 +270,13 @@ function bibleApiPlugin(): Plugin {
               try {
                 const parsed = JSON.parse(body) as { id?: string };
                 const bookId = parsed.id;
-                if (!bookId || !/^[a-z0-9_-]+$/.test(bookId)) {
+                if (!bookId || !/^[a-z0-9_-]+$/.test(bookId) || bookId === MANIFEST_ID) {
                   res.writeHead(400, { 'Content-Type': 'application/json' });
                   res.end(JSON.stringify({ error: 'Invalid book id' }));
                   return;
                 }
                 const filePath = join(dataDir, `${bookId}.json`);
-                if (existsSync(filePath)) {
+                if (existsSync(filePath) || isShardedBook(dataDir, bookId)) {
                   res.writeHead(409, { 'Content-Type': 'application/json' });
                   res.end(JSON.stringify({ error: 'Book already exists' }));
                   return;
@@ -76,16 +292,64 @@ function bibleApiPlugin(): Plugin {
             return;
           }
 
+          // GET/PUT /api/books/:id/chapters/:n — one chapter at a time
+          const chapterMatch = url.match(/^\/api\/books\/([a-z0-9_-]+)\/chapters\/(\d+)$/);
+          if (chapterMatch && chapterMatch[1] !== MANIFEST_ID) {
+            const bookId = chapterMatch[1]!;
+            const chapterNumber = parseInt(chapterMatch[2]!, 10);
+
+            if (req.method === 'GET') {
+              const text = readChapter(dataDir, bookId, chapterNumber);
+              if (text !== null) {
+                res.writeHead(200, { 'Content-Type': 'application/json' });
+                res.end(text);
+              } else {
+                res.writeHead(404, { 'Content-Type': 'application/json' });
+                res.end(JSON.stringify({ error: 'Not found' }));
+              }
+              return;
+            }
+
+            if (req.method === 'PUT') {
+              let body = '';
+              req.on('data', (chunk: Buffer | string) => {
+                body += typeof chunk === 'string' ? chunk : chunk.toString();
+              });
+              req.on('end', () => {
+                try {
+                  if (writeChapter(dataDir, bookId, chapterNumber, body)) {
+                    recordRevision(dataDir, bookId);
+                    res.writeHead(200, { 'Content-Type': 'application/json' });
+                    res.end(JSON.stringify({ ok: true }));
+                  } else {
+                    res.writeHead(404, { 'Content-Type': 'application/json' });
+                    res.end(JSON.stringify({ error: 'Not found' }));
+                  }
+                } catch {
+                  res.writeHead(400, { 'Content-Type': 'application/json' });
+                  res.end(JSON.stringify({ error: 'Invalid JSON body' }));
+                }
+              });
+              return;
+            }
+          }
+
           // GET/PUT /api/books/:id
           const match = url.match(/^\/api\/books\/([a-z0-9_-]+)$/);
-          if (match) {
+          if (match && match[1] !== MANIFEST_ID) {
             const bookId = match[1]!;
             const filePath = join(dataDir, `${bookId}.json`);
+            const sharded = isShardedBook(dataDir, bookId);
 
             if (req.method === 'GET') {
+              if (sharded) {
+                res.writeHead(200, { 'Content-Type': 'application/json' });
+                res.end(readShardedBook(dataDir, bookId));
+                return;
+              }
               if (existsSync(filePath)) {
                 res.writeHead(200, { 'Content-Type': 'application/json' });
-                res.end(readFileSync(filePath, 'utf-8'));
+                res.end(expandBookText(readFileSync(filePath, 'utf-8')));
               } else {
                 res.writeHead(404, { 'Content-Type': 'application/json' });
                 res.end(JSON.stringify({ error: 'Not found' }));
@@ -99,7 +363,20 @@ function bibleApiPlugin(): Plugin {
                 body += typeof chunk === 'string' ? chunk : chunk.toString();
               });
               req.on('end', () => {
-                writeFileSync(filePath, body, 'utf-8');
+                const book = parseBookBody(body);
+                if (!book) {
+                  res.writeHead(400, { 'Content-Type': 'application/json' });
+                  res.end(JSON.stringify({ error: 'Invalid JSON body' }));
+                  return;
+                }
+                if (sharded) {
+                  writeShardedBook(dataDir, bookId, book);
+                } else if (existsSync(filePath) && isCompactText(readFileSync(filePath, 'utf-8'))) {
+                  writeFileAtomic(filePath, serializeBook(book, true));
+                } else {
+                  writeFileAtomic(filePath, body);
+                }
+                recordRevision(dataDir, bookId);
                 res.writeHead(200, { 'Content-Type': 'application/json' });
                 res.end(JSON.stringify({ ok: true }));
               });
@@ -107,10 +384,13 @@ function bibleApiPlugin(): Plugin {
             }
 
             if (req.method === 'DELETE') {
-              if (existsSync(filePath)) {
+              if (sharded || existsSync(filePath)) {
                 const trashDir = join(dataDir, '.trash');
                 if (!existsSync(trashDir)) mkdirSync(trashDir, { recursive: true });
-                renameSync(filePath, join(trashDir, `${bookId}.json`));
+                // Only the latest deletion of a book is kept in the trash
+                const trashPath = join(trashDir, sharded ? bookId : `${bookId}.json`);
+                rmSync(trashPath, { recursive: true, force: true });
+                renameSync(sharded ? join(dataDir, bookId) : filePath, trashPath);
                 res.writeHead(200, { 'Content-Type': 'application/json' });
                 res.end(JSON.stringify({ ok: true }));
               } else {